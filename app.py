@@ -1,33 +1,134 @@
 import os
+
+# Under gunicorn's gevent worker, patch the stdlib before anything else imports
+# socket/ssl/threading (USE_GEVENT=1 with GUNICORN_WORKER_CLASS=gevent)
+if os.environ.get('USE_GEVENT') == '1':
+    from gevent import monkey
+    monkey.patch_all()
+
+import hashlib
+import heapq
 import logging
+import mimetypes
+import re
 import tempfile
-import uuid
+import threading
 import time
-from flask import Flask, render_template, request, jsonify, session, send_file
+from collections import Counter
+from datetime import datetime
+from secrets import token_hex
+from urllib.parse import unquote
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from flask import Flask, render_template, request, jsonify, session, send_from_directory, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.exceptions import NotFound
 from werkzeug.utils import secure_filename
 from werkzeug.middleware.proxy_fix import ProxyFix
-from utils.audio_converter import convert_mp3_to_wav
-from utils.whisper_client import send_to_whisper
-from utils.youtube_processor import is_youtube_url, download_youtube_audio, get_youtube_info, get_youtube_transcript
+from sqlalchemy import JSON, Text, bindparam, cast, event, func, inspect, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
+from utils.audio_converter import decode_to_array, extract_audio, get_audio_duration
+from utils.whisper_client import send_to_whisper, transcribe_samples, transcribes_in_process
+from utils.whisper_batcher import SMALL_UPLOAD_BYTES, transcribe_many
+from utils.buffer_pool import copy_chunks, trim_buffer_pool
+from utils.file_janitor import remove_later
+from utils.progress_store import FINISHED_STATUSES, ProgressStore
+from utils.multipart_upload import UploadRequest, receive_multipart, discard_saved_files, get_extension
+from utils.youtube_processor import is_youtube_url, download_youtube_audio, get_youtube_info, get_youtube_transcript, extract_video_id
+from utils.youtube_processor import DEFAULT_TRANSCRIPT_LANGUAGES, download_youtube_video, stream_youtube_pcm
+from utils.transcript_cache import MemoryCache, load_cached, store_cached
 from utils.document_processor import process_document, get_document_info
 from utils.text_to_speech import convert_text_to_speech, get_available_voices
 from utils.output_formatter import generate_output_file, get_supported_formats
-from utils.llm_processor import process_text_with_llm, get_available_models
+from utils.llm_processor import process_text_with_llm, stream_text_with_llm, get_available_models
 from utils.openqm_client import save_transcript_to_openqm, export_to_json_for_openqm
 from models import db, Transcription, ProcessingJob
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper())
 logger = logging.getLogger(__name__)
 
+# orjson parses and serializes JSON several times faster than the stdlib when installed;
+# everything in this module goes through app.json so it is used wherever available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    logger.info("orjson not found, JSON responses will use the standard library")
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, keeping Flask's fallback for other types"""
+    
+    # Dates go through Flask's default rather than orjson's ISO 8601, so responses keep
+    # the RFC 822 HTTP-date format that clients already parse
+    OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.OPTIONS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Create Flask app
 app = Flask(__name__)
+app.request_class = UploadRequest  # multipart file parts land directly in UPLOAD_FOLDER
 app.secret_key = os.environ.get("SESSION_SECRET", "dev_secret_key")
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)  # needed for url_for to generate with https
+if orjson:
+    app.json = OrjsonProvider(app)
 
-# Enable template auto-reload and disable static file caching for development
-app.config['TEMPLATES_AUTO_RELOAD'] = True
+# Disable static file caching; only re-check templates on disk in development
+app.config['TEMPLATES_AUTO_RELOAD'] = os.environ.get('FLASK_DEV') == '1'
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
+# Behind a proxy that honours X-Sendfile, let it stream downloads instead of a worker thread
+app.config['USE_X_SENDFILE'] = os.environ.get('X_SENDFILE') == '1'
+# nginx internal location aliased to TRANSCRIPTIONS_FOLDER (e.g. /internal_transcriptions/);
+# when set, transcription downloads are handed to nginx with X-Accel-Redirect
+TRANSCRIPTIONS_ACCEL_PREFIX = os.environ.get('TRANSCRIPTIONS_ACCEL_PREFIX')
+# Same for generated files under UPLOAD_FOLDER served by /download (e.g. /internal_uploads/)
+UPLOADS_ACCEL_PREFIX = os.environ.get('UPLOADS_ACCEL_PREFIX')
+
+# Compile templates once: cache Jinja bytecode on disk and load the page
+# templates at import so preloaded gunicorn workers inherit them
+JINJA_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'speech-app-jinja')
+os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory=JINJA_CACHE_DIR)
+for template_name in ('layout.html', 'index.html', 'history.html'):
+    app.jinja_env.get_template(template_name)
+
+# Set by the startup schema check below; False while transcriptions.content_hash is
+# missing, which turns off reuse of transcriptions for identical uploads
+content_hash_supported = False
+
+def ensure_content_hash_column():
+    """Add transcriptions.content_hash to databases created before upload deduplication"""
+    global content_hash_supported
+    columns = {column['name'] for column in inspect(db.engine).get_columns('transcriptions')}
+    if 'content_hash' not in columns:
+        # create_all() never alters existing tables; a nullable column is a cheap addition
+        try:
+            with db.engine.begin() as connection:
+                connection.exec_driver_sql("ALTER TABLE transcriptions ADD COLUMN content_hash VARCHAR(64)")
+                connection.exec_driver_sql(
+                    "CREATE INDEX IF NOT EXISTS ix_transcriptions_content_hash ON transcriptions (content_hash)"
+                )
+            logger.info("Added the transcriptions.content_hash column")
+        except Exception as e:
+            logger.error(
+                f"transcriptions.content_hash is missing and could not be added ({str(e)}); "
+                "identical uploads will be transcribed again until it is created (see DEPLOYMENT.md)"
+            )
+            return
+    content_hash_supported = True
+
+def create_missing_indexes():
+    """Create ProcessingJob indexes added after its table was first created"""
+    # create_all() skips every index of a table that already exists
+    for index in ProcessingJob.__table__.indexes:
+        try:
+            index.create(db.engine, checkfirst=True)
+        except Exception as e:
+            logger.error(f"Could not create index {index.name}: {str(e)}")
 
 # Configure database
 db_url = os.environ.get("DATABASE_URL")
@@ -37,10 +138,23 @@ if db_url:
     
     # Configure SQLAlchemy
     app.config["SQLALCHEMY_DATABASE_URI"] = db_url
-    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-        "pool_recycle": 300,
+    # Size the pool for gunicorn threads plus the background transcription
+    # workers so concurrent uploads don't queue behind the default pool of 5.
+    # Keep DB_POOL_RECYCLE below the server's idle-connection timeout.
+    engine_options = {
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", "300")),
         "pool_pre_ping": True,
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", "5")),
     }
+    if db_url.startswith(("postgres://", "postgresql")):
+        engine_options["connect_args"] = {
+            "connect_timeout": 3,
+            "application_name": "speech-app",
+            "options": "-c statement_timeout=60000",  # Kill queries hung for over a minute
+        }
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     
     # Initialize the database
@@ -51,52 +165,257 @@ if db_url:
         with app.app_context():
             db.create_all()
             logger.info("Database tables created successfully")
+            ensure_content_hash_column()
+            create_missing_indexes()
     except Exception as e:
         logger.error(f"Database initialization failed: {str(e)}")
         logger.warning("Application will continue without database support")
 else:
     logger.warning("DATABASE_URL environment variable is not set! Application will run without database support")
 
-# Configure upload folder
-UPLOAD_FOLDER = tempfile.gettempdir()
-ALLOWED_AUDIO_EXTENSIONS = {'mp3', 'wav', 'mp4', 'mov'}
-ALLOWED_DOCUMENT_EXTENSIONS = {'pdf', 'docx', 'txt'}
-ALL_ALLOWED_EXTENSIONS = ALLOWED_AUDIO_EXTENSIONS.union(ALLOWED_DOCUMENT_EXTENSIONS)
+# Configure upload folder (a dedicated directory so the sweeper below only ever
+# touches this app's files)
+UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', os.path.join(tempfile.gettempdir(), 'speech-app-uploads'))
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+ALLOWED_AUDIO_EXTENSIONS = frozenset({'mp3', 'wav', 'mp4', 'mov'})
+ALLOWED_DOCUMENT_EXTENSIONS = frozenset({'pdf', 'docx', 'txt'})
+ALL_ALLOWED_EXTENSIONS = ALLOWED_AUDIO_EXTENSIONS | ALLOWED_DOCUMENT_EXTENSIONS
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB limit
 
+# Bounded pool for upload transcriptions so request threads return immediately;
+# size it to how many Whisper jobs the CPU/GPU can run side by side
+TRANSCRIPTION_WORKERS = int(os.environ.get('TRANSCRIPTION_WORKERS', '2'))
+transcription_executor = ThreadPoolExecutor(max_workers=TRANSCRIPTION_WORKERS, thread_name_prefix='transcribe')
+
+# Database-tracked jobs are queued per job type so long Whisper runs can't
+# starve quick TTS and document jobs; excess jobs wait in the executor queue
+job_executors = {
+    'transcription': transcription_executor,
+    'tts': ThreadPoolExecutor(max_workers=int(os.environ.get('TTS_WORKERS', '2')), thread_name_prefix='tts'),
+    'document_processing': ThreadPoolExecutor(max_workers=int(os.environ.get('DOCUMENT_WORKERS', '4')), thread_name_prefix='documents'),
+}
+
+# CPU-bound media conversion runs on its own pool so transcription workers
+# keep Whisper busy instead of waiting on ffmpeg
+conversion_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('CONVERSION_WORKERS', str(os.cpu_count() or 2))),
+    thread_name_prefix='convert'
+)
+
+# Whisper calls from multi-file jobs; each one mostly waits on the GPU server or
+# a subprocess, so a few run side by side
+whisper_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('WHISPER_CONCURRENCY', '2')),
+    thread_name_prefix='whisper'
+)
+
+# Progress of direct (non-database) jobs; finished jobs stay pollable for an hour
+# and anything older than a day is treated as abandoned
+processing_progress = ProgressStore(ttl=3600, stale_after=24 * 3600)
+
+# Progress of database-tracked jobs while they run, keyed by job id. Only
+# status transitions are committed; /api/job-status reads progress from here.
+job_progress = {}
+
+# Periodically delete uploaded media left behind by crashed or interrupted jobs.
+# Uploads that queued or running jobs still use are claimed and never swept,
+# however long they wait in the queue or take to transcribe.
+UPLOAD_MAX_AGE_SECONDS = 3600
+UPLOAD_SWEEP_INTERVAL_SECONDS = 600
+SWEEPABLE_EXTENSIONS = ALLOWED_AUDIO_EXTENSIONS | {'webm', 'm4a', 'part'}
+
+# Claimed uploads by file stem, so files derived from an upload (e.g. its extracted .wav) are kept too
+uploads_in_use = Counter()
+uploads_in_use_lock = threading.Lock()
+
+def claim_uploads(keys):
+    """Keep the sweeper away from uploads a job has been queued with"""
+    with uploads_in_use_lock:
+        for key in keys:
+            uploads_in_use[os.path.splitext(key)[0]] += 1
+
+def release_uploads(keys):
+    """Drop the claims taken by claim_uploads once the job is done with its files"""
+    with uploads_in_use_lock:
+        for key in keys:
+            stem = os.path.splitext(key)[0]
+            uploads_in_use[stem] -= 1
+            if uploads_in_use[stem] <= 0:
+                del uploads_in_use[stem]
+
+def sweep_upload_folder():
+    """Remove stale, unclaimed input media from UPLOAD_FOLDER, keeping generated TTS output"""
+    cutoff = time.time() - UPLOAD_MAX_AGE_SECONDS
+    with uploads_in_use_lock:
+        in_use = set(uploads_in_use)
+    removed = 0
+    with os.scandir(UPLOAD_FOLDER) as entries:
+        for entry in entries:
+            if entry.name.startswith('tts_') or get_extension(entry.name) not in SWEEPABLE_EXTENSIONS:
+                continue
+            if os.path.splitext(entry.name)[0] in in_use:
+                continue
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    if removed:
+        logger.info(f"Upload sweeper removed {removed} orphaned files")
+
+def upload_sweeper_loop():
+    while True:
+        try:
+            sweep_upload_folder()
+            trim_buffer_pool()
+            pruned = processing_progress.prune()
+            if pruned:
+                logger.info(f"Pruned {pruned} expired job progress entries")
+        except Exception as e:
+            logger.warning(f"Upload sweeper failed: {str(e)}")
+        time.sleep(UPLOAD_SWEEP_INTERVAL_SECONDS)
+
+threading.Thread(target=upload_sweeper_loop, name='upload-sweeper', daemon=True).start()
+
+# Queued work refers to uploads by key (the name inside UPLOAD_FOLDER) rather than by
+# absolute path, so UPLOAD_FOLDER can be a shared volume mounted differently per host
+def upload_key(filepath):
+    """Return the key a saved upload is queued under"""
+    return os.path.basename(filepath)
+
+def upload_path(key):
+    """Resolve an upload key to a path in this process's UPLOAD_FOLDER"""
+    return os.path.join(UPLOAD_FOLDER, os.path.basename(key))
+
 # Configure transcriptions folder for file-based storage
 TRANSCRIPTIONS_FOLDER = os.environ.get('TRANSCRIPTIONS_FOLDER', '/var/www/speech-app/transcriptions')
 os.makedirs(TRANSCRIPTIONS_FOLDER, exist_ok=True)
 logger.info(f"Transcriptions will be saved to: {TRANSCRIPTIONS_FOLDER}")
 
-# Database availability flag
-DB_AVAILABLE = False
-if db_url:
+# YouTube transcripts and Whisper results for YouTube videos, keyed by video ID;
+# recently used transcripts are also kept in memory
+YOUTUBE_CACHE_DIR = os.path.join(TRANSCRIPTIONS_FOLDER, '.yt_cache')
+youtube_transcript_memory = MemoryCache(maxsize=256)
+
+# Responses of /api/process-text-with-ai, keyed by a digest of model, prompt and text,
+# so re-running a prompt on the same transcript doesn't wait on the model again
+llm_response_memory = MemoryCache(maxsize=128)
+
+# Headers written at the top of saved transcription files
+TRANSCRIPTION_SEPARATOR = '-' * 80 + '\n\n'
+AUDIO_TRANSCRIPTION_HEADER = "Transcription of: {filename}\nDate: {date}\nProcessing time: {processing_time}ms\n" + TRANSCRIPTION_SEPARATOR
+YOUTUBE_TRANSCRIPTION_HEADER = "YouTube Transcription\nURL: {url}\nDate: {date}\n" + TRANSCRIPTION_SEPARATOR
+TRANSCRIPTION_WRITE_BUFFER = 1 << 20
+
+UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9._-]+')
+
+def transcription_file_path(original_filename, now):
+    """Path in TRANSCRIPTIONS_FOLDER for a transcript of original_filename saved at now"""
+    # Upload names are already secure_filename()'d; this only has to keep the stem safe
+    stem = UNSAFE_FILENAME_CHARS.sub('_', original_filename.rsplit('.', 1)[0]).strip('._') or 'file'
+    return os.path.join(TRANSCRIPTIONS_FOLDER, f"{now:%Y%m%d_%H%M%S}_{stem}.txt")
+
+def write_transcription_file(path, header, *parts):
+    """Write a header and the transcription text (given as one or more parts) through one large buffer"""
+    with open(path, 'w', encoding='utf-8', buffering=TRANSCRIPTION_WRITE_BUFFER) as f:
+        f.write(header)
+        f.writelines(parts)
+
+# Responses carrying long transcripts are streamed: the text is JSON-escaped a chunk at
+# a time instead of being joined and encoded as one more full-size copy
+STREAMED_TEXT = '__streamed_text__'
+STREAM_TEXT_THRESHOLD = 256 * 1024
+STREAM_CHUNK_CHARS = 64 * 1024
+
+def text_json_response(payload, parts):
+    """
+    Build a JSON response for payload with the STREAMED_TEXT placeholder replaced by text
+    
+    Args:
+        payload (dict): Response body; exactly one value must be STREAMED_TEXT
+        parts (list): Strings whose concatenation is the text
+    
+    Returns:
+        Response: JSON response, streamed when the text exceeds STREAM_TEXT_THRESHOLD
+    """
+    head, tail = app.json.dumps(payload).split(f'"{STREAMED_TEXT}"', 1)
+    if sum(len(part) for part in parts) <= STREAM_TEXT_THRESHOLD:
+        return app.response_class(head + app.json.dumps(''.join(parts)) + tail, mimetype='application/json')
+    
+    def generate():
+        yield head + '"'
+        for part in parts:
+            for start in range(0, len(part), STREAM_CHUNK_CHARS):
+                # Encode the slice as a JSON string and drop its surrounding quotes
+                yield app.json.dumps(part[start:start + STREAM_CHUNK_CHARS])[1:-1]
+        yield '"' + tail
+    
+    return app.response_class(generate(), mimetype='application/json')
+
+# Database availability: probed at startup, marked down when the pool sees a dropped
+# connection, marked up again on any successful connection, and re-probed in the
+# background while down so the app recovers without a restart
+DB_PROBE_INTERVAL_SECONDS = 30
+db_state = {'ok': False, 'checked_at': 0.0}
+
+def db_available():
+    """Return True if the database answered the most recent probe or connection"""
+    return db_state['ok']
+
+def set_db_state(ok, reason=None):
+    # Log the first result and every change after it
+    if ok != db_state['ok'] or not db_state['checked_at']:
+        if ok:
+            logger.info("✓ Database connection verified - DB available")
+        else:
+            logger.warning(f"✗ Database not available: {reason}")
+    db_state['ok'] = ok
+    db_state['checked_at'] = time.time()
+
+def probe_database():
     try:
-        from sqlalchemy import text
         with app.app_context():
-            db.session.execute(text('SELECT 1'))
-            DB_AVAILABLE = True
-            logger.info("✓ Database connection verified - DB_AVAILABLE = True")
+            db.session.execute(select(1))
+        set_db_state(True)
     except Exception as e:
-        logger.warning(f"✗ Database not available - DB_AVAILABLE = False: {str(e)}")
+        set_db_state(False, str(e))
+
+def on_db_connect(connection):
+    if not db_state['ok']:
+        set_db_state(True)
+
+def on_db_error(context):
+    if context.is_disconnect:
+        set_db_state(False, str(context.original_exception))
+
+def db_probe_loop():
+    while True:
+        time.sleep(DB_PROBE_INTERVAL_SECONDS)
+        if not db_state['ok']:
+            probe_database()
+
+if db_url:
+    with app.app_context():
+        event.listen(db.engine, 'engine_connect', on_db_connect)
+        event.listen(db.engine, 'handle_error', on_db_error)
+    probe_database()
+    threading.Thread(target=db_probe_loop, name='db-probe', daemon=True).start()
 else:
-    logger.warning("✗ No DATABASE_URL configured - DB_AVAILABLE = False")
+    logger.warning("✗ No DATABASE_URL configured - database features disabled")
+
+ALLOWED_EXTENSIONS_BY_TYPE = {
+    'audio': ALLOWED_AUDIO_EXTENSIONS,
+    'document': ALLOWED_DOCUMENT_EXTENSIONS,
+    'all': ALL_ALLOWED_EXTENSIONS,
+}
 
 def allowed_file(filename, file_type='all'):
-    if not filename or '.' not in filename:
-        return False
-    
-    extension = filename.rsplit('.', 1)[1].lower()
-    
-    if file_type == 'audio':
-        return extension in ALLOWED_AUDIO_EXTENSIONS
-    elif file_type == 'document':
-        return extension in ALLOWED_DOCUMENT_EXTENSIONS
-    else:
-        return extension in ALL_ALLOWED_EXTENSIONS
+    """Return the lower-cased extension if the file type is allowed, otherwise None"""
+    extension = get_extension(filename)
+    return extension if extension in ALLOWED_EXTENSIONS_BY_TYPE[file_type] else None
 
 @app.route('/')
 def index():
@@ -133,324 +452,457 @@ def get_suggested_prompts():
         logger.error(f"Error loading suggested prompts: {str(e)}")
         return jsonify({'prompts': []})
 
+def upload_too_large():
+    """Reject a request from its Content-Length before any of the body is read"""
+    if request.content_length and request.content_length > app.config['MAX_CONTENT_LENGTH']:
+        limit_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+        return jsonify({'error': f'File too large. Maximum upload size is {limit_mb}MB.'}), 413
+    return None
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
-    if 'audio_file' not in request.files:
+    too_large = upload_too_large()
+    if too_large:
+        return too_large
+    
+    try:
+        saved_files, _ = receive_multipart(
+            request, 'audio_file', (), UPLOAD_FOLDER, ALL_ALLOWED_EXTENSIONS,
+            max_bytes=app.config['MAX_CONTENT_LENGTH'],
+            expected_sha256=request.headers.get('X-Content-SHA256')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if not saved_files:
         return jsonify({'error': 'No file part'}), 400
     
-    file = request.files['audio_file']
+    # Only one file is expected; anything extra is dropped
+    upload, extra_files = saved_files[0], saved_files[1:]
+    discard_saved_files(extra_files)
     
-    if file.filename == '':
+    if not upload['filename']:
+        discard_saved_files([upload])
         return jsonify({'error': 'No selected file'}), 400
     
-    if file and allowed_file(file.filename):
-        # Generate a unique filename
-        original_filename = secure_filename(file.filename)
-        file_extension = original_filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"{uuid.uuid4()}.{file_extension}"
-        file_size = 0
-        
-        # Create a new transcription record (if database available)
-        transcription = None
-        transcription_id = None
-        if DB_AVAILABLE:
-            try:
-                transcription = Transcription(
-                    original_filename=original_filename,
-                    file_type=file_extension,
-                    file_size=0,  # Will update this after saving the file
-                    status='processing'
-                )
-                db.session.add(transcription)
-                db.session.commit()
-                transcription_id = transcription.id
-            except Exception as e:
-                logger.warning(f"Could not save to database: {str(e)}")
-        
-        # Save the uploaded file temporarily
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(filepath)
-        
-        # Update file size
-        file_size = os.path.getsize(filepath)
-        if transcription:
-            try:
-                transcription.file_size = file_size
-                db.session.commit()
-            except Exception as e:
-                logger.warning(f"Could not update database: {str(e)}")
-        
+    if upload['extension']:
+        original_filename = secure_filename(upload['filename'])
+        return queue_uploaded_file(
+            upload['path'], original_filename, upload['extension'], upload['size'], upload['content_hash']
+        )
+    
+    return jsonify({'error': 'Invalid file type. Only MP3 and WAV files are allowed.'}), 400
+
+@app.route('/upload_stream', methods=['POST', 'PUT'])
+def upload_stream():
+    """Accept a raw application/octet-stream body and write it straight to disk
+    
+    The original filename is passed URL-encoded in the X-Filename header. Skipping multipart
+    parsing avoids Werkzeug spooling the body to a temp file and then copying it.
+    An optional X-Content-SHA256 header is checked against the received bytes.
+    """
+    too_large = upload_too_large()
+    if too_large:
+        return too_large
+    
+    raw_filename = unquote(request.headers.get('X-Filename', ''))
+    file_extension = allowed_file(raw_filename)
+    if not file_extension:
+        return jsonify({'error': 'Missing or invalid X-Filename header'}), 400
+    
+    original_filename = secure_filename(raw_filename)
+    
+    with tempfile.NamedTemporaryFile(dir=UPLOAD_FOLDER, suffix=f'.{file_extension}', delete=False) as tmp:
+        filepath = tmp.name
+        try:
+            content_hash, file_size = copy_and_hash(request.stream, tmp, request.headers.get('X-Content-SHA256'))
+        except Exception as e:
+            logger.error(f"Error receiving streamed upload: {str(e)}")
+            remove_later(filepath)
+            return jsonify({'error': f"Upload failed: {str(e)}"}), 400
+    
+    return queue_uploaded_file(filepath, original_filename, file_extension, file_size, content_hash)
+
+def copy_and_hash(src, dst, expected_sha256=None):
+    """
+    Copy a stream to an open file through a pooled fixed-size buffer
+    
+    Args:
+        src: Readable binary stream
+        dst: Writable binary file
+        expected_sha256 (str): Optional hex SHA-256 the received bytes must match
+    
+    Returns:
+        tuple: (BLAKE2b hex digest of the data, number of bytes written)
+    
+    Raises:
+        ValueError: If expected_sha256 is given and does not match (truncated or corrupt upload)
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    sha256 = hashlib.sha256() if expected_sha256 else None
+    size = copy_chunks(src, dst, digest, sha256)
+    if sha256 and sha256.hexdigest() != expected_sha256.strip().lower():
+        raise ValueError('Upload checksum mismatch: X-Content-SHA256 does not match the received data')
+    return digest.hexdigest(), size
+
+def find_cached_transcription(content_hash):
+    """Return (id, text) of a completed transcription of identical audio, or None"""
+    if not db_available() or not content_hash or not content_hash_supported:
+        return None
+    try:
+        stmt = (
+            select(Transcription.id, Transcription.transcription_text)
+            .where(Transcription.content_hash == content_hash, Transcription.status == 'completed')
+            .limit(1)
+        )
+        return db.session.execute(stmt).first()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Could not look up cached transcription: {str(e)}")
+        return None
+
+def queue_uploaded_file(filepath, original_filename, file_extension, file_size, content_hash=None):
+    """Record a saved upload (sized while it was written) and hand it to the transcription pool"""
+    # Identical audio has already been transcribed: skip Whisper entirely
+    cached = find_cached_transcription(content_hash)
+    if cached:
+        logger.info(f"Reusing transcription {cached.id} for identical upload {original_filename}")
+        remove_later(filepath)
+        return jsonify({
+            'success': True,
+            'filename': original_filename,
+            'transcription': {'text': cached.transcription_text},
+            'transcription_id': cached.id,
+            'cached': True
+        })
+    
+    # Create the transcription record in a single insert (if database available)
+    transcription_id = None
+    if db_available():
+        try:
+            transcription = Transcription(
+                original_filename=original_filename,
+                file_type=file_extension,
+                file_size=file_size,
+                status='queued'
+            )
+            if content_hash_supported:
+                transcription.content_hash = content_hash
+            db.session.add(transcription)
+            db.session.commit()
+            transcription_id = transcription.id
+        except Exception as e:
+            logger.warning(f"Could not save to database: {str(e)}")
+    
+    # Hand conversion + transcription to the worker pool and return immediately
+    job_id = token_hex(16)
+    processing_progress.create(job_id, message='Queued for transcription...')
+    claim_uploads([upload_key(filepath)])
+    transcription_executor.submit(
+        process_upload_worker, job_id, transcription_id, upload_key(filepath), original_filename, file_extension
+    )
+    
+    return jsonify({
+        'success': True,
+        'filename': original_filename,
+        'job_id': job_id,
+        'transcription_id': transcription_id,
+        'message': 'Processing started'
+    }), 202
+
+def process_upload_worker(job_id, transcription_id, key, original_filename, file_extension):
+    """Background worker for /upload: transcribe and record the result"""
+    filepath = upload_path(key)
+    with app.app_context():
         try:
             start_time = time.time()
             
-            # If the file is mp3, convert it to wav
-            if file_extension == 'mp3':
-                logger.debug(f"Converting {filepath} from MP3 to WAV")
-                wav_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4()}.wav")
-                convert_mp3_to_wav(filepath, wav_filepath)
-                
-                # Remove the original mp3 file
-                os.remove(filepath)
-                filepath = wav_filepath
-            
-            # Send the file to the whisper service
-            logger.debug(f"Sending {filepath} to Whisper service")
+            # Send the file to the whisper service as-is; faster-whisper decodes
+            # MP3 to 16kHz PCM in memory, so no intermediate WAV is written
+            processing_progress.update(job_id, progress=20, message=f'Transcribing {original_filename}...')
+            logger.debug("Sending %s to Whisper service", filepath)
             transcription_result = send_to_whisper(filepath)
             
             # Calculate processing time
             processing_time = int((time.time() - start_time) * 1000)  # Convert to milliseconds
             
             # Update the transcription record
-            transcription_text = ""
-            if isinstance(transcription_result, dict):
-                if "text" in transcription_result:
-                    transcription_text = transcription_result["text"]
-                elif "transcription" in transcription_result:
-                    transcription_text = transcription_result["transcription"]
-                else:
-                    transcription_text = str(transcription_result)
-            else:
-                transcription_text = str(transcription_result)
-                
-            if transcription:
-                try:
-                    transcription.transcription_text = transcription_text
-                    transcription.processing_time = processing_time
-                    transcription.status = 'completed'
-                    db.session.commit()
-                except Exception as e:
-                    logger.warning(f"Could not update database: {str(e)}")
+            transcription_text = transcription_result['text']
+            
+            update_transcription_record(
+                transcription_id,
+                transcription_text=transcription_text,
+                processing_time=processing_time,
+                status='completed'
+            )
             
             # Save transcription to file
             try:
-                from datetime import datetime
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                safe_filename = secure_filename(original_filename.rsplit('.', 1)[0])
-                transcription_filename = f"{timestamp}_{safe_filename}.txt"
-                transcription_path = os.path.join(TRANSCRIPTIONS_FOLDER, transcription_filename)
+                now = datetime.now()
+                transcription_path = transcription_file_path(original_filename, now)
                 
-                with open(transcription_path, 'w', encoding='utf-8') as f:
-                    f.write(f"Transcription of: {original_filename}\n")
-                    f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"Processing time: {processing_time}ms\n")
-                    f.write(f"{'-' * 80}\n\n")
-                    f.write(transcription_text)
+                header = AUDIO_TRANSCRIPTION_HEADER.format(
+                    filename=original_filename, date=f"{now:%Y-%m-%d %H:%M:%S}", processing_time=processing_time
+                )
+                write_transcription_file(transcription_path, header, transcription_text)
                 
                 logger.info(f"Transcription saved to: {transcription_path}")
             except Exception as e:
                 logger.warning(f"Could not save transcription to file: {str(e)}")
             
-            # Clean up the audio file
-            os.remove(filepath)
-            
-            return jsonify({
-                'success': True, 
-                'filename': original_filename,
-                'transcription': transcription_result,
-                'transcription_id': transcription_id
-            })
+            processing_progress.update(
+                job_id,
+                status='completed',
+                progress=100,
+                message='Transcription completed!',
+                result={'text': transcription_text}
+            )
             
         except Exception as e:
             logger.error(f"Error processing file: {str(e)}")
+            processing_progress.update(job_id, status='failed', message=f'Error: {str(e)}')
             
             # Update the transcription record to show the error
-            if transcription:
-                try:
-                    transcription.status = 'failed'
-                    transcription.error_message = str(e)
-                    db.session.commit()
-                except Exception as db_err:
-                    logger.warning(f"Could not update database: {str(db_err)}")
-            
-            # Try to clean up files in case of error
-            try:
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-            except:
-                pass
-            
-            return jsonify({'error': f"Error processing file: {str(e)}"}), 500
+            update_transcription_record(transcription_id, status='failed', error_message=str(e))
+        
+        finally:
+            # Clean up the audio file whether or not transcription succeeded
+            remove_later(filepath)
+            release_uploads([key])
+
+def update_transcription_record(transcription_id, **values):
+    """Write the final state of a Transcription row with one UPDATE statement"""
+    if transcription_id is None:
+        return
+    try:
+        db.session.execute(
+            update(Transcription).where(Transcription.id == transcription_id).values(**values)
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Could not update database: {str(e)}")
+
+# Columns shown in the history views; long text fields are truncated in SQL so
+# full transcripts never leave the database for a listing page
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+HISTORY_STREAM_BATCH = 50  # Rows fetched from the DB cursor at a time when streaming NDJSON
+HISTORY_COLUMNS = (
+    ProcessingJob.id,
+    ProcessingJob.job_type,
+    ProcessingJob.input_type,
+    ProcessingJob.original_filename,
+    ProcessingJob.source_url,
+    func.substr(ProcessingJob.input_text, 1, 100).label('input_text'),
+    ProcessingJob.file_size,
+    func.substr(ProcessingJob.result_text, 1, 200).label('result_text'),
+    ProcessingJob.result_files,
+    ProcessingJob.processing_time,
+    ProcessingJob.progress_percentage,
+    ProcessingJob.status,
+    ProcessingJob.error_message,
+    ProcessingJob.created_at,
+)
+
+def history_cursor(created_at, job_id):
+    """Cursor token for the row a history page ended on"""
+    return f"{created_at.isoformat()},{job_id}"
+
+def parse_history_cursor(cursor):
+    """Split a history cursor into (created_at, id); raises ValueError if malformed"""
+    created_at, _, job_id = cursor.rpartition(',')
+    return datetime.fromisoformat(created_at), int(job_id)
+
+def history_page_query(cursor, limit, status=None):
+    """
+    Build the keyset-paginated SELECT behind the history views
     
-    return jsonify({'error': 'Invalid file type. Only MP3 and WAV files are allowed.'}), 400
+    Rows are ordered by (created_at, id) so jobs sharing a timestamp (common with
+    batch inserts) are neither skipped nor repeated across a page boundary. Both
+    this and the status-filtered form are served by ProcessingJob's indexes.
+    """
+    stmt = (
+        select(*HISTORY_COLUMNS)
+        .order_by(ProcessingJob.created_at.desc(), ProcessingJob.id.desc())
+        .limit(limit)
+    )
+    if status:
+        stmt = stmt.where(ProcessingJob.status == status)
+    if cursor:
+        stmt = stmt.where(tuple_(ProcessingJob.created_at, ProcessingJob.id) < tuple_(*parse_history_cursor(cursor)))
+    return stmt
+
+def fetch_history_page_json(cursor=None, limit=HISTORY_PAGE_SIZE, status=None):
+    """
+    Fetch one page of processing jobs already serialized to JSON by PostgreSQL
+    
+    Args:
+        cursor (str): "created_at,id" of the last row on the previous page
+        limit (int): Maximum number of rows to return
+        status (str): Only return jobs with this status
+    
+    Returns:
+        tuple: (JSON array text, next cursor or None)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    limit = max(1, min(limit, HISTORY_MAX_PAGE_SIZE))
+    page = history_page_query(cursor, limit, status).subquery()
+    
+    fields = []
+    for column in page.c:
+        fields.extend([literal_column(f"'{column.name}'"), column])
+    jobs_json = func.json_agg(aggregate_order_by(
+        func.json_build_object(*fields), page.c.created_at.desc(), page.c.id.desc()
+    ))
+    
+    stmt = select(
+        cast(func.coalesce(jobs_json, cast('[]', JSON)), Text),
+        func.count(),
+        func.min(page.c.created_at),
+        array_agg(aggregate_order_by(page.c.id, page.c.created_at.asc(), page.c.id.asc()))[1],
+    )
+    jobs_text, row_count, oldest, oldest_id = db.session.execute(stmt).one()
+    
+    next_cursor = history_cursor(oldest, oldest_id) if row_count == limit and oldest else None
+    return jobs_text, next_cursor
+
+def fetch_history_page(cursor=None, limit=HISTORY_PAGE_SIZE, status=None):
+    """
+    Fetch one page of processing jobs, newest first, using keyset pagination
+    
+    Args:
+        cursor (str): "created_at,id" of the last row on the previous page
+        limit (int): Maximum number of rows to return
+        status (str): Only return jobs with this status
+    
+    Returns:
+        tuple: (list of row mappings, next cursor or None)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    limit = max(1, min(limit, HISTORY_MAX_PAGE_SIZE))
+    stmt = history_page_query(cursor, limit, status)
+    
+    rows = db.session.execute(stmt).mappings().all()
+    next_cursor = None
+    if len(rows) == limit and rows[-1]['created_at']:
+        next_cursor = history_cursor(rows[-1]['created_at'], rows[-1]['id'])
+    return rows, next_cursor
+
+def stream_history_page(cursor=None, limit=HISTORY_PAGE_SIZE, status=None):
+    """
+    Stream one page of processing jobs as NDJSON while rows are fetched from the cursor
+    
+    Each job is one line; a final line carries next_cursor and has_next.
+    
+    Args:
+        cursor (str): "created_at,id" of the last row on the previous page
+        limit (int): Maximum number of rows to return
+        status (str): Only return jobs with this status
+    
+    Returns:
+        generator: Lines of NDJSON text
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    limit = max(1, min(limit, HISTORY_MAX_PAGE_SIZE))
+    stmt = history_page_query(cursor, limit, status).execution_options(yield_per=HISTORY_STREAM_BATCH)
+    
+    def generate():
+        row_count = 0
+        oldest = None
+        oldest_id = None
+        for row in db.session.execute(stmt).mappings():
+            row_count += 1
+            oldest, oldest_id = row['created_at'], row['id']
+            yield app.json.dumps({**row, 'created_at': oldest.isoformat() if oldest else None}) + '\n'
+        
+        next_cursor = history_cursor(oldest, oldest_id) if row_count == limit and oldest else None
+        yield app.json.dumps({'next_cursor': next_cursor, 'has_next': next_cursor is not None}) + '\n'
+    
+    return generate()
 
 @app.route('/history', methods=['GET'])
 def transcription_history():
-    if not DB_AVAILABLE:
+    if not db_available():
         return render_template('history.html', history=[], message="Database unavailable")
     
     try:
-        # Get all processing jobs, ordered by most recent first
-        jobs = ProcessingJob.query.order_by(ProcessingJob.created_at.desc()).all()
-        
-        # Convert to a list of dictionaries for the template
-        history = [job.to_dict() for job in jobs]
+        status = request.args.get('status')
+        history, next_cursor = fetch_history_page(
+            request.args.get('cursor'),
+            request.args.get('limit', HISTORY_PAGE_SIZE, type=int),
+            status
+        )
         
         # Render the history template
-        return render_template('history.html', history=history)
+        return render_template('history.html', history=history, next_cursor=next_cursor, status=status)
+    except ValueError:
+        return render_template('history.html', history=[], message="Invalid cursor")
     except Exception as e:
         logger.error(f"Error fetching history: {str(e)}")
         return render_template('history.html', history=[], message="Error loading history")
 
 @app.route('/api/history', methods=['GET'])
 def api_transcription_history():
-    if not DB_AVAILABLE:
+    if not db_available():
         return jsonify({'jobs': [], 'message': 'Database unavailable'})
     
     try:
-        # Get all processing jobs, ordered by most recent first
-        jobs = ProcessingJob.query.order_by(ProcessingJob.created_at.desc()).all()
+        cursor = request.args.get('cursor')
+        limit = request.args.get('limit', HISTORY_PAGE_SIZE, type=int)
+        status = request.args.get('status')
+        
+        # ?format=ndjson (or Accept: application/x-ndjson) streams rows as they are fetched
+        if request.args.get('format') == 'ndjson' or request.accept_mimetypes.best == 'application/x-ndjson':
+            lines = stream_history_page(cursor, limit, status)
+            return app.response_class(stream_with_context(lines), mimetype='application/x-ndjson')
+        
+        # On PostgreSQL the database builds the JSON; pass it through untouched
+        if db.engine.dialect.name == 'postgresql':
+            jobs_text, next_cursor = fetch_history_page_json(cursor, limit, status)
+            body = (
+                f'{{"jobs": {jobs_text}, "next_cursor": {app.json.dumps(next_cursor)}, '
+                f'"has_next": {app.json.dumps(next_cursor is not None)}}}'
+            )
+            return app.response_class(body, mimetype='application/json')
         
-        # Convert to a list of dictionaries for JSON
-        history = [job.to_dict() for job in jobs]
+        rows, next_cursor = fetch_history_page(cursor, limit, status)
         
-        return jsonify({'jobs': history})
+        history = [
+            {**row, 'created_at': row['created_at'].isoformat() if row['created_at'] else None}
+            for row in rows
+        ]
+        
+        return jsonify({'jobs': history, 'next_cursor': next_cursor, 'has_next': next_cursor is not None})
+    except ValueError:
+        return jsonify({'jobs': [], 'error': 'Invalid cursor'}), 400
     except Exception as e:
         logger.error(f"Error fetching history: {str(e)}")
         return jsonify({'jobs': [], 'error': str(e)}), 500
 
-# Global dictionary to track processing progress
-processing_progress = {}
-
 def process_audio_files_directly(files):
-    """Process audio files directly without database/job tracking"""
-    from datetime import datetime
-    import threading
+    """Process audio files directly without database/job tracking
     
+    Args:
+        files (list): Saved uploads as returned by receive_multipart
+    """
     # Generate a unique job ID for tracking
-    job_id = str(uuid.uuid4())
-    processing_progress[job_id] = {
-        'status': 'processing',
-        'progress': 0,
-        'message': 'Starting...',
-        'result': None,
-        'start_time': time.time(),
-        'file_duration': None,
-        'processed_duration': 0
-    }
+    job_id = token_hex(16)
+    processing_progress.create(job_id, message='Starting...', file_duration=None, processed_duration=0)
     
     logger.info(f"Processing {len(files)} audio files directly - Job ID: {job_id}")
     
-    # Save files first (outside thread, while files are still open)
-    saved_files = []
-    for file in files:
-        if not file.filename or not allowed_file(file.filename, 'audio'):
-            continue
-            
-        original_filename = secure_filename(file.filename)
-        file_extension = original_filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"{uuid.uuid4()}.{file_extension}"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(filepath)
-        saved_files.append((filepath, original_filename, file_extension))
-    
-    # Start processing in background thread
-    def process_async():
-        all_transcriptions = []
-        try:
-            processing_progress[job_id]['progress'] = 10
-            processing_progress[job_id]['message'] = 'Preparing files...'
+    saved_files = [(upload_key(f['path']), secure_filename(f['filename']), f['extension']) for f in files]
     
-            total_files = len(saved_files)
-            current_file = 0
-            
-            for filepath, original_filename, file_extension in saved_files:
-                current_file += 1
-                
-                processing_progress[job_id]['progress'] = 20 + (current_file - 1) * 60 // total_files
-                processing_progress[job_id]['message'] = f'Processing file {current_file}/{total_files}: {original_filename}'
-                
-                try:
-                    # Convert MP3 to WAV if needed
-                    if file_extension == 'mp3':
-                        wav_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4()}.wav")
-                        convert_mp3_to_wav(filepath, wav_filepath)
-                        os.remove(filepath)
-                        filepath = wav_filepath
-                    
-                    processing_progress[job_id]['message'] = f'Transcribing {current_file}/{total_files}: {original_filename}'
-                    
-                    # Get audio duration
-                    try:
-                        import subprocess
-                        duration_result = subprocess.run(
-                            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', 
-                             '-of', 'default=noprint_wrappers=1:nokey=1', filepath],
-                            capture_output=True, text=True, timeout=10
-                        )
-                        if duration_result.returncode == 0:
-                            duration_seconds = float(duration_result.stdout.strip())
-                            processing_progress[job_id]['file_duration'] = duration_seconds
-                            hours = int(duration_seconds // 3600)
-                            minutes = int((duration_seconds % 3600) // 60)
-                            seconds = int(duration_seconds % 60)
-                            duration_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}" if hours > 0 else f"{minutes:02d}:{seconds:02d}"
-                            logger.info(f"Audio duration: {duration_str}")
-                    except Exception as e:
-                        logger.warning(f"Could not get audio duration: {str(e)}")
-                    
-                    # Transcribe with progress callback
-                    transcribe_start = time.time()
-                    
-                    def update_transcription_progress(processed_seconds, total_seconds):
-                        processing_progress[job_id]['processed_duration'] = processed_seconds
-                        if total_seconds > 0:
-                            transcribe_progress = (processed_seconds / total_seconds) * 60
-                            processing_progress[job_id]['progress'] = 20 + int(transcribe_progress)
-                    
-                    transcription_result = send_to_whisper(filepath, language='en', progress_callback=update_transcription_progress)
-                    processing_time = int((time.time() - transcribe_start) * 1000)
-                    
-                    # Extract text
-                    if isinstance(transcription_result, dict) and 'text' in transcription_result:
-                        transcription_text = transcription_result['text']
-                    else:
-                        transcription_text = str(transcription_result)
-                    
-                    all_transcriptions.append(transcription_text)
-                    
-                    processing_progress[job_id]['message'] = f'Saving {current_file}/{total_files}: {original_filename}'
-                    
-                    # Save to file
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    safe_filename = secure_filename(original_filename.rsplit('.', 1)[0])
-                    transcription_filename = f"{timestamp}_{safe_filename}.txt"
-                    transcription_path = os.path.join(TRANSCRIPTIONS_FOLDER, transcription_filename)
-                    
-                    with open(transcription_path, 'w', encoding='utf-8') as f:
-                        f.write(f"Transcription of: {original_filename}\n")
-                        f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                        f.write(f"Processing time: {processing_time}ms\n")
-                        f.write(f"{'-' * 80}\n\n")
-                        f.write(transcription_text)
-                    
-                    logger.info(f"Audio transcription saved to: {transcription_path}")
-                    
-                    # Clean up
-                    os.remove(filepath)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing {original_filename}: {str(e)}")
-                    all_transcriptions.append(f"Error processing {original_filename}: {str(e)}")
-                    if os.path.exists(filepath):
-                        os.remove(filepath)
-            
-            result_text = '\n\n'.join(all_transcriptions) if all_transcriptions else "No transcriptions generated"
-            
-            # Mark as complete
-            processing_progress[job_id]['status'] = 'completed'
-            processing_progress[job_id]['progress'] = 100
-            processing_progress[job_id]['message'] = 'Transcription completed!'
-            processing_progress[job_id]['result'] = {'text': result_text}
-            
-        except Exception as e:
-            logger.error(f"Error in async processing: {str(e)}")
-            processing_progress[job_id]['status'] = 'failed'
-            processing_progress[job_id]['message'] = f'Error: {str(e)}'
-    
-    # Start background thread
-    thread = threading.Thread(target=process_async)
-    thread.daemon = True
-    thread.start()
+    # Queue on the bounded transcription pool rather than a thread per request
+    claim_uploads([key for key, _, _ in saved_files])
+    transcription_executor.submit(transcribe_direct_job, job_id, saved_files)
     
     # Return job ID for polling
     return jsonify({
@@ -459,10 +911,226 @@ def process_audio_files_directly(files):
         'message': 'Processing started'
     })
 
+def save_direct_transcription(filepath, original_filename, transcription_text, processing_time):
+    """Write a direct job's transcript to TRANSCRIPTIONS_FOLDER and delete its upload"""
+    try:
+        now = datetime.now()
+        transcription_path = transcription_file_path(original_filename, now)
+        
+        header = AUDIO_TRANSCRIPTION_HEADER.format(
+            filename=original_filename, date=f"{now:%Y-%m-%d %H:%M:%S}", processing_time=processing_time
+        )
+        write_transcription_file(transcription_path, header, transcription_text)
+        
+        logger.info(f"Audio transcription saved to: {transcription_path}")
+    except Exception as e:
+        logger.warning(f"Could not save transcription to file: {str(e)}")
+    finally:
+        # Clean up
+        remove_later(filepath)
+
+def transcribe_direct_job(job_id, saved_files):
+    """
+    Transcribe files saved by process_audio_files_directly, reporting through processing_progress
+    
+    Args:
+        job_id (str): Key of the job in processing_progress
+        saved_files (list): (upload key, original_filename, file_extension) tuples
+    """
+    all_transcriptions = []
+    try:
+        processing_progress.update(job_id, progress=10, message='Preparing files...')
+
+        total_files = len(saved_files)
+        
+        # Short clips share Whisper calls (each call pays model and encoder start-up);
+        # longer files are transcribed individually below
+        short_files = []
+        if total_files > 1:
+            short_files = [
+                upload_path(key) for key, _, _ in saved_files
+                if os.path.getsize(upload_path(key)) <= SMALL_UPLOAD_BYTES
+            ]
+            if len(short_files) < 2:
+                short_files = []
+        
+        # Duration progress is only meaningful while a single file is transcribing
+        def update_transcription_progress(processed_seconds, total_seconds):
+            processing_progress.update(job_id, processed_duration=processed_seconds)
+            if total_seconds > 0:
+                transcribe_progress = (processed_seconds / total_seconds) * 60
+                processing_progress.update(
+                    job_id, file_duration=total_seconds, progress=20 + int(transcribe_progress)
+                )
+        
+        # The remaining uploads are converted on the CPU pool and each moves on to the
+        # Whisper pool as soon as it is ready, so several transcribe side by side while
+        # this thread only collects results. Largest files are queued first so a long
+        # file doesn't start last and run alone; results are still saved in upload order.
+        remaining = sorted(
+            (upload_path(key) for key, _, _ in saved_files if upload_path(key) not in short_files),
+            key=os.path.getsize, reverse=True
+        )
+        progress_callback = update_transcription_progress if len(remaining) == 1 else None
+        transcribe_start = time.time()
+        transcriptions = {
+            filepath: transcribe_when_converted(
+                conversion_executor.submit(convert_for_whisper, filepath), progress_callback
+            )
+            for filepath in remaining
+        }
+        processing_progress.update(
+            job_id,
+            progress=20,
+            message=f'Transcribing {total_files} file{"s" if total_files > 1 else ""}...'
+        )
+        
+        batched_results = {}
+        if short_files:
+            processing_progress.update(job_id, message=f'Transcribing {len(short_files)} short files together...')
+            batched_results = dict(zip(short_files, transcribe_many(short_files)))
+        batch_time = int((time.time() - transcribe_start) * 1000)
+        
+        # Note when each transcript is ready; with several files progress counts them
+        ready_at = {}
+        pending = {future: filepath for filepath, future in transcriptions.items()}
+        for done_count, future in enumerate(as_completed(pending), start=1):
+            ready_at[pending[future]] = time.time()
+            if len(pending) > 1:
+                processing_progress.update(
+                    job_id,
+                    progress=20 + done_count * 60 // len(pending),
+                    message=f'Transcribed {done_count}/{len(pending)} files'
+                )
+        
+        # Transcript writes and upload cleanup run on the conversion pool
+        save_futures = []
+        for key, original_filename, file_extension in saved_files:
+            filepath = upload_path(key)
+            
+            try:
+                if filepath in batched_results:
+                    # Transcribed together with the other short files
+                    transcription_result = batched_results.pop(filepath)
+                    if isinstance(transcription_result, Exception):
+                        raise transcription_result
+                    transcription_text = transcription_result['text']
+                    processing_time = batch_time
+                else:
+                    transcription_text = transcriptions[filepath].result()
+                    processing_time = int((ready_at[filepath] - transcribe_start) * 1000)
+                
+                all_transcriptions.append(transcription_text)
+                
+                save_futures.append(conversion_executor.submit(
+                    save_direct_transcription, filepath, original_filename, transcription_text, processing_time
+                ))
+                
+            except Exception as e:
+                logger.error(f"Error processing {original_filename}: {str(e)}")
+                all_transcriptions.append(f"Error processing {original_filename}: {str(e)}")
+                remove_later(filepath)
+        
+        processing_progress.update(job_id, message='Saving transcriptions...')
+        for future in save_futures:
+            future.result()
+        
+        result_text = '\n\n'.join(all_transcriptions) if all_transcriptions else "No transcriptions generated"
+        
+        # Mark as complete
+        processing_progress.update(
+            job_id,
+            status='completed',
+            progress=100,
+            message='Transcription completed!',
+            result={'text': result_text}
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in async processing: {str(e)}")
+        processing_progress.update(job_id, status='failed', message=f'Error: {str(e)}')
+    
+    finally:
+        release_uploads([key for key, _, _ in saved_files])
+
+def fetch_youtube_transcript(source_url, language_codes=DEFAULT_TRANSCRIPT_LANGUAGES):
+    """get_youtube_transcript, answered from the memory or on-disk cache when this video was seen before"""
+    video_id = extract_video_id(source_url)
+    # Which transcript is picked depends on the language preference, so it is part of the key
+    cache_key = f"{video_id}.{'-'.join(language_codes)}" if video_id else None
+    if cache_key:
+        cached = youtube_transcript_memory.get(cache_key)
+        if cached is None:
+            cached = load_cached(YOUTUBE_CACHE_DIR, cache_key)
+            if cached:
+                youtube_transcript_memory.put(cache_key, cached)
+        if cached:
+            logger.info(f"Using cached YouTube transcript for {video_id}")
+            return cached
+    
+    transcript_result = get_youtube_transcript(source_url, language_codes)
+    # Only successes are cached; a missing transcript may be published later
+    if cache_key and transcript_result['success']:
+        youtube_transcript_memory.put(cache_key, transcript_result)
+        store_cached(YOUTUBE_CACHE_DIR, cache_key, transcript_result)
+    return transcript_result
+
+def transcribe_youtube_video(source_url):
+    """
+    Download a YouTube video and transcribe it with Whisper, reusing a cached result
+    
+    Args:
+        source_url (str): YouTube video URL
+    
+    Returns:
+        str: Transcription text
+    """
+    video_id = extract_video_id(source_url)
+    cache_key = f"{video_id}.whisper" if video_id else None
+    if cache_key:
+        cached = load_cached(YOUTUBE_CACHE_DIR, cache_key)
+        if cached:
+            logger.info(f"Using cached Whisper transcription for {video_id}")
+            return cached['text']
+    
+    transcription_result = None
+    if transcribes_in_process():
+        # The model runs here, so feed it decoded samples instead of a downloaded file,
+        # as long as the length is known, within the cap and a decode slot is free
+        try:
+            duration = get_youtube_info(source_url).get('duration')
+        except Exception as e:
+            logger.warning(f"Could not read YouTube video length: {str(e)}")
+            duration = None
+        if duration and duration <= IN_MEMORY_DECODE_MAX_SECONDS and in_memory_decodes.acquire(blocking=False):
+            try:
+                transcription_result = transcribe_samples(
+                    stream_youtube_pcm(source_url, IN_MEMORY_DECODE_MAX_SECONDS)
+                )
+            except Exception as e:
+                logger.warning(f"Streaming YouTube audio failed: {str(e)}, downloading the video instead")
+            finally:
+                in_memory_decodes.release()
+    
+    if transcription_result is None:
+        logger.info("Downloading YouTube video (low resolution) for transcription...")
+        video_file = download_youtube_video(source_url, UPLOAD_FOLDER)
+        claim_uploads([upload_key(video_file)])
+        try:
+            logger.info(f"Transcribing downloaded YouTube video: {video_file}")
+            transcription_result = send_to_whisper(video_file)
+        finally:
+            # Clean up downloaded file
+            remove_later(video_file)
+            release_uploads([upload_key(video_file)])
+    
+    transcription_text = transcription_result['text']
+    if cache_key:
+        store_cached(YOUTUBE_CACHE_DIR, cache_key, {'text': transcription_text})
+    return transcription_text
+
 def process_youtube_directly(source_url, data):
     """Process YouTube URL directly without database/job tracking"""
-    from datetime import datetime
-    
     logger.info(f"Processing YouTube URL directly: {source_url}")
     
     youtube_options = data.get('youtubeOptions', {})
@@ -475,7 +1143,7 @@ def process_youtube_directly(source_url, data):
     
     # Try to pull existing transcript first if requested
     if pull_transcript:
-        transcript_result = get_youtube_transcript(source_url)
+        transcript_result = fetch_youtube_transcript(source_url)
         if transcript_result['success']:
             all_transcriptions.append(transcript_result['text'])
             transcript_sources.append(f"YouTube Transcript ({transcript_result['language']})")
@@ -489,35 +1157,8 @@ def process_youtube_directly(source_url, data):
     # If no transcript, download low-res video and transcribe
     if not all_transcriptions and transcribe_audio:
         try:
-            from utils.youtube_processor import download_youtube_video
-            
-            logger.info("Downloading YouTube video (low resolution) for transcription...")
-            video_file = download_youtube_video(source_url, app.config['UPLOAD_FOLDER'])
-            
-            if video_file and os.path.exists(video_file):
-                try:
-                    logger.info(f"Transcribing downloaded YouTube video: {video_file}")
-                    transcription_result = send_to_whisper(video_file)
-                    
-                    if isinstance(transcription_result, dict) and 'text' in transcription_result:
-                        transcription_text = transcription_result['text']
-                    else:
-                        transcription_text = str(transcription_result)
-                    
-                    all_transcriptions.append(transcription_text)
-                    transcript_sources.append("Video Transcription (Whisper)")
-                    
-                    # Clean up downloaded file
-                    logger.info(f"Cleaning up downloaded video file: {video_file}")
-                    if os.path.exists(video_file):
-                        os.remove(video_file)
-                        logger.info("Video file cleaned up successfully")
-                        
-                except Exception as e:
-                    logger.error(f"Error transcribing YouTube video: {str(e)}")
-                    if os.path.exists(video_file):
-                        os.remove(video_file)
-                    raise
+            all_transcriptions.append(transcribe_youtube_video(source_url))
+            transcript_sources.append("Video Transcription (Whisper)")
         except Exception as e:
             logger.error(f"Error downloading/transcribing YouTube video: {str(e)}")
             if not all_transcriptions:
@@ -529,39 +1170,101 @@ def process_youtube_directly(source_url, data):
     
 
     
-    # Combine results
+    # Combine results, keeping them as parts so no joined copy is built
     if len(all_transcriptions) > 1:
-        formatted_results = []
+        result_parts = []
         for text, source in zip(all_transcriptions, transcript_sources):
-            formatted_results.append(f"=== {source} ===\n{text}")
-        result_text = '\n\n'.join(formatted_results)
+            result_parts.extend(['\n\n' if result_parts else '', f"=== {source} ===\n", text])
     else:
-        result_text = all_transcriptions[0] if all_transcriptions else "No transcript available"
+        result_parts = [all_transcriptions[0]]
     
     # Save to file
     try:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        now = datetime.now()
         # Extract video ID for filename
         video_id = source_url.split('v=')[-1].split('&')[0] if 'v=' in source_url else 'youtube'
-        transcription_filename = f"{timestamp}_youtube_{video_id}.txt"
+        transcription_filename = f"{now:%Y%m%d_%H%M%S}_youtube_{video_id}.txt"
         transcription_path = os.path.join(TRANSCRIPTIONS_FOLDER, transcription_filename)
         
-        with open(transcription_path, 'w', encoding='utf-8') as f:
-            f.write(f"YouTube Transcription\n")
-            f.write(f"URL: {source_url}\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"{'-' * 80}\n\n")
-            f.write(result_text)
+        header = YOUTUBE_TRANSCRIPTION_HEADER.format(url=source_url, date=f"{now:%Y-%m-%d %H:%M:%S}")
+        write_transcription_file(transcription_path, header, *result_parts)
         
         logger.info(f"YouTube transcription saved to: {transcription_path}")
     except Exception as e:
         logger.warning(f"Could not save transcription to file: {str(e)}")
     
-    return jsonify({
+    return text_json_response({
         'success': True,
-        'transcription': {'text': result_text},
+        'transcription': {'text': STREAMED_TEXT},
         'message': 'YouTube transcription completed'
-    })
+    }, result_parts)
+
+def transcribe_youtube_job(job_id, source_url, youtube_options=None):
+    """
+    Transcribe a YouTube URL for a direct job, reporting through processing_progress
+    
+    Args:
+        job_id (str): Direct job id
+        source_url (str): YouTube video URL
+        youtube_options (dict): The client's youtubeOptions: pullTranscript, transcribeAudio
+            and preferTranscript (with both of the others set, a published transcript is
+            used on its own unless this is false)
+    """
+    youtube_options = youtube_options or {}
+    pull_transcript = youtube_options.get('pullTranscript', True)
+    transcribe_audio = youtube_options.get('transcribeAudio', False)
+    prefer_transcript = youtube_options.get('preferTranscript', True)
+    try:
+        transcript_result = None
+        if pull_transcript:
+            processing_progress.update(job_id, progress=10, message='Checking for existing transcript...')
+            transcript_result = fetch_youtube_transcript(source_url)
+            if not transcript_result['success']:
+                logger.info(f"No transcript available: {transcript_result['error']}")
+                transcript_result = None
+        
+        if transcript_result and transcribe_audio and prefer_transcript:
+            logger.info("YouTube transcript found, skipping audio transcription (preferTranscript)")
+            transcription_text = (
+                f"=== YouTube Transcript ({transcript_result['language']}); audio transcription skipped ===\n"
+                f"{transcript_result['text']}"
+            )
+        elif transcript_result and not transcribe_audio:
+            transcription_text = transcript_result['text']
+        else:
+            # No published transcript, or the client asked for Whisper's too
+            processing_progress.update(job_id, progress=30, message='Downloading and transcribing low-res video...')
+            transcription_text = transcribe_youtube_video(source_url)
+            if transcript_result:
+                transcription_text = (
+                    f"=== YouTube Transcript ({transcript_result['language']}) ===\n{transcript_result['text']}\n\n"
+                    f"=== Video Transcription (Whisper) ===\n{transcription_text}"
+                )
+        
+        processing_progress.update(job_id, progress=90, message='Saving transcript...')
+        
+        # Save to file
+        now = datetime.now()
+        video_id = source_url.split('v=')[-1].split('&')[0] if 'v=' in source_url else source_url.split('/')[-1]
+        transcription_filename = f"{now:%Y%m%d_%H%M%S}_youtube_{video_id}.txt"
+        transcription_path = os.path.join(TRANSCRIPTIONS_FOLDER, transcription_filename)
+        
+        header = YOUTUBE_TRANSCRIPTION_HEADER.format(url=source_url, date=f"{now:%Y-%m-%d %H:%M:%S}")
+        write_transcription_file(transcription_path, header, transcription_text)
+        
+        logger.info(f"YouTube transcription saved to: {transcription_path}")
+        
+        processing_progress.update(
+            job_id,
+            progress=100,
+            message='Completed!',
+            status='completed',
+            result={'text': transcription_text}
+        )
+        
+    except Exception as e:
+        logger.error(f"YouTube error: {str(e)}")
+        processing_progress.update(job_id, status='failed', message=f'Error: {str(e)}')
 
 @app.route('/api/process', methods=['POST'])
 def api_process():
@@ -569,81 +1272,26 @@ def api_process():
     try:
         # Determine input type and extract data
         if request.content_type and 'multipart/form-data' in request.content_type:
-            # File upload - always treat as audio-video for direct processing
-            input_type = 'audio-video'  # Force audio processing to avoid DB
-            target_language = request.form.get('target_language', 'en')
-            voice_id = request.form.get('voice_id', 'google_en')
-            output_formats = request.form.get('output_formats', '["text"]')
+            # File uploads are always transcribed directly, without database job tracking,
+            # since that is not reliable when PostgreSQL is down
+            too_large = upload_too_large()
+            if too_large:
+                return too_large
             
-            try:
-                import json
-                output_formats = json.loads(output_formats)  # Safely convert string to list
-                if not isinstance(output_formats, list):
-                    output_formats = ['text']
-            except:
-                output_formats = ['text']
+            # Parse the body ourselves so files stream straight to disk
+            saved_files, _ = receive_multipart(
+                request, 'files', (), UPLOAD_FOLDER, ALLOWED_AUDIO_EXTENSIONS,
+                max_bytes=app.config['MAX_CONTENT_LENGTH']
+            )
             
-            files = request.files.getlist('files')
-            if not files or not files[0].filename:
+            if not saved_files or not saved_files[0]['filename']:
+                discard_saved_files(saved_files)
                 return jsonify({'error': 'No files provided'}), 400
             
-            # Extract LLM config from form data
-            llm_config_str = request.form.get('llm_config', '{}')
-            try:
-                import json
-                llm_config = json.loads(llm_config_str)
-            except:
-                llm_config = {}
+            files = [f for f in saved_files if f['path']]
             
-            # Always process audio files directly without database
-            # Database job tracking is not reliable when PostgreSQL is down
-            if input_type == 'audio-video':
-                logger.info("Processing audio files directly (no database required)")
-                return process_audio_files_directly(files)
-            
-            # Create processing job (requires database)
-            try:
-                job = ProcessingJob(
-                    job_type='transcription' if input_type == 'audio-video' else 'document_processing',
-                    input_type='file',
-                    target_language=target_language,
-                    voice_id=voice_id,
-                    output_formats=output_formats,
-                    job_metadata={'llm': llm_config},
-                    status='pending'
-                )
-                db.session.add(job)
-                db.session.flush()  # Get the job ID
-            except Exception as db_err:
-                logger.error(f"Cannot create job - database unavailable: {str(db_err)}")
-                return jsonify({'error': 'Database required for advanced processing is unavailable. Processing failed.'}), 503
-            
-            # Process files
-            processed_files = []
-            for file in files:
-                if file.filename and allowed_file(file.filename):
-                    filename = secure_filename(file.filename)
-                    file_extension = filename.rsplit('.', 1)[1].lower()
-                    unique_filename = f"{uuid.uuid4()}.{file_extension}"
-                    filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-                    file.save(filepath)
-                    
-                    job.original_filename = filename
-                    job.file_type = file_extension
-                    job.file_size = os.path.getsize(filepath)
-                    
-                    processed_files.append(filepath)
-            
-            db.session.commit()
-            
-            # Start background processing
-            process_job_async(job.id, processed_files)
-            
-            return jsonify({
-                'success': True,
-                'job_id': job.id,
-                'message': 'Processing started'
-            })
+            logger.info("Processing audio files directly (no database required)")
+            return process_audio_files_directly(files)
             
         else:
             # JSON request (YouTube, text, etc.)
@@ -664,75 +1312,11 @@ def api_process():
                 # Process YouTube with progress tracking (no database required)
                 logger.info(f"Processing YouTube with progress tracking: {source_url}")
                 
-                job_id = str(uuid.uuid4())
-                processing_progress[job_id] = {
-                    'status': 'processing',
-                    'progress': 0,
-                    'message': 'Starting YouTube processing...',
-                    'result': None,
-                    'start_time': time.time()
-                }
-                
-                def process_youtube_async():
-                    try:
-                        from datetime import datetime
-                        from utils.youtube_processor import download_youtube_video
-                        
-                        processing_progress[job_id]['progress'] = 10
-                        processing_progress[job_id]['message'] = 'Checking for existing transcript...'
-                        
-                        transcript_result = get_youtube_transcript(source_url)
-                        
-                        if transcript_result['success']:
-                            transcription_text = transcript_result['text']
-                            processing_progress[job_id]['progress'] = 90
-                            processing_progress[job_id]['message'] = 'Saving transcript...'
-                        else:
-                            processing_progress[job_id]['progress'] = 30
-                            processing_progress[job_id]['message'] = 'Downloading low-res video...'
-                            
-                            video_file = download_youtube_video(source_url, app.config['UPLOAD_FOLDER'])
-                            
-                            processing_progress[job_id]['progress'] = 50
-                            processing_progress[job_id]['message'] = 'Transcribing with Whisper...'
-                            
-                            result = send_to_whisper(video_file)
-                            transcription_text = result['text'] if isinstance(result, dict) else str(result)
-                            
-                            processing_progress[job_id]['progress'] = 90
-                            processing_progress[job_id]['message'] = 'Cleaning up...'
-                            
-                            if os.path.exists(video_file):
-                                os.remove(video_file)
-                                logger.info(f"Removed video file: {video_file}")
-                        
-                        # Save to file
-                        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                        video_id = source_url.split('v=')[-1].split('&')[0] if 'v=' in source_url else source_url.split('/')[-1]
-                        transcription_filename = f"{timestamp}_youtube_{video_id}.txt"
-                        transcription_path = os.path.join(TRANSCRIPTIONS_FOLDER, transcription_filename)
-                        
-                        with open(transcription_path, 'w', encoding='utf-8') as f:
-                            f.write(f"YouTube Transcription\n")
-                            f.write(f"URL: {source_url}\n")
-                            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                            f.write(f"{'-' * 80}\n\n")
-                            f.write(transcription_text)
-                        
-                        logger.info(f"YouTube transcription saved to: {transcription_path}")
-                        
-                        processing_progress[job_id]['progress'] = 100
-                        processing_progress[job_id]['message'] = 'Completed!'
-                        processing_progress[job_id]['status'] = 'completed'
-                        processing_progress[job_id]['result'] = {'text': transcription_text}
-                        
-                    except Exception as e:
-                        logger.error(f"YouTube error: {str(e)}")
-                        processing_progress[job_id]['status'] = 'failed'
-                        processing_progress[job_id]['message'] = f'Error: {str(e)}'
+                job_id = token_hex(16)
+                processing_progress.create(job_id, message='Starting YouTube processing...')
                 
-                import threading
-                threading.Thread(target=process_youtube_async, daemon=True).start()
+                # Queue on the bounded transcription pool rather than a thread per request
+                transcription_executor.submit(transcribe_youtube_job, job_id, source_url, data.get('youtubeOptions'))
                 
                 return jsonify({'success': True, 'job_id': job_id})
                 
@@ -782,7 +1366,7 @@ def api_process():
                 db.session.commit()
                 
                 # Start background processing
-                process_job_async(job.id)
+                process_job_async(job.id, job_type=job.job_type)
                 
                 return jsonify({
                     'success': True,
@@ -797,57 +1381,85 @@ def api_process():
         logger.error(f"Error in API process: {str(e)}")
         return jsonify({'error': f"Processing failed: {str(e)}"}), 500
 
+def format_time(seconds):
+    """Format a duration in seconds as e.g. '1h 2m 3s', '2m 3s' or '3s'"""
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    if h:
+        return f"{h}h {m}m {s}s"
+    if m:
+        return f"{m}m {s}s"
+    return f"{s}s"
+
+def direct_job_payload(job_id, progress):
+    """Status payload of a direct job from its progress snapshot, without the result text"""
+    # Calculate time information
+    elapsed_time = time.time() - progress['start_time']
+    
+    # Build status message with time info
+    status_message = progress['message']
+    duration = progress.get('file_duration')
+    if duration:
+        processed = progress.get('processed_duration', 0)
+        
+        # Estimate remaining time based on processing speed
+        if processed > 0 and elapsed_time > 0:
+            processing_speed = processed / elapsed_time  # seconds of audio per second of processing
+            remaining_audio = duration - processed
+            estimated_remaining = remaining_audio / processing_speed if processing_speed > 0 else 0
+            
+            status_message += f"\n📊 Duration: {format_time(duration)} | Processed: {format_time(processed)} | Remaining: ~{format_time(estimated_remaining)}"
+        else:
+            status_message += f"\n📊 Total duration: {format_time(duration)} | Analyzing..."
+    
+    return {
+        'job_id': job_id,
+        'status': progress['status'],
+        'progress_percentage': progress['progress'],
+        'status_message': status_message,
+        'result_text': None,
+        'result_files': [],
+        'error_message': None,
+        'processing_time': int(elapsed_time * 1000)
+    }
+
+JOB_STATUS_MESSAGES = {
+    'pending': 'Waiting to start...',
+    'processing': 'Processing in progress...',
+    'completed': 'Processing completed!',
+    'failed': 'Processing failed'
+}
+
+def database_job_payload(job):
+    """Status payload of a database-tracked job"""
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'progress_percentage': job_progress.get(job.id, job.progress_percentage),
+        'status_message': JOB_STATUS_MESSAGES.get(job.status, 'Unknown status'),
+        'result_text': job.result_text,
+        'result_files': job.result_files,
+        'error_message': job.error_message,
+        'processing_time': job.processing_time
+    }
+
 @app.route('/api/job-status/<job_id>', methods=['GET'])
 def api_job_status(job_id):
     """Get the status of a processing job"""
+    if request.accept_mimetypes.best == 'text/event-stream':
+        return api_job_stream(job_id)
+    
     # Check in-memory progress first (for direct processing)
-    if job_id in processing_progress:
-        progress = processing_progress[job_id]
-        
-        # Calculate time information
-        elapsed_time = time.time() - progress['start_time']
-        
-        # Build status message with time info
-        status_message = progress['message']
-        if progress.get('file_duration'):
-            duration = progress['file_duration']
-            processed = progress.get('processed_duration', 0)
-            
-            # Format durations
-            def format_time(seconds):
-                h = int(seconds // 3600)
-                m = int((seconds % 3600) // 60)
-                s = int(seconds % 60)
-                if h > 0:
-                    return f"{h}h {m}m {s}s"
-                elif m > 0:
-                    return f"{m}m {s}s"
-                else:
-                    return f"{s}s"
-            
-            # Estimate remaining time based on processing speed
-            if processed > 0 and elapsed_time > 0:
-                processing_speed = processed / elapsed_time  # seconds of audio per second of processing
-                remaining_audio = duration - processed
-                estimated_remaining = remaining_audio / processing_speed if processing_speed > 0 else 0
-                
-                status_message += f"\n📊 Duration: {format_time(duration)} | Processed: {format_time(processed)} | Remaining: ~{format_time(estimated_remaining)}"
-            else:
-                status_message += f"\n📊 Total duration: {format_time(duration)} | Analyzing..."
-        
-        return jsonify({
-            'job_id': job_id,
-            'status': progress['status'],
-            'progress_percentage': progress['progress'],
-            'status_message': status_message,
-            'result_text': progress['result']['text'] if progress.get('result') else None,
-            'result_files': [],
-            'error_message': None,
-            'processing_time': int(elapsed_time * 1000)
-        })
+    progress = processing_progress.get(job_id)
+    if progress is not None:
+        payload = direct_job_payload(job_id, progress)
+        if not progress.get('result'):
+            return jsonify(payload)
+        payload['result_text'] = STREAMED_TEXT
+        return text_json_response(payload, [progress['result']['text']])
     
     # Fallback to database job (if available)
-    if not DB_AVAILABLE:
+    if not db_available():
         return jsonify({'error': 'Job not found'}), 404
     
     try:
@@ -857,33 +1469,119 @@ def api_job_status(job_id):
         except ValueError:
             return jsonify({'error': 'Job not found'}), 404
         
-        job = ProcessingJob.query.get_or_404(job_id_int)
-        
-        status_message = {
-            'pending': 'Waiting to start...',
-            'processing': 'Processing in progress...',
-            'completed': 'Processing completed!',
-            'failed': 'Processing failed'
-        }.get(job.status, 'Unknown status')
+        job = db.session.get(ProcessingJob, job_id_int)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
         
-        return jsonify({
-            'job_id': job.id,
-            'status': job.status,
-            'progress_percentage': job.progress_percentage,
-            'status_message': status_message,
-            'result_text': job.result_text,
-            'result_files': job.result_files,
-            'error_message': job.error_message,
-            'processing_time': job.processing_time
-        })
+        payload = database_job_payload(job)
+        if not job.result_text:
+            return jsonify(payload)
+        payload['result_text'] = STREAMED_TEXT
+        return text_json_response(payload, [job.result_text])
         
     except Exception as e:
         logger.error(f"Error getting job status: {str(e)}")
         return jsonify({'error': 'Failed to get job status'}), 500
 
+# Server-Sent Events alternative to polling /api/job-status: an event is pushed only
+# when the job's status or progress changes. Each open stream holds a gunicorn thread,
+# so streams are kept short (EventSource reconnects by itself after
+# JOB_STREAM_MAX_SECONDS) and at most JOB_STREAM_MAX_CONCURRENT are open at once;
+# beyond that the stream request gets a 503 and the page polls /api/job-status instead.
+JOB_STREAM_MAX_SECONDS = 30
+JOB_STREAM_HEARTBEAT_SECONDS = 15
+JOB_STREAM_DB_POLL_SECONDS = 1
+# Half the gthread pool by default, leaving the rest for uploads and status polls
+JOB_STREAM_MAX_CONCURRENT = int(os.environ.get(
+    'JOB_STREAM_MAX_CONCURRENT', str(max(1, int(os.environ.get('GUNICORN_THREADS', '8')) // 2))
+))
+job_stream_slots = threading.BoundedSemaphore(JOB_STREAM_MAX_CONCURRENT)
+
+def sse_event(payload):
+    """Encode a payload as one Server-Sent Events message"""
+    return f"data: {app.json.dumps(payload)}\n\n"
+
+def direct_job_events(job_id):
+    """Yield status events for a direct job as ProgressStore reports writes to it"""
+    deadline = time.time() + JOB_STREAM_MAX_SECONDS
+    version = 0
+    while time.time() < deadline:
+        progress, latest = processing_progress.wait_for_update(job_id, version, JOB_STREAM_HEARTBEAT_SECONDS)
+        if progress is None:
+            yield sse_event({'job_id': job_id, 'status': 'failed', 'error_message': 'Job not found'})
+            return
+        if latest == version:
+            # Comment line: keeps proxies from closing an idle stream
+            yield ": keepalive\n\n"
+            continue
+        version = latest
+        
+        payload = direct_job_payload(job_id, progress)
+        if progress['status'] in FINISHED_STATUSES:
+            if progress.get('result'):
+                payload['result_text'] = progress['result']['text']
+            yield sse_event(payload)
+            return
+        yield sse_event(payload)
+
+def database_job_events(job_id):
+    """Yield status events for a database job, checking its row and in-memory progress each second"""
+    deadline = time.time() + JOB_STREAM_MAX_SECONDS
+    last_sent = None
+    idle_since = time.time()
+    while time.time() < deadline:
+        job = db.session.get(ProcessingJob, job_id)
+        payload = database_job_payload(job) if job else None
+        # Give the connection back between checks instead of idling in a transaction;
+        # this also empties the identity map so the next get() reloads the row
+        db.session.close()
+        if payload is None:
+            yield sse_event({'job_id': job_id, 'status': 'failed', 'error_message': 'Job not found'})
+            return
+        
+        if payload['status'] in FINISHED_STATUSES:
+            yield sse_event(payload)
+            return
+        state = (payload['status'], payload['progress_percentage'])
+        if state != last_sent:
+            last_sent = state
+            idle_since = time.time()
+            yield sse_event(payload)
+        elif time.time() - idle_since >= JOB_STREAM_HEARTBEAT_SECONDS:
+            idle_since = time.time()
+            yield ": keepalive\n\n"
+        time.sleep(JOB_STREAM_DB_POLL_SECONDS)
+
+@app.route('/api/job-stream/<job_id>', methods=['GET'])
+def api_job_stream(job_id):
+    """Stream the status of a processing job as Server-Sent Events"""
+    if processing_progress.get(job_id) is not None:
+        events = direct_job_events(job_id)
+    elif db_available() and job_id.isdigit():
+        events = database_job_events(int(job_id))
+    else:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if not job_stream_slots.acquire(blocking=False):
+        events.close()
+        return jsonify({'error': 'Too many open job streams, poll /api/job-status instead'}), 503
+    
+    response = app.response_class(stream_with_context(events), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Let nginx pass each event through instead of buffering the response
+    response.headers['X-Accel-Buffering'] = 'no'
+    # Runs when the stream ends or the client goes away
+    response.call_on_close(job_stream_slots.release)
+    return response
+
 @app.route('/api/process-text-with-ai', methods=['POST'])
 def api_process_text_with_ai():
-    """Process already-transcribed text with AI"""
+    """
+    Process already-transcribed text with AI
+    
+    Clients that send Accept: text/event-stream (or "stream": true) get the response
+    as Server-Sent Events while the model generates it; others get one JSON body.
+    """
     try:
         data = request.get_json()
         
@@ -901,50 +1599,28 @@ def api_process_text_with_ai():
         
         logger.info(f"Processing text with AI - Model: {model}, Prompt: {prompt[:50]}...")
         
-        # Process with LLM
-        from utils.llm_processor import process_text_with_llm
-        processed_text = process_text_with_llm(text, prompt, model)
+        # Process with LLM, unless this exact request was answered recently
+        cache_key = hashlib.blake2b(f"{model}\0{prompt}\0{text}".encode('utf-8'), digest_size=16).hexdigest()
+        processed_text = llm_response_memory.get(cache_key)
+        if processed_text is not None:
+            logger.info("Using cached AI response")
         
-        if not processed_text:
-            return jsonify({'error': 'AI processing failed to generate output'}), 500
+        if request.accept_mimetypes.best == 'text/event-stream' or data.get('stream'):
+            events = ai_response_events(text, prompt, model, save_to_openqm, export_markdown, cache_key, processed_text)
+            response = app.response_class(stream_with_context(events), mimetype='text/event-stream')
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Accel-Buffering'] = 'no'
+            return response
         
-        result_files = []
+        if processed_text is None:
+            llm_result = process_text_with_llm(text, 'custom', prompt, model)
+            # Failed calls are retried next time rather than replayed
+            if not llm_result.get('success'):
+                return jsonify({'error': llm_result.get('error', 'AI processing failed to generate output')}), 500
+            processed_text = llm_result['processed_text']
+            llm_response_memory.put(cache_key, processed_text)
         
-        # Save to OpenQM if requested
-        if save_to_openqm:
-            try:
-                from utils.openqm_client import save_to_openqm
-                record_id = save_to_openqm(
-                    original_text=text,
-                    llm_prompt=prompt,
-                    llm_response=processed_text,
-                    model_used=model
-                )
-                logger.info(f"Saved to OpenQM with record ID: {record_id}")
-            except Exception as e:
-                logger.error(f"Failed to save to OpenQM: {str(e)}")
-        
-        # Export as markdown if requested
-        if export_markdown:
-            try:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                markdown_filename = f'ai_processed_{timestamp}.md'
-                markdown_path = os.path.join(app.config['UPLOAD_FOLDER'], markdown_filename)
-                
-                with open(markdown_path, 'w', encoding='utf-8') as f:
-                    f.write(f"# AI Processed Text\n\n")
-                    f.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                    f.write(f"**Model:** {model}\n\n")
-                    f.write(f"**Prompt:** {prompt}\n\n")
-                    f.write(f"---\n\n")
-                    f.write(f"## Original Text\n\n{text}\n\n")
-                    f.write(f"---\n\n")
-                    f.write(f"## AI Response\n\n{processed_text}\n")
-                
-                result_files.append(markdown_filename)
-                logger.info(f"Exported markdown: {markdown_filename}")
-            except Exception as e:
-                logger.error(f"Failed to export markdown: {str(e)}")
+        result_files = finish_ai_processing(text, prompt, model, processed_text, save_to_openqm, export_markdown)
         
         return jsonify({
             'success': True,
@@ -956,272 +1632,529 @@ def api_process_text_with_ai():
         logger.error(f"Error in AI text processing: {str(e)}")
         return jsonify({'error': f"AI processing failed: {str(e)}"}), 500
 
+def ai_response_events(text, prompt, model, save_to_openqm, export_markdown, cache_key, cached_text):
+    """
+    Yield Server-Sent Events for an AI request: a 'token' event per generated piece,
+    then one final event with the full text and exported files
+    """
+    if cached_text is not None:
+        chunks = [cached_text]
+        yield sse_event({'token': cached_text})
+    else:
+        chunks = []
+        try:
+            for token in stream_text_with_llm(text, 'custom', prompt, model):
+                chunks.append(token)
+                yield sse_event({'token': token})
+        except Exception as e:
+            logger.error(f"Error streaming AI response: {str(e)}")
+            yield sse_event({'success': False, 'done': True, 'error': f"AI processing failed: {str(e)}"})
+            return
+    
+    processed_text = ''.join(chunks)
+    if cached_text is None and processed_text:
+        llm_response_memory.put(cache_key, processed_text)
+    
+    # Exports run after the text has reached the client, so they add no waiting time
+    result_files = finish_ai_processing(text, prompt, model, processed_text, save_to_openqm, export_markdown)
+    yield sse_event({'success': True, 'done': True, 'processed_text': processed_text, 'files': result_files})
+
+def finish_ai_processing(text, prompt, model, processed_text, save_to_openqm, export_markdown):
+    """
+    Run the optional OpenQM save and markdown export for an AI response
+    
+    Returns:
+        list: Names of files written to UPLOAD_FOLDER
+    """
+    result_files = []
+    
+    # Save to OpenQM if requested
+    if save_to_openqm:
+        try:
+            save_result = save_transcript_to_openqm(
+                {'text': text, 'source_type': 'text'},
+                {'prompt': prompt, 'processed_text': processed_text, 'model': model}
+            )
+            logger.info(f"OpenQM save result: {save_result.get('message', save_result.get('error'))}")
+        except Exception as e:
+            logger.error(f"Failed to save to OpenQM: {str(e)}")
+    
+    # Export as markdown if requested
+    if export_markdown:
+        try:
+            now = datetime.now()
+            markdown_filename = f'ai_processed_{now:%Y%m%d_%H%M%S}.md'
+            markdown_path = os.path.join(UPLOAD_FOLDER, markdown_filename)
+            
+            header = f"# AI Processed Text\n\n**Date:** {now:%Y-%m-%d %H:%M:%S}\n\n**Model:** {model}\n\n**Prompt:** {prompt}\n\n---\n\n"
+            write_transcription_file(
+                markdown_path, header,
+                "## Original Text\n\n", text, "\n\n---\n\n## AI Response\n\n", processed_text, "\n"
+            )
+            
+            result_files.append(markdown_filename)
+            logger.info(f"Exported markdown: {markdown_filename}")
+        except Exception as e:
+            logger.error(f"Failed to export markdown: {str(e)}")
+    
+    return result_files
+
+def accel_redirect_response(prefix, filename):
+    """
+    Hand a download to nginx with X-Accel-Redirect
+    
+    nginx reads the file from the internal location at prefix and sends it itself,
+    so the worker thread is free as soon as the headers are returned.
+    
+    Args:
+        prefix (str): nginx internal location aliased to the file's directory
+        filename (str): Name of the file inside that directory (already sanitised)
+    
+    Returns:
+        Response: Empty response carrying the redirect and download headers
+    """
+    response = app.response_class(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+    response.headers['X-Accel-Redirect'] = f"{prefix.rstrip('/')}/{filename}"
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 @app.route('/download/<path:filename>')
 def download_file(filename):
     """Download generated files"""
     try:
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        if os.path.exists(file_path):
-            return send_file(file_path, as_attachment=True)
-        else:
-            return jsonify({'error': 'File not found'}), 404
+        if UPLOADS_ACCEL_PREFIX:
+            # Generated files sit directly in UPLOAD_FOLDER, so a bare name is all nginx needs
+            return accel_redirect_response(UPLOADS_ACCEL_PREFIX, secure_filename(filename))
+        
+        # send_from_directory rejects paths outside UPLOAD_FOLDER and answers Range/If-Modified-Since
+        return send_from_directory(UPLOAD_FOLDER, filename, as_attachment=True, conditional=True)
+    except NotFound:
+        return jsonify({'error': 'File not found'}), 404
     except Exception as e:
         logger.error(f"Error downloading file: {str(e)}")
         return jsonify({'error': 'Download failed'}), 500
 
-def process_job_async(job_id, file_paths=None):
-    """Process a job asynchronously (simplified version)"""
-    import threading
-    thread = threading.Thread(target=process_job_worker, args=(job_id, file_paths))
-    thread.daemon = True
-    thread.start()
+def process_job_async(job_id, file_paths=None, job_type='transcription'):
+    """Queue a job on the executor for its job type"""
+    executor = job_executors.get(job_type, transcription_executor)
+    keys = [upload_key(path) for path in file_paths] if file_paths else None
+    if keys:
+        claim_uploads(keys)
+    executor.submit(process_job_worker, job_id, keys)
 
-def process_job_worker(job_id, file_paths=None):
-    """Background worker to process jobs"""
+def process_job_worker(job_id, upload_keys=None):
+    """Background worker to process jobs, one stage after another"""
+    file_paths = [upload_path(key) for key in upload_keys] if upload_keys else None
     try:
         with app.app_context():
-            job = ProcessingJob.query.get(job_id)
+            # Load the job once for its inputs and detach it: stages keep working on the
+            # in-memory copy and every write below is a targeted UPDATE
+            job = db.session.get(ProcessingJob, job_id)
             if not job:
                 return
+            db.session.expunge(job)
             
-            job.status = 'processing'
-            job.progress_percentage = 10
-            db.session.commit()
+            update_job_record(job_id, status='processing', progress_percentage=10)
             
             start_time = time.time()
             result_files = []
             
             if job.job_type == 'transcription':
                 if job.input_type == 'file' and file_paths:
-                    # Process uploaded files
-                    all_transcriptions = []
-                    
-                    for i, filepath in enumerate(file_paths):
-                        job.progress_percentage = 20 + (i * 40 // len(file_paths))
-                        db.session.commit()
-                        
-                        try:
-                            # Convert to appropriate format if needed
-                            if job.file_type in ['mp3', 'mp4', 'mov']:
-                                wav_path = filepath.replace(f'.{job.file_type}', '.wav')
-                                if job.file_type == 'mp3':
-                                    convert_mp3_to_wav(filepath, wav_path)
-                                else:
-                                    # Use moviepy for video files
-                                    from moviepy.editor import VideoFileClip
-                                    video = VideoFileClip(filepath)
-                                    video.audio.write_audiofile(wav_path)
-                                    video.close()
-                                os.remove(filepath)
-                                filepath = wav_path
-                            
-                            # Transcribe
-                            transcription_result = send_to_whisper(filepath)
-                            
-                            if isinstance(transcription_result, dict) and 'text' in transcription_result:
-                                all_transcriptions.append(transcription_result['text'])
-                            else:
-                                all_transcriptions.append(str(transcription_result))
-                            
-                            os.remove(filepath)
-                            
-                        except Exception as e:
-                            logger.error(f"Error processing file {filepath}: {str(e)}")
-                            all_transcriptions.append(f"Error processing file: {str(e)}")
-                    
-                    job.result_text = '\n\n'.join(all_transcriptions)
-                    
+                    job.result_text = transcribe_files_stage(job, file_paths)
                 elif job.input_type == 'youtube':
-                    # Process YouTube content with transcript options
-                    job.progress_percentage = 30
-                    db.session.commit()
-                    
-                    # Get YouTube options from job metadata
-                    youtube_options = job.job_metadata.get('youtubeOptions', {}) if job.job_metadata else {}
-                    pull_transcript = youtube_options.get('pullTranscript', True)
-                    transcribe_audio = youtube_options.get('transcribeAudio', False)
-                    
-                    all_transcriptions = []
-                    transcript_sources = []
-                    
-                    # Try to pull existing transcript first if requested
-                    if pull_transcript:
-                        job.progress_percentage = 35
-                        db.session.commit()
-                        
-                        transcript_result = get_youtube_transcript(job.source_url)
-                        if transcript_result['success']:
-                            all_transcriptions.append(transcript_result['text'])
-                            transcript_sources.append(f"YouTube Transcript ({transcript_result['language']})")
-                            logger.info(f"Successfully extracted YouTube transcript")
-                        else:
-                            logger.info(f"No transcript available: {transcript_result['error']}")
-                            # If transcript not available and user didn't want audio transcription, enable it
-                            if not transcribe_audio:
-                                transcribe_audio = True
-                                logger.info("Automatically enabling audio transcription as fallback")
-                    
-                    # Transcribe from audio if requested or as fallback
-                    if transcribe_audio or not all_transcriptions:
-                        job.progress_percentage = 50
-                        db.session.commit()
-                        
-                        audio_files = download_youtube_audio(job.source_url)
-                        
-                        for i, audio_file in enumerate(audio_files):
-                            job.progress_percentage = 55 + (i * 25 // len(audio_files))
-                            db.session.commit()
-                            
-                            try:
-                                transcription_result = send_to_whisper(audio_file)
-                                if isinstance(transcription_result, dict) and 'text' in transcription_result:
-                                    all_transcriptions.append(transcription_result['text'])
-                                    transcript_sources.append("Audio Transcription")
-                                else:
-                                    all_transcriptions.append(str(transcription_result))
-                                    transcript_sources.append("Audio Transcription (Error)")
-                                os.remove(audio_file)
-                            except Exception as e:
-                                logger.error(f"Error transcribing {audio_file}: {str(e)}")
-                                all_transcriptions.append(f"Error transcribing: {str(e)}")
-                                transcript_sources.append("Audio Transcription (Error)")
-                    
-                    # Combine results with source information
-                    if len(all_transcriptions) > 1:
-                        formatted_results = []
-                        for i, (text, source) in enumerate(zip(all_transcriptions, transcript_sources)):
-                            formatted_results.append(f"=== {source} ===\n{text}")
-                        job.result_text = '\n\n'.join(formatted_results)
-                    else:
-                        job.result_text = all_transcriptions[0] if all_transcriptions else "No transcript available"
+                    job.result_text = youtube_stage(job)
             
             elif job.job_type == 'tts':
-                # Text to speech
-                job.progress_percentage = 40
-                db.session.commit()
-                
-                audio_file = convert_text_to_speech(job.input_text, job.voice_id)
+                set_job_progress(job, 40)
+                audio_file = convert_text_to_speech(job.input_text, job.voice_id, UPLOAD_FOLDER)
                 result_files.append(os.path.basename(audio_file))
                 job.result_text = f"Speech generated from {len(job.input_text)} characters of text"
             
             elif job.job_type == 'document_processing':
-                # Document processing
                 if file_paths:
-                    all_text = []
-                    for filepath in file_paths:
-                        try:
-                            text = process_document(filepath, job.file_type)
-                            all_text.append(text)
-                            os.remove(filepath)
-                        except Exception as e:
-                            logger.error(f"Error processing document {filepath}: {str(e)}")
-                            all_text.append(f"Error processing document: {str(e)}")
-                    
-                    job.result_text = '\n\n'.join(all_text)
+                    job.result_text = documents_stage(job, file_paths)
             
-            # LLM Processing (if enabled)
-            llm_config = job.job_metadata.get('llm', {}) if job.job_metadata else {}
-            llm_result_text = None
+            llm_stage(job, result_files)
+            render_outputs_stage(job, result_files, start_time)
             
-            if llm_config.get('enabled') and job.result_text:
-                job.progress_percentage = 75
-                db.session.commit()
+            # Update job completion
+            update_job_record(
+                job_id,
+                status='completed',
+                progress_percentage=100,
+                result_text=job.result_text,
+                result_files=result_files,
+                processing_time=int((time.time() - start_time) * 1000)
+            )
+    
+    except Exception as e:
+        logger.error(f"Error in job worker: {str(e)}")
+        failure = {'status': 'failed', 'error_message': str(e)}
+        if job_id in job_progress:
+            failure['progress_percentage'] = job_progress[job_id]
+        try:
+            with app.app_context():
+                update_job_record(job_id, **failure)
+        except Exception as db_error:
+            logger.error(f"Could not mark job {job_id} as failed: {str(db_error)}")
+    
+    finally:
+        job_progress.pop(job_id, None)
+        if upload_keys:
+            release_uploads(upload_keys)
+
+def update_job_record(job_id, **values):
+    """Write ProcessingJob columns with one UPDATE statement"""
+    try:
+        db.session.execute(update(ProcessingJob).where(ProcessingJob.id == job_id).values(**values))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+def set_job_progress(job, percentage):
+    """Record job progress in memory; every stage reports through here"""
+    job_progress[job.id] = percentage
+
+# Running jobs' progress is copied to the database every few seconds, so anything
+# reading processing_job directly still sees it move without a commit per update
+JOB_PROGRESS_FLUSH_INTERVAL_SECONDS = 5
+flushed_job_progress = {}
+
+def flush_job_progress():
+    """Write progress that changed since the last flush with one batched UPDATE"""
+    changed = [
+        {'job_id': job_id, 'percentage': percentage}
+        for job_id, percentage in list(job_progress.items())
+        if flushed_job_progress.get(job_id) != percentage
+    ]
+    for job_id in list(flushed_job_progress):
+        if job_id not in job_progress:
+            del flushed_job_progress[job_id]
+    if not changed:
+        return
+    
+    # Only touch jobs still processing so a late flush can't overwrite the final 100%
+    jobs = ProcessingJob.__table__
+    statement = (
+        update(jobs)
+        .where(jobs.c.id == bindparam('job_id'), jobs.c.status == 'processing')
+        .values(progress_percentage=bindparam('percentage'))
+    )
+    with app.app_context():
+        try:
+            db.session.execute(statement, changed)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    for row in changed:
+        flushed_job_progress[row['job_id']] = row['percentage']
+
+def job_progress_flush_loop():
+    while True:
+        time.sleep(JOB_PROGRESS_FLUSH_INTERVAL_SECONDS)
+        if not job_progress or not db_available():
+            continue
+        try:
+            flush_job_progress()
+        except Exception as e:
+            logger.warning(f"Job progress flush failed: {str(e)}")
+
+threading.Thread(target=job_progress_flush_loop, name='job-progress-flush', daemon=True).start()
+
+# Videos up to this long are decoded straight into memory when Whisper runs in-process
+# (16kHz float32 is about 230 MB an hour); longer ones still go through a WAV file
+IN_MEMORY_DECODE_MAX_SECONDS = 3600
+# Decoded videos held at once, being transcribed or waiting for a Whisper thread;
+# when every slot is taken further videos are extracted to WAV on disk instead
+in_memory_decodes = threading.BoundedSemaphore(int(os.environ.get('WHISPER_CONCURRENCY', '2')) + 1)
+
+def convert_for_whisper(filepath):
+    """
+    CPU stage: turn an uploaded file into audio Whisper can read
+    
+    Args:
+        filepath (str): Path to the uploaded file
+    
+    Returns:
+        str or numpy.ndarray: Path to the file to transcribe (the input itself if no
+        conversion was needed), or the decoded samples of a video
+    """
+    base, extension = os.path.splitext(filepath)
+    extension = extension[1:].lower()
+    if extension not in ('mp4', 'mov'):
+        # Audio (MP3 included) is decoded by faster-whisper in memory
+        return filepath
+    
+    if transcribes_in_process():
+        duration = get_audio_duration(filepath)
+        if duration and duration <= IN_MEMORY_DECODE_MAX_SECONDS and in_memory_decodes.acquire(blocking=False):
+            # ffmpeg pipes the audio track straight into an array for the model;
+            # transcribe_and_remove gives the slot back
+            try:
+                samples = decode_to_array(filepath)
+            except Exception:
+                in_memory_decodes.release()
+                raise
+            remove_later(filepath)
+            return samples
+    
+    wav_path = f"{base}.wav"
+    # One ffmpeg run pulls the audio track out of the video
+    extract_audio(filepath, wav_path)
+    remove_later(filepath)
+    return wav_path
+
+def transcribe_files_stage(job, file_paths):
+    """
+    Transcribe uploaded files, several at a time, as soon as each one is converted
+    
+    Args:
+        job (ProcessingJob): Job being processed
+        file_paths (list): Paths of the uploaded files
+    
+    Returns:
+        str: Transcriptions of all files in upload order, separated by blank lines
+    """
+    # Conversions run on the CPU pool and each file moves on to the Whisper pool
+    # when its conversion finishes; this thread only collects results. Longest
+    # files are queued first so a big file doesn't start last and run alone.
+    by_size = sorted(file_paths, key=lambda path: os.path.getsize(path) if os.path.exists(path) else 0, reverse=True)
+    queued = {
+        filepath: transcribe_when_converted(conversion_executor.submit(convert_for_whisper, filepath))
+        for filepath in by_size
+    }
+    transcriptions = [queued[filepath] for filepath in file_paths]
+    pending = {future: filepath for filepath, future in queued.items()}
+    
+    for done_count, future in enumerate(as_completed(pending), start=1):
+        set_job_progress(job, 20 + (done_count * 40 // len(file_paths)))
+        if future.exception():
+            logger.error(f"Error processing file {pending[future]}: {str(future.exception())}")
+    
+    all_transcriptions = []
+    for future in transcriptions:
+        if future.exception():
+            all_transcriptions.append(f"Error processing file: {str(future.exception())}")
+        else:
+            all_transcriptions.append(future.result())
+    
+    return '\n\n'.join(all_transcriptions)
+
+def transcribe_when_converted(conversion, progress_callback=None):
+    """Chain a Whisper call onto a conversion future without tying up a thread while it waits"""
+    transcription = Future()
+    
+    def on_converted(done):
+        try:
+            audio = done.result()
+        except Exception as e:
+            transcription.set_exception(e)
+            return
+        whisper_executor.submit(transcribe_and_remove, audio, progress_callback).add_done_callback(on_transcribed)
+    
+    def on_transcribed(done):
+        if done.exception():
+            transcription.set_exception(done.exception())
+        else:
+            transcription.set_result(done.result())
+    
+    conversion.add_done_callback(on_converted)
+    return transcription
+
+def transcribe_and_remove(audio, progress_callback=None):
+    """Whisper stage: transcribe converted audio, deleting it if it is a file"""
+    if not isinstance(audio, str):
+        try:
+            return transcribe_samples(audio, progress_callback=progress_callback)['text']
+        finally:
+            in_memory_decodes.release()
+    text = send_to_whisper(audio, progress_callback=progress_callback)['text']
+    remove_later(audio)
+    return text
+
+def youtube_stage(job):
+    """
+    Pull the YouTube transcript and/or transcribe the downloaded audio
+    
+    Args:
+        job (ProcessingJob): Job whose source_url is a YouTube link
+    
+    Returns:
+        str: Transcript text, labelled by source when there is more than one
+    """
+    set_job_progress(job, 30)
+    
+    # Get YouTube options from job metadata
+    youtube_options = job.job_metadata.get('youtubeOptions', {}) if job.job_metadata else {}
+    pull_transcript = youtube_options.get('pullTranscript', True)
+    transcribe_audio = youtube_options.get('transcribeAudio', False)
+    # With both options ticked, a published transcript is used on its own unless
+    # the client sends preferTranscript: false to get the Whisper transcription too
+    prefer_transcript = youtube_options.get('preferTranscript', True)
+    
+    all_transcriptions = []
+    transcript_sources = []
+    
+    # Try to pull existing transcript first if requested
+    if pull_transcript:
+        set_job_progress(job, 35)
+        
+        transcript_result = fetch_youtube_transcript(job.source_url)
+        if transcript_result['success']:
+            all_transcriptions.append(transcript_result['text'])
+            transcript_sources.append(f"YouTube Transcript ({transcript_result['language']})")
+            logger.info(f"Successfully extracted YouTube transcript")
+        else:
+            logger.info(f"No transcript available: {transcript_result['error']}")
+            # If transcript not available and user didn't want audio transcription, enable it
+            if not transcribe_audio:
+                transcribe_audio = True
+                logger.info("Automatically enabling audio transcription as fallback")
+    
+    if transcribe_audio and prefer_transcript and all_transcriptions:
+        logger.info("YouTube transcript found, skipping audio transcription (preferTranscript)")
+        return f"=== {transcript_sources[0]}; audio transcription skipped ===\n{all_transcriptions[0]}"
+    
+    # Transcribe from audio if requested or as fallback
+    if transcribe_audio or not all_transcriptions:
+        set_job_progress(job, 50)
+        
+        audio_files = download_youtube_audio(job.source_url)
+        
+        # Playlist entries are independent, so transcribe them side by side on the Whisper pool
+        transcriptions = [whisper_executor.submit(transcribe_youtube_audio, audio_file) for audio_file in audio_files]
+        for done_count, _ in enumerate(as_completed(transcriptions), start=1):
+            set_job_progress(job, 55 + (done_count * 25 // len(audio_files)))
+        
+        for transcription in transcriptions:
+            text, source = transcription.result()
+            all_transcriptions.append(text)
+            transcript_sources.append(source)
+    
+    # Combine results with source information
+    if len(all_transcriptions) > 1:
+        formatted_results = []
+        for text, source in zip(all_transcriptions, transcript_sources):
+            formatted_results.append(f"=== {source} ===\n{text}")
+        return '\n\n'.join(formatted_results)
+    return all_transcriptions[0] if all_transcriptions else "No transcript available"
+
+def transcribe_youtube_audio(audio_file):
+    """Transcribe one downloaded YouTube audio file, returning (text, source label) even on failure"""
+    try:
+        transcription_text = send_to_whisper(audio_file)['text']
+        remove_later(audio_file)
+        return transcription_text, "Audio Transcription"
+    except Exception as e:
+        logger.error(f"Error transcribing {audio_file}: {str(e)}")
+        return f"Error transcribing: {str(e)}", "Audio Transcription (Error)"
+
+def documents_stage(job, file_paths):
+    """Extract text from each uploaded document"""
+    all_text = []
+    for filepath in file_paths:
+        try:
+            text = process_document(filepath, job.file_type)
+            all_text.append(text)
+            remove_later(filepath)
+        except Exception as e:
+            logger.error(f"Error processing document {filepath}: {str(e)}")
+            all_text.append(f"Error processing document: {str(e)}")
+    
+    return '\n\n'.join(all_text)
+
+def llm_stage(job, result_files):
+    """Run the optional LLM pass and its OpenQM/Markdown exports"""
+    # LLM Processing (if enabled)
+    llm_config = job.job_metadata.get('llm', {}) if job.job_metadata else {}
+    llm_result_text = None
+    
+    if llm_config.get('enabled') and job.result_text:
+        set_job_progress(job, 75)
+        
+        try:
+            user_prompt = llm_config.get('prompt', 'Summarize this text in 3-5 key points')
+            logger.info(f"Starting LLM processing with prompt: {user_prompt[:100]}...")
+            
+            llm_result = process_text_with_llm(
+                text=job.result_text,
+                processing_type='custom',
+                custom_prompt=user_prompt,
+                model=llm_config.get('model')
+            )
+            
+            if llm_result.get('success'):
+                llm_result_text = llm_result.get('processed_text')
+                logger.info("LLM processing completed successfully")
                 
-                try:
-                    user_prompt = llm_config.get('prompt', 'Summarize this text in 3-5 key points')
-                    logger.info(f"Starting LLM processing with prompt: {user_prompt[:100]}...")
+                # Save to OpenQM if requested
+                if llm_config.get('saveToOpenQM'):
+                    transcript_data = {
+                        'text': job.result_text,
+                        'source_type': job.input_type,
+                        'source_url': job.source_url,
+                        'language': job.target_language,
+                        'file_name': job.original_filename
+                    }
+                    # Add the user's prompt to the LLM result data
+                    llm_result_with_prompt = llm_result.copy()
+                    llm_result_with_prompt['prompt'] = user_prompt
+                    
+                    save_result = save_transcript_to_openqm(transcript_data, llm_result_with_prompt)
+                    logger.info(f"OpenQM save result: {save_result.get('message', save_result.get('error'))}")
+                
+                # Export to Markdown if requested
+                if llm_config.get('exportMarkdown'):
+                    markdown_filename = f"transcript_{token_hex(4)}.md"
+                    markdown_path = os.path.join(UPLOAD_FOLDER, markdown_filename)
                     
-                    llm_result = process_text_with_llm(
-                        text=job.result_text,
-                        processing_type='custom',
-                        custom_prompt=user_prompt,
-                        model=llm_config.get('model')
+                    # The transcript and analysis are written as they are rather than
+                    # concatenated into one more full-size string first
+                    header = f"# {job.original_filename or 'Transcript'}\n\n**AI Task:** {user_prompt}\n\n"
+                    write_transcription_file(
+                        markdown_path, header,
+                        "## Original Transcript\n\n", job.result_text or '', "\n\n## AI Analysis\n\n", llm_result_text or '', "\n"
                     )
                     
-                    if llm_result.get('success'):
-                        llm_result_text = llm_result.get('processed_text')
-                        logger.info("LLM processing completed successfully")
-                        
-                        # Save to OpenQM if requested
-                        if llm_config.get('saveToOpenQM'):
-                            transcript_data = {
-                                'text': job.result_text,
-                                'source_type': job.input_type,
-                                'source_url': job.source_url,
-                                'language': job.target_language,
-                                'file_name': job.original_filename
-                            }
-                            # Add the user's prompt to the LLM result data
-                            llm_result_with_prompt = llm_result.copy()
-                            llm_result_with_prompt['prompt'] = user_prompt
-                            
-                            save_result = save_transcript_to_openqm(transcript_data, llm_result_with_prompt)
-                            logger.info(f"OpenQM save result: {save_result.get('message', save_result.get('error'))}")
-                        
-                        # Export to Markdown if requested
-                        if llm_config.get('exportMarkdown'):
-                            markdown_content = f"# {job.original_filename or 'Transcript'}\n\n"
-                            markdown_content += f"**AI Task:** {user_prompt}\n\n"
-                            markdown_content += f"## Original Transcript\n\n{job.result_text}\n\n"
-                            markdown_content += f"## AI Analysis\n\n{llm_result_text}\n"
-                            
-                            markdown_filename = f"transcript_{uuid.uuid4().hex[:8]}.md"
-                            markdown_path = os.path.join(app.config['UPLOAD_FOLDER'], markdown_filename)
-                            
-                            with open(markdown_path, 'w') as f:
-                                f.write(markdown_content)
-                            
-                            result_files.append(markdown_filename)
-                            logger.info(f"Markdown exported to {markdown_filename}")
-                        
-                        # Append LLM result to job result text for display
-                        job.result_text = f"{job.result_text}\n\n--- AI Analysis ---\n\n{llm_result_text}"
-                    else:
-                        logger.error(f"LLM processing failed: {llm_result.get('error')}")
-                        
-                except Exception as e:
-                    logger.error(f"Error in LLM processing: {str(e)}")
-            
-            # Generate output files in requested formats
-            job.progress_percentage = 80
-            db.session.commit()
-            
-            if job.result_text and job.output_formats:
-                metadata = {
-                    'filename': job.original_filename,
-                    'processing_time': int((time.time() - start_time) * 1000),
-                    'language': job.target_language,
-                    'created_at': job.created_at
-                }
+                    result_files.append(markdown_filename)
+                    logger.info(f"Markdown exported to {markdown_filename}")
                 
-                for format_type in job.output_formats:
-                    try:
-                        if format_type != 'mp3':  # Skip for TTS jobs
-                            output_file = generate_output_file(
-                                job.result_text, 
-                                format_type, 
-                                metadata,
-                                app.config['UPLOAD_FOLDER']
-                            )
-                            result_files.append(os.path.basename(output_file))
-                    except Exception as e:
-                        logger.error(f"Error generating {format_type} output: {str(e)}")
-            
-            # Update job completion
-            job.status = 'completed'
-            job.progress_percentage = 100
-            job.processing_time = int((time.time() - start_time) * 1000)
-            job.result_files = result_files
-            db.session.commit()
-            
-    except Exception as e:
-        logger.error(f"Error in job worker: {str(e)}")
-        with app.app_context():
-            job = ProcessingJob.query.get(job_id)
-            if job:
-                job.status = 'failed'
-                job.error_message = str(e)
-                db.session.commit()
+                # Append LLM result to job result text for display
+                job.result_text = f"{job.result_text}\n\n--- AI Analysis ---\n\n{llm_result_text}"
+            else:
+                logger.error(f"LLM processing failed: {llm_result.get('error')}")
+        
+        except Exception as e:
+            logger.error(f"Error in LLM processing: {str(e)}")
+
+def render_outputs_stage(job, result_files, start_time):
+    """Write the result text out in each requested format"""
+    # Generate output files in requested formats
+    set_job_progress(job, 80)
+    
+    if job.result_text and job.output_formats:
+        metadata = {
+            'filename': job.original_filename,
+            'processing_time': int((time.time() - start_time) * 1000),
+            'language': job.target_language,
+            'created_at': job.created_at
+        }
+        
+        for format_type in job.output_formats:
+            try:
+                if format_type != 'mp3':  # Skip for TTS jobs
+                    output_file = generate_output_file(
+                        job.result_text, 
+                        format_type, 
+                        metadata,
+                        UPLOAD_FOLDER
+                    )
+                    result_files.append(os.path.basename(output_file))
+            except Exception as e:
+                logger.error(f"Error generating {format_type} output: {str(e)}")
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -1231,18 +2164,21 @@ def health_check():
 def recent_transcriptions():
     """List recent transcription files"""
     try:
-        import glob
-        from datetime import datetime
-        
-        files = glob.glob(os.path.join(TRANSCRIPTIONS_FOLDER, '*.txt'))
-        files.sort(key=os.path.getmtime, reverse=True)
+        # One stat per file, and only the 10 newest are ever ordered
+        files = []
+        with os.scandir(TRANSCRIPTIONS_FOLDER) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.txt'):
+                    continue
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, entry.name, stat.st_size))
+                except FileNotFoundError:
+                    pass
         
         results = []
-        for filepath in files[:10]:  # Last 10 files
-            filename = os.path.basename(filepath)
-            mtime = os.path.getmtime(filepath)
-            size = os.path.getsize(filepath)
-            
+        for mtime, filename, size in heapq.nlargest(10, files):
             results.append({
                 'filename': filename,
                 'modified': datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S'),
@@ -1258,15 +2194,18 @@ def recent_transcriptions():
 @app.route('/api/download-transcription/<filename>', methods=['GET'])
 def download_transcription(filename):
     """Download a transcription file"""
+    filename = secure_filename(filename)
     try:
-        filepath = os.path.join(TRANSCRIPTIONS_FOLDER, secure_filename(filename))
-        if os.path.exists(filepath):
-            return send_file(filepath, as_attachment=True, download_name=filename)
-        else:
-            return jsonify({'error': 'File not found'}), 404
+        if TRANSCRIPTIONS_ACCEL_PREFIX:
+            return accel_redirect_response(TRANSCRIPTIONS_ACCEL_PREFIX, filename)
+        
+        # Served through wsgi.file_wrapper, which gunicorn sends with sendfile(2)
+        return send_from_directory(TRANSCRIPTIONS_FOLDER, filename, as_attachment=True, conditional=True)
+    except NotFound:
+        return jsonify({'error': 'File not found'}), 404
     except Exception as e:
         logger.error(f"Error downloading transcription: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=5000, debug=os.environ.get('FLASK_DEV') == '1', threaded=True)
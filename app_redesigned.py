@@ -3,10 +3,11 @@ import logging
 import tempfile
 import uuid
 import time
-from flask import Flask, render_template, request, jsonify, session, send_file
+from flask import Flask, render_template, request, jsonify, session, send_from_directory
+from werkzeug.exceptions import NotFound
 from werkzeug.utils import secure_filename
 from werkzeug.middleware.proxy_fix import ProxyFix
-from utils.audio_converter import convert_mp3_to_wav
+from utils.audio_converter import convert_mp3_to_wav, extract_audio
 from utils.whisper_client import send_to_whisper
 from utils.youtube_processor import is_youtube_url, download_youtube_audio, get_youtube_info, get_youtube_transcript
 from utils.document_processor import process_document, get_document_info
@@ -161,23 +162,12 @@ def upload_file():
             
             # Send the file to the whisper service
             logger.debug(f"Sending {filepath} to Whisper service")
-            transcription_result = send_to_whisper(filepath)
+            transcription_text = send_to_whisper(filepath)['text']
             
             # Calculate processing time
             processing_time = int((time.time() - start_time) * 1000)  # Convert to milliseconds
             
             # Update the transcription record
-            transcription_text = ""
-            if isinstance(transcription_result, dict):
-                if "text" in transcription_result:
-                    transcription_text = transcription_result["text"]
-                elif "transcription" in transcription_result:
-                    transcription_text = transcription_result["transcription"]
-                else:
-                    transcription_text = str(transcription_result)
-            else:
-                transcription_text = str(transcription_result)
-                
             transcription.transcription_text = transcription_text
             transcription.processing_time = processing_time
             transcription.status = 'completed'
@@ -374,7 +364,9 @@ def api_process():
 def api_job_status(job_id):
     """Get the status of a processing job"""
     try:
-        job = ProcessingJob.query.get_or_404(job_id)
+        job = db.session.get(ProcessingJob, job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
         
         status_message = {
             'pending': 'Waiting to start...',
@@ -477,11 +469,10 @@ def api_process_text_with_ai():
 def download_file(filename):
     """Download generated files"""
     try:
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        if os.path.exists(file_path):
-            return send_file(file_path, as_attachment=True)
-        else:
-            return jsonify({'error': 'File not found'}), 404
+        # send_from_directory rejects paths outside UPLOAD_FOLDER and raises NotFound itself
+        return send_from_directory(app.config['UPLOAD_FOLDER'], filename, as_attachment=True)
+    except NotFound:
+        return jsonify({'error': 'File not found'}), 404
     except Exception as e:
         logger.error(f"Error downloading file: {str(e)}")
         return jsonify({'error': 'Download failed'}), 500
@@ -497,7 +488,7 @@ def process_job_worker(job_id, file_paths=None):
     """Background worker to process jobs"""
     try:
         with app.app_context():
-            job = ProcessingJob.query.get(job_id)
+            job = db.session.get(ProcessingJob, job_id)
             if not job:
                 return
             
@@ -521,24 +512,13 @@ def process_job_worker(job_id, file_paths=None):
                             # Convert to appropriate format if needed
                             if job.file_type in ['mp3', 'mp4', 'mov']:
                                 wav_path = filepath.replace(f'.{job.file_type}', '.wav')
-                                if job.file_type == 'mp3':
-                                    convert_mp3_to_wav(filepath, wav_path)
-                                else:
-                                    # Use moviepy for video files
-                                    from moviepy.editor import VideoFileClip
-                                    video = VideoFileClip(filepath)
-                                    video.audio.write_audiofile(wav_path)
-                                    video.close()
+                                # One ffmpeg run decodes straight to 16kHz mono PCM
+                                extract_audio(filepath, wav_path)
                                 os.remove(filepath)
                                 filepath = wav_path
                             
                             # Transcribe
-                            transcription_result = send_to_whisper(filepath)
-                            
-                            if isinstance(transcription_result, dict) and 'text' in transcription_result:
-                                all_transcriptions.append(transcription_result['text'])
-                            else:
-                                all_transcriptions.append(str(transcription_result))
+                            all_transcriptions.append(send_to_whisper(filepath)['text'])
                             
                             os.remove(filepath)
                             
@@ -590,13 +570,8 @@ def process_job_worker(job_id, file_paths=None):
                             db.session.commit()
                             
                             try:
-                                transcription_result = send_to_whisper(audio_file)
-                                if isinstance(transcription_result, dict) and 'text' in transcription_result:
-                                    all_transcriptions.append(transcription_result['text'])
-                                    transcript_sources.append("Audio Transcription")
-                                else:
-                                    all_transcriptions.append(str(transcription_result))
-                                    transcript_sources.append("Audio Transcription (Error)")
+                                all_transcriptions.append(send_to_whisper(audio_file)['text'])
+                                transcript_sources.append("Audio Transcription")
                                 os.remove(audio_file)
                             except Exception as e:
                                 logger.error(f"Error transcribing {audio_file}: {str(e)}")
@@ -734,7 +709,7 @@ def process_job_worker(job_id, file_paths=None):
     except Exception as e:
         logger.error(f"Error in job worker: {str(e)}")
         with app.app_context():
-            job = ProcessingJob.query.get(job_id)
+            job = db.session.get(ProcessingJob, job_id)
             if job:
                 job.status = 'failed'
                 job.error_message = str(e)
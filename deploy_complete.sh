@@ -65,7 +65,7 @@ Group=www-data
 WorkingDirectory=$APP_DIR
 Environment=PATH=/usr/local/bin:/usr/bin:/bin
 EnvironmentFile=$APP_DIR/.env
-ExecStart=/usr/local/bin/gunicorn --bind 0.0.0.0:5000 --workers 4 --timeout 300 --keep-alive 2 --max-requests 1000 --preload main:app
+ExecStart=/usr/local/bin/gunicorn --bind 0.0.0.0:5000 --workers 1 --worker-class gthread --threads 8 --timeout 300 --keep-alive 2 --preload main:app
 Restart=always
 RestartSec=3
 
@@ -1,20 +1,31 @@
 # Gunicorn configuration file for Speech Processing App
 
 import os
-import multiprocessing
 
 # Server socket
 bind = "0.0.0.0:5000"
 backlog = 2048
 
 # Worker processes
-workers = min(multiprocessing.cpu_count() * 2 + 1, 8)  # Cap at 8 workers
-worker_class = "sync"
+# Job progress for direct uploads lives in an in-process dict, so status polls
+# must reach the process that accepted the upload: scale with threads, and only
+# raise GUNICORN_WORKERS behind sticky sessions.
+workers = int(os.environ.get("GUNICORN_WORKERS", "1"))
+# gthread by default. For many slow concurrent uploads/downloads set
+# GUNICORN_WORKER_CLASS=gevent together with USE_GEVENT=1 (app.py monkey-patches
+# before the preloaded import); worker_connections then caps greenlets per worker.
+# Stay on gthread when Whisper runs in-process: CPU-bound inference would stall
+# the gevent hub and every request with it.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
 worker_connections = 1000
-timeout = 300
+timeout = 300  # Transcription requests can be slow
 keepalive = 2
-max_requests = 1000
-max_requests_jitter = 100
+# Worker recycling is off: restarting the single worker would kill the jobs running on
+# its executor threads, drop in-memory progress and reload the whisper model. Set
+# GUNICORN_MAX_REQUESTS only if a leak is confirmed (e.g. with tracemalloc).
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
 
 # Application
 preload_app = True
@@ -31,6 +42,7 @@ proc_name = "speech-app"
 
 # Server mechanics
 daemon = False
+sendfile = True  # File responses (send_file/send_from_directory) go out via sendfile(2)
 pidfile = "/var/run/speech-app.pid"
 user = "www-data"
 group = "www-data"
@@ -2,26 +2,29 @@
 # This version is optimized for local Ubuntu server deployment where faster-whisper is installed locally
 
 import os
-import subprocess
-import tempfile
-import uuid
+import threading
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Local faster-whisper configuration
-LOCAL_WHISPER_SCRIPT = "/mnt/bigdisk/projects/faster-whisper-gpu/smart_transcribe.py"
-LOCAL_WHISPER_FALLBACK = True  # Use local faster-whisper if script not available
+# Local faster-whisper configuration; transcription runs in this process on one shared model.
+# WHISPER_MODEL_SIZE is a size name or a path to a CTranslate2 model directory.
+WHISPER_MODEL_SIZE = os.environ.get('WHISPER_MODEL_SIZE', 'base')
+# INT8 weights by default; set e.g. float16 where full-precision accuracy is needed
+WHISPER_COMPUTE_TYPE = os.environ.get('WHISPER_COMPUTE_TYPE')
+# Concurrent transcribe() calls the loaded model serves in parallel
+LOCAL_WHISPER_WORKERS = int(os.environ.get('WHISPER_CONCURRENCY', '2'))
 
 class LocalWhisperClient:
     """Whisper client optimized for local Ubuntu server deployment"""
     
     def __init__(self):
-        self.script_path = LOCAL_WHISPER_SCRIPT
-        self.use_local_fallback = LOCAL_WHISPER_FALLBACK
+        self.model_size = WHISPER_MODEL_SIZE
+        self._model = None
+        self._model_lock = threading.Lock()
         
     def transcribe_audio(self, audio_file_path: str, language: str = 'en') -> Dict[str, Any]:
         """
@@ -35,14 +38,7 @@ class LocalWhisperClient:
             Dictionary containing transcription results
         """
         try:
-            # Try using the custom script first
-            if os.path.exists(self.script_path):
-                return self._process_with_script(audio_file_path, language)
-            elif self.use_local_fallback:
-                return self._process_with_local_whisper(audio_file_path, language)
-            else:
-                raise Exception("No faster-whisper processing method available")
-                
+            return self._process_with_local_whisper(audio_file_path, language)
         except Exception as e:
             logger.error(f"Transcription failed: {str(e)}")
             return {
@@ -52,107 +48,64 @@ class LocalWhisperClient:
                 'segments': []
             }
     
-    def _process_with_script(self, audio_file_path: str, language: str) -> Dict[str, Any]:
-        """Process audio using the custom faster-whisper script"""
-        try:
-            logger.info(f"Processing audio with custom script: {self.script_path}")
-            
-            # Create temporary output file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-                output_file = temp_file.name
-            
-            # Run the faster-whisper script
-            cmd = [
-                "python3", self.script_path,
-                "--input", audio_file_path,
-                "--output", output_file,
-                "--language", language,
-                "--model", "base"  # Can be configured
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=600  # 10 minute timeout
-            )
-            
-            if result.returncode != 0:
-                raise Exception(f"Script failed: {result.stderr}")
-            
-            # Read the output
-            with open(output_file, 'r', encoding='utf-8') as f:
-                transcription_text = f.read().strip()
-            
-            # Clean up
-            os.unlink(output_file)
-            
-            logger.info("Transcription completed successfully with custom script")
-            return {
-                'status': 'success',
-                'text': transcription_text,
-                'segments': self._parse_segments(transcription_text),
-                'language': language
-            }
+    def iter_segments(self, audio_file_path: str, language: str = 'en') -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe audio, yielding each segment as soon as it is decoded
+        
+        Lets callers such as streaming endpoints forward partial results
+        without holding the whole transcript.
+        
+        Args:
+            audio_file_path: Path to the audio file
+            language: Language code for transcription
             
-        except subprocess.TimeoutExpired:
-            logger.error("Transcription timed out")
-            return {
-                'status': 'error',
-                'message': 'Transcription timed out',
-                'text': '',
-                'segments': []
-            }
-        except Exception as e:
-            logger.error(f"Custom script processing failed: {str(e)}")
-            # Fall back to local whisper if available
-            if self.use_local_fallback:
-                return self._process_with_local_whisper(audio_file_path, language)
-            raise
+        Yields:
+            Dictionaries with 'start', 'end' and 'text' for each segment
+        """
+        segments, _ = self._start_transcription(audio_file_path, language)
+        for segment in segments:
+            yield self._segment_dict(segment)
+    
+    def _start_transcription(self, audio_file_path: str, language: str):
+        """Start transcribing with the shared model; segments are decoded lazily as they are iterated"""
+        model = self._get_model()
+        
+        # Convert language code for whisper
+        whisper_language = self._convert_language_code(language)
+        
+        return model.transcribe(
+            audio_file_path,
+            language=whisper_language,
+            task="transcribe"
+        )
+    
+    @staticmethod
+    def _segment_dict(segment) -> Dict[str, Any]:
+        return {
+            'start': segment.start,
+            'end': segment.end,
+            'text': segment.text.strip()
+        }
     
     def _process_with_local_whisper(self, audio_file_path: str, language: str) -> Dict[str, Any]:
         """Process audio using local faster-whisper installation"""
         try:
             logger.info("Processing audio with local faster-whisper")
             
-            from faster_whisper import WhisperModel
+            segments, info = self._start_transcription(audio_file_path, language)
             
-            # Initialize model (use CPU for compatibility, GPU if available)
-            try:
-                # Try GPU first
-                model = WhisperModel("base", device="cuda", compute_type="float16")
-                logger.info("Using GPU for transcription")
-            except:
-                # Fall back to CPU
-                model = WhisperModel("base", device="cpu", compute_type="int8")
-                logger.info("Using CPU for transcription")
-            
-            # Convert language code for whisper
-            whisper_language = self._convert_language_code(language)
-            
-            # Transcribe
-            segments, info = model.transcribe(
-                audio_file_path, 
-                language=whisper_language, 
-                task="transcribe"
-            )
-            
-            # Collect results
-            transcription_text = ""
+            # Collect results; the text is joined once at the end rather than grown per segment
+            text_parts = []
             segment_list = []
             
             for segment in segments:
-                transcription_text += segment.text + " "
-                segment_list.append({
-                    'start': segment.start,
-                    'end': segment.end,
-                    'text': segment.text.strip()
-                })
+                text_parts.append(segment.text)
+                segment_list.append(self._segment_dict(segment))
             
             logger.info("Local transcription completed successfully")
             return {
                 'status': 'success',
-                'text': transcription_text.strip(),
+                'text': " ".join(text_parts).strip(),
                 'segments': segment_list,
                 'language': info.language,
                 'confidence': info.language_probability
@@ -175,6 +128,27 @@ class LocalWhisperClient:
                 'segments': []
             }
     
+    def _get_model(self):
+        """Load the faster-whisper model on first use and share it between calls and threads"""
+        if self._model is not None:
+            return self._model
+        
+        with self._model_lock:
+            if self._model is None:
+                import ctranslate2
+                from faster_whisper import WhisperModel
+                
+                # INT8 weights halve the bytes read per decode step on GPU and quarter them on
+                # CPU; CTranslate2 falls back to the closest type a card without int8 kernels supports
+                if ctranslate2.get_cuda_device_count() > 0:
+                    device, compute_type = "cuda", WHISPER_COMPUTE_TYPE or "int8_float16"
+                else:
+                    device, compute_type = "cpu", WHISPER_COMPUTE_TYPE or "int8"
+                model = WhisperModel(self.model_size, device=device, compute_type=compute_type, num_workers=LOCAL_WHISPER_WORKERS)
+                logger.info(f"Using {device} for transcription with the {self.model_size} model (compute type: {getattr(model.model, 'compute_type', compute_type)})")
+                self._model = model
+        return self._model
+    
     def _convert_language_code(self, language: str) -> str:
         """Convert language code to whisper format"""
         language_map = {
@@ -190,22 +164,6 @@ class LocalWhisperClient:
             'zh': 'zh'
         }
         return language_map.get(language, 'en')
-    
-    def _parse_segments(self, text: str) -> list:
-        """Parse text into segments (basic implementation)"""
-        # Simple sentence-based segmentation
-        sentences = text.split('. ')
-        segments = []
-        
-        for i, sentence in enumerate(sentences):
-            if sentence.strip():
-                segments.append({
-                    'start': i * 3.0,  # Approximate timing
-                    'end': (i + 1) * 3.0,
-                    'text': sentence.strip()
-                })
-        
-        return segments
 
 # Initialize the client
 whisper_client = LocalWhisperClient()
@@ -109,7 +109,7 @@ Group=$APP_USER
 WorkingDirectory=$APP_DIR
 Environment="PATH=$APP_DIR/venv/bin"
 EnvironmentFile=$APP_DIR/.env
-ExecStart=$APP_DIR/venv/bin/gunicorn --workers 3 --bind 0.0.0.0:5000 --timeout 300 --preload main:app
+ExecStart=$APP_DIR/venv/bin/gunicorn --workers 1 --worker-class gthread --threads 8 --bind 0.0.0.0:5000 --timeout 300 --preload main:app
 ExecReload=/bin/kill -s HUP \$MAINPID
 Restart=on-failure
 RestartSec=5
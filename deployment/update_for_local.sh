@@ -153,7 +153,7 @@ Group=www-data
 WorkingDirectory=$APP_DIR
 Environment="PATH=$APP_DIR/venv/bin"
 EnvironmentFile=$APP_DIR/.env
-ExecStart=$APP_DIR/venv/bin/gunicorn --workers 3 --bind 0.0.0.0:5000 --timeout 600 --max-requests 500 --max-requests-jitter 50 --preload --access-logfile /var/log/speech-app/access.log --error-logfile /var/log/speech-app/error.log --log-level info main:app
+ExecStart=$APP_DIR/venv/bin/gunicorn --workers 1 --worker-class gthread --threads 8 --bind 0.0.0.0:5000 --timeout 600 --preload --access-logfile /var/log/speech-app/access.log --error-logfile /var/log/speech-app/error.log --log-level info main:app
 ExecReload=/bin/kill -s HUP \$MAINPID
 KillMode=mixed
 Restart=on-failure
@@ -1,8 +1,11 @@
+import os
 import logging
 from app import app
 
 # Configure logging
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper())
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # Development server only; production runs under gunicorn (deployment/gunicorn.conf.py).
+    # Set FLASK_DEV=1 to enable the debugger and reloader.
+    app.run(host="0.0.0.0", port=5000, debug=os.environ.get("FLASK_DEV") == "1", threaded=True)
@@ -1,6 +1,7 @@
 import datetime
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, Index
+from sqlalchemy.orm import deferred
 
 db = SQLAlchemy()
 
@@ -35,6 +36,13 @@ class ProcessingJob(db.Model):
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     
+    # History pages are read newest first by (created_at, id), optionally for one status;
+    # these let both forms of the keyset query walk an index without sorting
+    __table_args__ = (
+        Index('ix_processing_jobs_created', created_at.desc(), id.desc()),
+        Index('ix_processing_jobs_status_created', status, created_at.desc(), id.desc()),
+    )
+    
     def __repr__(self):
         return f'<ProcessingJob {self.id}: {self.job_type} - {self.status}>'
     
@@ -71,6 +79,9 @@ class Transcription(db.Model):
     original_filename = Column(String(255), nullable=False)
     file_type = Column(String(10), nullable=False)  # mp3, wav, etc.
     file_size = Column(Integer, nullable=False)  # Size in bytes
+    # BLAKE2b of the uploaded bytes. Deferred so reads of older databases without the
+    # column keep working when app.py's startup check could not add it
+    content_hash = deferred(Column(String(64), nullable=True, index=True))
     transcription_text = Column(Text, nullable=True)
     processing_time = Column(Integer, nullable=True)  # Processing time in milliseconds
     status = Column(String(20), nullable=False, default='processing')  # processing, completed, failed
@@ -10,8 +10,10 @@ This creates a REST API endpoint that receives transcript data and saves it to O
 
 from flask import Flask, request, jsonify
 import qmclient as qm
-from datetime import datetime
+from datetime import datetime, timedelta
+import atexit
 import logging
+import threading
 
 app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -27,9 +29,131 @@ OPENQM_FILE = "TRANSCRIPT"
 FM = chr(254)  # Field Mark
 VM = chr(253)  # Value Mark
 
+RECORD_FIELD_COUNT = 12
+
+# qmclient keeps one implicit session per process, so a single connection and open
+# file handle are shared by all requests; the lock keeps their calls from overlapping
+_qm_lock = threading.Lock()
+_fno = None
+_last_record_time = None
+
+class OpenQMError(Exception):
+    """Connecting to OpenQM or opening the transcript file failed"""
+
+def _open_file():
+    """Connect and open OPENQM_FILE unless already open; caller holds _qm_lock"""
+    global _fno
+    if _fno is not None:
+        return _fno
+    
+    logger.info(f"Connecting to OpenQM locally...")
+    
+    # Connect to local OpenQM server
+    if not qm.Connect("localhost", 4243, OPENQM_USERNAME, OPENQM_PASSWORD, OPENQM_ACCOUNT):
+        raise OpenQMError('Failed to connect to OpenQM')
+    
+    logger.info(f"Opening file {OPENQM_FILE}")
+    
+    # Open the TRANSCRIPT file
+    fno = qm.Open(OPENQM_FILE)
+    if fno < 0:
+        qm.Disconnect()
+        raise OpenQMError(f'Failed to open file {OPENQM_FILE}')
+    
+    _fno = fno
+    return fno
+
+def _close_session():
+    """Close the file and disconnect, ignoring errors from a dead session; caller holds _qm_lock"""
+    global _fno
+    if _fno is None:
+        return
+    try:
+        qm.Close(_fno)
+        qm.Disconnect()
+    except Exception as e:
+        logger.warning(f"Error closing OpenQM session: {str(e)}")
+    _fno = None
+
+def _shutdown():
+    with _qm_lock:
+        _close_session()
+
+atexit.register(_shutdown)
+
+def _new_record_id():
+    """
+    Unique record ID from the current time; caller holds _qm_lock
+    
+    Bulk writes can land within the clock's resolution, and a repeated ID would
+    silently overwrite the earlier record, so the time is nudged forward when needed.
+    
+    Returns:
+        tuple: (record ID, the datetime it was made from)
+    """
+    global _last_record_time
+    now = datetime.now()
+    if _last_record_time is not None and now <= _last_record_time:
+        now = _last_record_time + timedelta(microseconds=1)
+    _last_record_time = now
+    return f"TRANS_{now.strftime('%Y%m%d_%H%M%S_%f')}", now
+
+def _write_record(record_id, record_data):
+    """
+    Write one record over the shared session; caller holds _qm_lock
+    
+    A write that raises is retried once on a fresh connection, in case the
+    server dropped the old one.
+    
+    Returns:
+        int: QMStatus() after the write (0 is SV_OK)
+    """
+    try:
+        qm.Write(_open_file(), record_id, record_data)
+    except OpenQMError:
+        raise
+    except Exception as e:
+        logger.warning(f"Write failed ({str(e)}), reconnecting to OpenQM")
+        _close_session()
+        qm.Write(_open_file(), record_id, record_data)
+    return qm.Status()
+
+def _build_record(transcript_data, llm_data, timestamp):
+    """Join a transcript's fields with field marks in the TRANSCRIPT file's layout"""
+    fields = [''] * RECORD_FIELD_COUNT  # Fields 9-12 stay empty without LLM processing
+    fields[0] = timestamp.isoformat()  # Field 1: TIMESTAMP
+    fields[1] = transcript_data.get('text', '')  # Field 2: ORIGINAL_TEXT
+    fields[2] = transcript_data.get('source_type', 'unknown')  # Field 3: SOURCE_TYPE
+    fields[3] = transcript_data.get('source_url', '')  # Field 4: SOURCE_URL
+    fields[4] = transcript_data.get('language', 'en')  # Field 5: LANGUAGE
+    fields[5] = str(transcript_data.get('duration', 0))  # Field 6: DURATION
+    fields[6] = transcript_data.get('file_name', '')  # Field 7: FILE_NAME
+    
+    # Add LLM processing fields if available
+    if llm_data:
+        fields[7] = 'Y'  # Field 8: HAS_LLM_PROCESSING
+        fields[8] = llm_data.get('prompt', '')  # Field 9: LLM_PROMPT
+        fields[9] = llm_data.get('processed_text', '')  # Field 10: LLM_RESPONSE
+        fields[10] = llm_data.get('model', '')  # Field 11: LLM_MODEL
+        fields[11] = llm_data.get('processing_type', '')  # Field 12: PROCESSING_TYPE
+    else:
+        fields[7] = 'N'  # Field 8: HAS_LLM_PROCESSING
+    
+    # Join fields with field marks
+    return FM.join(fields)
+
 @app.route('/health', methods=['GET'])
 def health():
-    """Health check endpoint"""
+    """Health check endpoint; reconnects if the shared OpenQM session has dropped"""
+    with _qm_lock:
+        try:
+            if _fno is not None and not qm.Connected():
+                logger.warning("OpenQM session dropped, reconnecting")
+                _close_session()
+            _open_file()
+        except Exception as e:
+            logger.error(f"OpenQM health check failed: {str(e)}")
+            return jsonify({'status': 'error', 'service': 'openqm-save-service', 'error': str(e)}), 503
     return jsonify({'status': 'ok', 'service': 'openqm-save-service'})
 
 @app.route('/save-transcript', methods=['POST'])
@@ -57,73 +181,13 @@ def save_transcript():
     """
     try:
         data = request.json
-        transcript_data = data.get('transcript_data', {})
-        llm_data = data.get('llm_data')
-        
-        # Generate unique record ID
-        record_id = f"TRANS_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
         
-        logger.info(f"Connecting to OpenQM locally...")
-        
-        # Connect to local OpenQM server
-        session = qm.Connect("localhost", 4243, OPENQM_USERNAME, OPENQM_PASSWORD, OPENQM_ACCOUNT)
-        
-        if not session:
-            return jsonify({
-                'success': False,
-                'error': 'Failed to connect to OpenQM'
-            }), 500
-        
-        logger.info(f"Opening file {OPENQM_FILE}")
-        
-        # Open the TRANSCRIPT file
-        fno = qm.Open(OPENQM_FILE)
-        
-        if fno < 0:
-            qm.Disconnect()
-            return jsonify({
-                'success': False,
-                'error': f'Failed to open file {OPENQM_FILE}'
-            }), 500
-        
-        # Build record with field marks
-        fields = []
-        fields.append(datetime.now().isoformat())  # Field 1: TIMESTAMP
-        fields.append(transcript_data.get('text', ''))  # Field 2: ORIGINAL_TEXT
-        fields.append(transcript_data.get('source_type', 'unknown'))  # Field 3: SOURCE_TYPE
-        fields.append(transcript_data.get('source_url', ''))  # Field 4: SOURCE_URL
-        fields.append(transcript_data.get('language', 'en'))  # Field 5: LANGUAGE
-        fields.append(str(transcript_data.get('duration', 0)))  # Field 6: DURATION
-        fields.append(transcript_data.get('file_name', ''))  # Field 7: FILE_NAME
-        
-        # Add LLM processing fields if available
-        if llm_data:
-            fields.append('Y')  # Field 8: HAS_LLM_PROCESSING
-            fields.append(llm_data.get('prompt', ''))  # Field 9: LLM_PROMPT
-            fields.append(llm_data.get('processed_text', ''))  # Field 10: LLM_RESPONSE
-            fields.append(llm_data.get('model', ''))  # Field 11: LLM_MODEL
-            fields.append(llm_data.get('processing_type', ''))  # Field 12: PROCESSING_TYPE
-        else:
-            fields.append('N')  # Field 8: HAS_LLM_PROCESSING
-            fields.append('')  # Field 9-12: Empty
-            fields.append('')
-            fields.append('')
-            fields.append('')
-        
-        # Join fields with field marks
-        record_data = FM.join(fields)
-        
-        logger.info(f"Writing record {record_id} to OpenQM")
-        
-        # Write the record
-        qm.Write(fno, record_id, record_data)
-        
-        # Check status
-        status = qm.Status()
-        
-        # Close file and disconnect
-        qm.Close(fno)
-        qm.Disconnect()
+        with _qm_lock:
+            # The TIMESTAMP field uses the same time as the record ID
+            record_id, now = _new_record_id()
+            record_data = _build_record(data.get('transcript_data', {}), data.get('llm_data'), now)
+            logger.info(f"Writing record {record_id} to OpenQM")
+            status = _write_record(record_id, record_data)
         
         if status == 0:  # SV_OK
             logger.info(f"Successfully saved record {record_id}")
@@ -145,6 +209,57 @@ def save_transcript():
             'error': str(e)
         }), 500
 
+@app.route('/save-transcripts', methods=['POST'])
+def save_transcripts():
+    """
+    Save a batch of transcripts to OpenQM over the shared session
+    
+    Expected JSON payload:
+    {
+        "records": [
+            {"transcript_data": {...}, "llm_data": {...}},  # as for /save-transcript
+            ...
+        ]
+    }
+    
+    Records are written in order; a failed record doesn't stop the rest.
+    """
+    try:
+        records = request.json.get('records', [])
+        
+        saved = []
+        failed = []
+        with _qm_lock:
+            for index, record in enumerate(records):
+                record_id, now = _new_record_id()
+                record_data = _build_record(record.get('transcript_data', {}), record.get('llm_data'), now)
+                try:
+                    status = _write_record(record_id, record_data)
+                except OpenQMError:
+                    raise
+                except Exception as e:
+                    failed.append({'index': index, 'error': str(e)})
+                    continue
+                if status == 0:  # SV_OK
+                    saved.append(record_id)
+                else:
+                    failed.append({'index': index, 'error': f'Write failed with status code {status}'})
+        
+        logger.info(f"Saved {len(saved)} of {len(records)} records to OpenQM")
+        return jsonify({
+            'success': not failed,
+            'record_ids': saved,
+            'failed': failed,
+            'message': f'{len(saved)} records saved to OpenQM file {OPENQM_FILE}'
+        }), (200 if not failed else 207)
+        
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 if __name__ == '__main__':
     print("="*60)
     print("OpenQM Save Service for mv1 (10.1.34.103)")
@@ -583,21 +583,56 @@ function updateProgress(percentage, message) {
     }
 }
 
+// Show a job status update; returns true once the job has finished
+function handleJobStatus(status) {
+    updateProgress(status.progress_percentage || 0, status.status_message || 'Processing...');
+    
+    if (status.status === 'completed') {
+        showResults(status);
+        return true;
+    } else if (status.status === 'failed') {
+        showError(status.error_message || 'Processing failed');
+        return true;
+    }
+    return false;
+}
+
+// Job Status: pushed by the server over Server-Sent Events, polling as the fallback
+function pollJobStatus(jobId) {
+    if (!window.EventSource) {
+        pollJobStatusWithFetch(jobId);
+        return;
+    }
+    
+    const source = new EventSource(`/api/job-stream/${jobId}`);
+    let received = false;
+    
+    source.onmessage = (event) => {
+        received = true;
+        if (handleJobStatus(JSON.parse(event.data))) {
+            source.close();
+        }
+    };
+    source.onerror = () => {
+        // EventSource reconnects by itself when a stream ends; fall back to
+        // polling if streaming never worked or the server refused a reconnect
+        // (a 503 when too many streams are open closes the source for good)
+        if (!received || source.readyState === EventSource.CLOSED) {
+            source.close();
+            pollJobStatusWithFetch(jobId);
+        }
+    };
+}
+
 // Job Status Polling (no timeout - keeps polling)
-async function pollJobStatus(jobId) {
+async function pollJobStatusWithFetch(jobId) {
     const interval = setInterval(async () => {
         try {
             const response = await fetch(`/api/job-status/${jobId}`);
             const status = await response.json();
             
-            updateProgress(status.progress_percentage || 0, status.status_message || 'Processing...');
-            
-            if (status.status === 'completed') {
-                clearInterval(interval);
-                showResults(status);
-            } else if (status.status === 'failed') {
+            if (handleJobStatus(status)) {
                 clearInterval(interval);
-                showError(status.error_message || 'Processing failed');
             }
         } catch (error) {
             console.error('Error polling job status:', error);
@@ -683,7 +718,7 @@ async function processWithAI(prompt) {
         
         const response = await fetch('/api/process-text-with-ai', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
             body: JSON.stringify({
                 text: appState.currentTranscript,
                 prompt: prompt,
@@ -693,7 +728,8 @@ async function processWithAI(prompt) {
             })
         });
         
-        const result = await response.json();
+        const isStream = (response.headers.get('Content-Type') || '').startsWith('text/event-stream');
+        const result = isStream ? await readAIStream(response) : await response.json();
         
         if (result.success) {
             displayAIResult(result.processed_text, result.files);
@@ -706,6 +742,46 @@ async function processWithAI(prompt) {
     }
 }
 
+// Read the AI response as it is generated, showing the text so far; resolves
+// with the final event ({success, processed_text, files} or {error})
+async function readAIStream(response) {
+    const preview = document.createElement('div');
+    preview.className = 'result-preview';
+    preview.style.cssText = 'background: #eff6ff; white-space: pre-wrap; margin-top: 2rem;';
+    document.getElementById('result-content').appendChild(preview);
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let final = { success: false, error: 'AI response ended unexpectedly' };
+    
+    try {
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            // Events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const line = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                if (!line.startsWith('data: ')) continue;
+                
+                const event = JSON.parse(line.slice(6));
+                if (event.done) {
+                    final = event;
+                } else if (event.token) {
+                    preview.textContent += event.token;
+                }
+            }
+        }
+    } finally {
+        preview.remove();
+    }
+    return final;
+}
+
 function displayAIResult(text, files) {
     const resultContent = document.getElementById('result-content');
     
@@ -97,10 +97,6 @@ document.addEventListener('DOMContentLoaded', function() {
         updateProgress(0, 'upload-progress-bar');
         statusElement.classList.add('d-none');
         
-        // Create a FormData object
-        const formData = new FormData();
-        formData.append('audio_file', file);
-        
         // Create and send the XMLHttpRequest
         const xhr = new XMLHttpRequest();
         
@@ -116,11 +112,14 @@ document.addEventListener('DOMContentLoaded', function() {
         xhr.addEventListener('load', function() {
             updateProgress(100, 'upload-progress-bar');
             
-            if (xhr.status === 200) {
+            if (xhr.status === 200 || xhr.status === 202) {
                 try {
                     const response = JSON.parse(xhr.responseText);
                     
-                    if (response.success) {
+                    if (response.success && response.job_id) {
+                        // Transcription runs in the background; poll for the result
+                        pollTranscription(response.job_id, response.filename);
+                    } else if (response.success) {
                         // Show success message
                         showAlert(
                             '<i class="fas fa-check-circle"></i> File transcribed successfully!',
@@ -184,9 +183,12 @@ document.addEventListener('DOMContentLoaded', function() {
         });
         
         // Set up and send the request
-        xhr.open('POST', '/upload', true);
+        // Send the raw file body so the server can stream it straight to disk
+        xhr.open('POST', '/upload_stream', true);
         xhr.timeout = 300000; // 5 minutes timeout for large files
-        xhr.send(formData);
+        xhr.setRequestHeader('Content-Type', 'application/octet-stream');
+        xhr.setRequestHeader('X-Filename', encodeURIComponent(file.name));
+        xhr.send(file);
         
         // Show processing message
         showAlert(
@@ -196,6 +198,32 @@ document.addEventListener('DOMContentLoaded', function() {
         );
     }
     
+    function pollTranscription(jobId, filename) {
+        fetch(`/api/job-status/${jobId}`)
+            .then(response => response.json())
+            .then(status => {
+                if (status.status === 'completed') {
+                    showAlert(
+                        '<i class="fas fa-check-circle"></i> File transcribed successfully!',
+                        'success',
+                        'upload-status'
+                    );
+                    displayTranscription(filename, status.result_text || '');
+                } else if (status.status === 'failed' || status.error) {
+                    showAlert(
+                        `<i class="fas fa-exclamation-circle"></i> ${status.status_message || status.error || 'An error occurred during transcription.'}`,
+                        'danger',
+                        'upload-status'
+                    );
+                } else {
+                    setTimeout(() => pollTranscription(jobId, filename), 2000);
+                }
+            })
+            .catch(() => {
+                setTimeout(() => pollTranscription(jobId, filename), 5000);
+            });
+    }
+    
     function displayTranscription(filename, transcription) {
         // Hide placeholder, show content
         transcriptionPlaceholder.classList.add('d-none');
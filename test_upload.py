@@ -6,6 +6,13 @@ import requests
 import sys
 import os
 
+# Stream the multipart body from disk when requests-toolbelt is installed; plain
+# requests builds the whole body in memory before sending
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
 def test_upload(file_path, url='https://speech.lcs.ai'):
     """Test uploading an audio file to the API"""
     
@@ -31,12 +38,22 @@ def test_upload(file_path, url='https://speech.lcs.ai'):
     
     try:
         print("Uploading file...")
-        response = requests.post(
-            f"{url}/api/process",
-            files=files,
-            data=data,
-            timeout=300  # 5 minute timeout
-        )
+        # (connect, read) timeouts: fail fast if the server is unreachable, wait up to 5 minutes for the result
+        if MultipartEncoder is not None:
+            encoder = MultipartEncoder(fields={**data, **files})
+            response = requests.post(
+                f"{url}/api/process",
+                data=encoder,
+                headers={'Content-Type': encoder.content_type},
+                timeout=(10, 300)
+            )
+        else:
+            response = requests.post(
+                f"{url}/api/process",
+                files=files,
+                data=data,
+                timeout=(10, 300)
+            )
         
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text[:500]}")
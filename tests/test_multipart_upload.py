@@ -0,0 +1,82 @@
+import hashlib
+import io
+import os
+
+import pytest
+from flask import Flask, request
+
+from utils import multipart_upload
+from utils.multipart_upload import PARTIAL_SUFFIX, UploadRequest, receive_multipart
+
+ALLOWED = frozenset({'mp3', 'wav'})
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.request_class = UploadRequest
+    app.config['UPLOAD_FOLDER'] = str(tmp_path)
+    return app
+
+@pytest.fixture(params=['werkzeug', 'streaming'])
+def parser(request, monkeypatch):
+    """Run each test against both multipart parsers"""
+    if request.param == 'streaming':
+        pytest.importorskip('streaming_form_data')
+        monkeypatch.setattr(multipart_upload, 'STREAMING_FORM_DATA_AVAILABLE', True)
+    else:
+        monkeypatch.setattr(multipart_upload, 'STREAMING_FORM_DATA_AVAILABLE', False)
+    return request.param
+
+def upload(app, files, **fields):
+    """Request context whose body is a multipart form with the given (filename, bytes) files"""
+    data = dict(fields)
+    data['files'] = [(io.BytesIO(content), filename) for filename, content in files]
+    return app.test_request_context('/', method='POST', data=data, content_type='multipart/form-data')
+
+def test_upload_request_spools_file_parts_into_the_upload_folder(app, tmp_path):
+    with upload(app, [('clip.mp3', b'x' * 1024)]):
+        stream = request.files['files'].stream
+
+        assert os.path.dirname(stream.name) == str(tmp_path)
+        assert stream.name.endswith(PARTIAL_SUFFIX)
+
+def test_saved_files_keep_their_name_size_and_hash(app, tmp_path, parser):
+    content = b'audio bytes' * 100
+    with upload(app, [('clip.mp3', content)], target_language='de'):
+        saved_files, values = receive_multipart(request, 'files', ('target_language',), str(tmp_path), ALLOWED)
+
+    [saved] = saved_files
+    assert saved['filename'] == 'clip.mp3'
+    assert saved['extension'] == 'mp3'
+    assert saved['size'] == len(content)
+    assert saved['content_hash'] == hashlib.blake2b(content, digest_size=32).hexdigest()
+    assert saved['path'].endswith('.mp3') and os.path.dirname(saved['path']) == str(tmp_path)
+    with open(saved['path'], 'rb') as f:
+        assert f.read() == content
+    assert values == {'target_language': 'de'}
+
+def test_disallowed_files_are_deleted_and_reported_without_a_path(app, tmp_path, parser):
+    with upload(app, [('notes.exe', b'nope'), ('clip.wav', b'yes')]):
+        saved_files, _ = receive_multipart(request, 'files', (), str(tmp_path), ALLOWED)
+
+    assert [(f['filename'], f['path'] is None) for f in saved_files] == [('notes.exe', True), ('clip.wav', False)]
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(saved_files[1]['path'])]
+
+def test_checksum_mismatch_discards_every_file(app, tmp_path, parser):
+    with upload(app, [('clip.mp3', b'data')]):
+        with pytest.raises(ValueError):
+            receive_multipart(
+                request, 'files', (), str(tmp_path), ALLOWED,
+                expected_sha256=hashlib.sha256(b'other data').hexdigest()
+            )
+
+    assert os.listdir(tmp_path) == []
+
+def test_matching_checksum_is_accepted(app, tmp_path, parser):
+    with upload(app, [('clip.mp3', b'data')]):
+        saved_files, _ = receive_multipart(
+            request, 'files', (), str(tmp_path), ALLOWED,
+            expected_sha256=hashlib.sha256(b'data').hexdigest().upper()
+        )
+
+    assert saved_files[0]['sha256'] == hashlib.sha256(b'data').hexdigest()
@@ -0,0 +1,81 @@
+import threading
+
+from utils.progress_store import ProgressStore
+
+def test_update_merges_fields_and_get_returns_a_copy():
+    store = ProgressStore()
+    store.create('job', message='Starting...')
+    store.update('job', progress=50, message='Halfway')
+
+    snapshot = store.get('job')
+    snapshot['progress'] = 99
+
+    assert store.get('job')['progress'] == 50
+    assert store.get('job')['message'] == 'Halfway'
+
+def test_updates_to_unknown_jobs_are_ignored():
+    store = ProgressStore()
+    store.update('missing', progress=10)
+
+    assert store.get('missing') is None
+
+def test_finished_jobs_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('utils.progress_store.time.time', lambda: now[0])
+    store = ProgressStore(ttl=60, stale_after=3600)
+    store.create('done')
+    store.create('running')
+    store.update('done', status='completed')
+
+    now[0] += 59
+    assert store.prune() == 0
+
+    now[0] += 2
+    assert store.prune() == 1
+    assert store.get('done') is None
+    assert store.get('running') is not None
+
+def test_unfinished_jobs_are_dropped_after_stale_after(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('utils.progress_store.time.time', lambda: now[0])
+    store = ProgressStore(ttl=60, stale_after=3600)
+    store.create('stuck')
+
+    now[0] += 3601
+    assert store.prune() == 1
+    assert store.get('stuck') is None
+
+def test_wait_for_update_returns_at_once_when_the_version_is_behind():
+    store = ProgressStore()
+    store.create('job', progress=5)
+
+    progress, version = store.wait_for_update('job', 0, timeout=5)
+
+    assert progress['progress'] == 5
+    assert version == 1
+
+def test_wait_for_update_times_out_without_a_write():
+    store = ProgressStore()
+    store.create('job')
+
+    progress, version = store.wait_for_update('job', 1, timeout=0.05)
+
+    assert version == 1
+    assert progress is not None
+
+def test_wait_for_update_wakes_on_a_write():
+    store = ProgressStore()
+    store.create('job')
+    writer = threading.Timer(0.05, store.update, args=('job',), kwargs={'progress': 40})
+    writer.start()
+
+    progress, version = store.wait_for_update('job', 1, timeout=5)
+    writer.join()
+
+    assert progress['progress'] == 40
+    assert version == 2
+
+def test_wait_for_update_reports_untracked_jobs():
+    store = ProgressStore()
+
+    assert store.wait_for_update('missing', 0, timeout=0.01) == (None, 0)
@@ -0,0 +1,42 @@
+from utils.whisper_batcher import SILENCE_SECONDS, split_segments
+
+# Two clips laid end to end with SILENCE_SECONDS of silence after each
+BOUNDARIES = [(0.0, 4.0), (4.0 + SILENCE_SECONDS, 10.0 + SILENCE_SECONDS)]
+
+def segment(start, end, text):
+    return {'start': start, 'end': end, 'text': text}
+
+def test_segments_go_to_the_clip_containing_them():
+    per_clip = split_segments(
+        [segment(0.5, 2.0, 'first'), segment(6.0, 8.0, 'second')],
+        BOUNDARIES
+    )
+
+    assert [s['text'] for s in per_clip[0]] == ['first']
+    assert [s['text'] for s in per_clip[1]] == ['second']
+
+def test_segments_are_retimed_from_the_start_of_their_clip():
+    per_clip = split_segments([segment(6.0, 8.0, 'second')], BOUNDARIES)
+
+    assert per_clip[1] == [segment(6.0 - BOUNDARIES[1][0], 8.0 - BOUNDARIES[1][0], 'second')]
+
+def test_segment_in_the_trailing_silence_belongs_to_the_clip_before_it():
+    per_clip = split_segments([segment(3.8, 4.6, 'tail')], BOUNDARIES)
+
+    assert [s['text'] for s in per_clip[0]] == ['tail']
+    assert per_clip[1] == []
+
+def test_segment_crossing_a_boundary_goes_by_its_midpoint():
+    # Midpoint 5.5 lies past the first clip and its silence
+    per_clip = split_segments([segment(3.0, 8.0, 'straddle')], BOUNDARIES)
+
+    assert per_clip[0] == []
+    assert per_clip[1] == [segment(0.0, 8.0 - BOUNDARIES[1][0], 'straddle')]
+
+def test_segment_past_the_last_clip_is_dropped():
+    end = BOUNDARIES[-1][1] + SILENCE_SECONDS
+
+    assert split_segments([segment(end + 1.0, end + 2.0, 'noise')], BOUNDARIES) == [[], []]
+
+def test_no_segments_gives_every_clip_an_empty_list():
+    assert split_segments([], BOUNDARIES) == [[], []]
@@ -7,10 +7,23 @@ logger = logging.getLogger(__name__)
 
 # Get the full path to ffmpeg - use environment variable or find it in the system
 FFMPEG_PATH = shutil.which('ffmpeg') or os.environ.get('FFMPEG_PATH', 'ffmpeg')
+FFPROBE_PATH = shutil.which('ffprobe') or os.environ.get('FFPROBE_PATH', 'ffprobe')
+
+# PyAV ships with faster-whisper; read media headers in-process when it is available
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    av = None
+    PYAV_AVAILABLE = False
+    logger.info("PyAV not found, media durations will be read with ffprobe")
+
+# Whisper works on 16kHz mono audio, so resample straight to that
+TARGET_SAMPLE_RATE = 16000
 
 def convert_mp3_to_wav(mp3_path, wav_path):
     """
-    Convert an MP3 file to WAV format using ffmpeg
+    Convert an MP3 file to WAV format (16kHz mono PCM) using ffmpeg
     
     Args:
         mp3_path (str): Path to the MP3 file
@@ -18,7 +31,7 @@ def convert_mp3_to_wav(mp3_path, wav_path):
     
     Returns:
         bool: True if conversion was successful, False otherwise
-        
+    
     Raises:
         Exception: If the conversion fails
     """
@@ -26,15 +39,16 @@ def convert_mp3_to_wav(mp3_path, wav_path):
         raise FileNotFoundError(f"MP3 file not found at {mp3_path}")
     
     try:
-        logger.debug(f"Converting {mp3_path} to WAV format at {wav_path}")
+        logger.debug("Converting %s to WAV format at %s", mp3_path, wav_path)
         
         # Run ffmpeg command to convert MP3 to WAV
         # -y: Overwrite output file without asking
         # -i: Input file
         # -acodec pcm_s16le: Convert to 16-bit PCM WAV
         # -ar 16000: Set sample rate to 16kHz (common for speech recognition)
+        # -ac 1: Downmix to mono
         result = subprocess.run(
-            [FFMPEG_PATH, '-y', '-i', mp3_path, '-acodec', 'pcm_s16le', '-ar', '16000', wav_path],
+            [FFMPEG_PATH, '-y', '-i', mp3_path, '-acodec', 'pcm_s16le', '-ar', str(TARGET_SAMPLE_RATE), '-ac', '1', wav_path],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             check=True
@@ -42,7 +56,7 @@ def convert_mp3_to_wav(mp3_path, wav_path):
         
         logger.debug("Conversion successful")
         return True
-        
+    
     except subprocess.CalledProcessError as e:
         logger.error(f"FFmpeg conversion failed: {e.stderr.decode()}")
         raise Exception(f"Failed to convert MP3 to WAV: {e.stderr.decode()}")
@@ -50,3 +64,106 @@ def convert_mp3_to_wav(mp3_path, wav_path):
     except Exception as e:
         logger.error(f"Error during conversion: {str(e)}")
         raise Exception(f"Error during conversion: {str(e)}")
+
+def extract_audio(in_path, out_path):
+    """
+    Extract the audio track of a media file as 16kHz mono PCM WAV in one ffmpeg run
+    
+    Args:
+        in_path (str): Path to the audio or video file
+        out_path (str): Path where the WAV file should be saved
+    
+    Returns:
+        bool: True if extraction was successful
+    
+    Raises:
+        Exception: If ffmpeg fails
+    """
+    if not os.path.exists(in_path):
+        raise FileNotFoundError(f"Media file not found at {in_path}")
+    
+    logger.debug("Extracting audio from %s to %s", in_path, out_path)
+    
+    # -vn: Skip the video stream entirely instead of decoding it
+    try:
+        subprocess.run(
+            [FFMPEG_PATH, '-hide_banner', '-loglevel', 'error', '-y', '-i', in_path,
+             '-vn', '-ac', '1', '-ar', str(TARGET_SAMPLE_RATE), '-acodec', 'pcm_s16le', '-f', 'wav', out_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True
+        )
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg audio extraction failed: {e.stderr.decode()}")
+        raise Exception(f"Failed to extract audio: {e.stderr.decode()}")
+    
+    logger.debug("Extraction successful")
+    return True
+
+def decode_to_array(path):
+    """
+    Decode the audio of a media file straight into memory as 16kHz mono float32 samples
+    
+    ffmpeg writes raw f32le PCM to a pipe, so no WAV file is written and re-read,
+    and faster-whisper takes the array as is without decoding again.
+    
+    Args:
+        path (str): Path to the audio or video file
+    
+    Returns:
+        numpy.ndarray: Samples in [-1, 1]
+    
+    Raises:
+        Exception: If ffmpeg fails
+    """
+    import numpy as np
+    
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Media file not found at {path}")
+    
+    logger.debug("Decoding %s to PCM in memory", path)
+    
+    result = subprocess.run(
+        [FFMPEG_PATH, '-hide_banner', '-loglevel', 'error', '-i', path,
+         '-vn', '-ac', '1', '-ar', str(TARGET_SAMPLE_RATE), '-f', 'f32le', 'pipe:1'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    if result.returncode != 0:
+        logger.error(f"FFmpeg decode failed: {result.stderr.decode()}")
+        raise Exception(f"Failed to decode audio: {result.stderr.decode()}")
+    
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+def get_audio_duration(path):
+    """
+    Read the duration of an audio/video file from its container header
+    
+    Uses PyAV in-process when available; otherwise runs ffprobe with probing capped,
+    since only the header is needed.
+    
+    Args:
+        path (str): Path to the media file
+    
+    Returns:
+        float: Duration in seconds, or None if it can't be determined
+    """
+    if PYAV_AVAILABLE:
+        try:
+            with av.open(path) as container:
+                if container.duration:
+                    return container.duration / av.time_base
+        except Exception as e:
+            logger.warning(f"PyAV could not read duration: {str(e)}, falling back to ffprobe")
+    
+    result = subprocess.run(
+        [FFPROBE_PATH, '-v', 'error', '-probesize', '32k', '-analyzeduration', '0',
+         '-show_entries', 'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1', path],
+        capture_output=True, text=True, timeout=10
+    )
+    if result.returncode != 0:
+        return None
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
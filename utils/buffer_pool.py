@@ -0,0 +1,88 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Reusable transfer buffers for copying uploads to disk. Buffers are created on
+# demand up to POOL_SIZE and handed back after each copy instead of letting
+# every read allocate a fresh bytes object.
+BUFFER_SIZE = 1024 * 1024  # Matches the upload read size
+POOL_SIZE = 16
+IDLE_TRIM_SECONDS = 60
+MIN_KEEP = 2
+
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+_last_acquired = time.monotonic()
+_trim_lock = threading.Lock()
+
+def acquire_buffer():
+    """Take a buffer from the pool, allocating one if the pool is empty"""
+    global _last_acquired
+    _last_acquired = time.monotonic()
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        return bytearray(BUFFER_SIZE)
+
+def release_buffer(buffer):
+    """Return a buffer to the pool; drop it if the pool is already full"""
+    try:
+        _pool.put_nowait(buffer)
+    except queue.Full:
+        pass
+
+@contextmanager
+def pooled_buffer():
+    """Borrow a transfer buffer for the duration of a with block"""
+    buffer = acquire_buffer()
+    try:
+        yield buffer
+    finally:
+        release_buffer(buffer)
+
+def trim_buffer_pool():
+    """Free pooled buffers down to MIN_KEEP once none has been borrowed for a while"""
+    if time.monotonic() - _last_acquired < IDLE_TRIM_SECONDS:
+        return
+    with _trim_lock:
+        dropped = 0
+        while _pool.qsize() > MIN_KEEP:
+            try:
+                _pool.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                break
+    if dropped:
+        logger.debug("Released %d idle transfer buffers", dropped)
+
+def copy_chunks(src, dst, *digests):
+    """
+    Copy a binary stream through a pooled buffer, updating each digest on the way
+    
+    Args:
+        src: Readable binary stream supporting readinto
+        dst: Writable binary file, or None to only hash the data
+        *digests: hashlib objects to update with the data (None entries are skipped)
+    
+    Returns:
+        int: Number of bytes copied
+    """
+    digests = [digest for digest in digests if digest is not None]
+    size = 0
+    with pooled_buffer() as buffer:
+        view = memoryview(buffer)
+        while True:
+            count = src.readinto(buffer)
+            if not count:
+                break
+            chunk = view[:count]
+            if dst:
+                dst.write(chunk)
+            for digest in digests:
+                digest.update(chunk)
+            size += count
+        view.release()
+    return size
@@ -1,12 +1,71 @@
+import codecs
 import os
 import logging
+import multiprocessing
 import tempfile
-from PyPDF2 import PdfReader
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from docx import Document
+from lxml import etree
 import re
 
 logger = logging.getLogger(__name__)
 
+# PDFium (C++) extracts text many times faster than pure-Python PyPDF2; use it when installed
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    pdfium = None
+    PDFIUM_AVAILABLE = False
+    from PyPDF2 import PdfReader
+    logger.info("pypdfium2 not found, PDF text extraction will use PyPDF2")
+
+# Encoding detection for text files; charset-normalizer comes with requests
+try:
+    from charset_normalizer import from_bytes
+except ImportError:
+    from_bytes = None
+
+# Encodings tried in order when detection is unavailable or inconclusive
+TXT_ENCODINGS = ['utf-8', 'cp1252', 'latin-1']
+ENCODING_SNIFF_BYTES = 65536
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),  # Checked before UTF-16, whose LE BOM is a prefix of it
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# WordprocessingML elements read when streaming a DOCX's main document part
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_DOCX_TAGS = tuple(_W + tag for tag in ('t', 'tab', 'br', 'cr', 'p', 'tc', 'tr', 'tbl'))
+
+# Neither PDFium nor a shared PyPDF2 reader is safe to use from several threads, so
+# large PDFs are split into page ranges and extracted in worker processes
+PDF_PARALLEL_MIN_PAGES = 32
+PDF_WORKERS = min(4, os.cpu_count() or 1)
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+_EXCESS_NEWLINES = re.compile(r'\n\s*\n\s*\n')
+_SPACE_RUNS = re.compile(r'[ \t]+')
+
+def _get_pdf_pool():
+    """Start the PDF worker processes on first use"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # forkserver: workers don't inherit the threads and sockets of the web process
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context('forkserver')
+            )
+        return _pdf_pool
+
 def extract_text_from_pdf(pdf_path):
     """
     Extract text content from a PDF file
@@ -17,31 +76,84 @@ def extract_text_from_pdf(pdf_path):
     Returns:
         str: Extracted text content
     """
+    return _read_pdf(pdf_path)[0]
+
+def _read_pdf(pdf_path):
+    """Extract a PDF's text and page count from a single open of the file"""
     try:
-        logger.debug(f"Extracting text from PDF: {pdf_path}")
+        logger.debug("Extracting text from PDF: %s", pdf_path)
         
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PdfReader(file)
-            text_content = ""
+        with _open_pdf(pdf_path) as pdf:
+            page_count = _page_count(pdf)
             
-            for page_num, page in enumerate(pdf_reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    text_content += f"\n--- Page {page_num + 1} ---\n"
-                    text_content += page_text
-                except Exception as e:
-                    logger.warning(f"Failed to extract text from page {page_num + 1}: {str(e)}")
+            if page_count < PDF_PARALLEL_MIN_PAGES or PDF_WORKERS < 2:
+                text_content = _extract_pages(pdf, 0, page_count)
+            else:
+                # Contiguous page ranges, one per worker, joined back in page order
+                per_worker = -(-page_count // PDF_WORKERS)
+                pool = _get_pdf_pool()
+                futures = [
+                    pool.submit(_extract_page_range, pdf_path, start, min(start + per_worker, page_count))
+                    for start in range(0, page_count, per_worker)
+                ]
+                text_content = ''.join(future.result() for future in futures)
             
             # Clean up the text
             text_content = clean_extracted_text(text_content)
             
-            logger.debug(f"Successfully extracted {len(text_content)} characters from PDF")
-            return text_content
+            logger.debug("Successfully extracted %s characters from PDF", len(text_content))
+            return text_content, page_count
             
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {str(e)}")
         raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
+@contextmanager
+def _open_pdf(pdf_path):
+    """Open a PDF with PDFium, or with PyPDF2 when pypdfium2 isn't installed"""
+    if not PDFIUM_AVAILABLE:
+        yield PdfReader(pdf_path)
+        return
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        yield pdf
+    finally:
+        pdf.close()
+
+def _page_count(pdf):
+    return len(pdf) if PDFIUM_AVAILABLE else len(pdf.pages)
+
+def _page_text(pdf, index):
+    """Text of one page of a document opened by _open_pdf"""
+    if not PDFIUM_AVAILABLE:
+        return pdf.pages[index].extract_text()
+    page = pdf[index]
+    try:
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range()
+        finally:
+            textpage.close()
+    finally:
+        page.close()
+
+def _extract_page_range(pdf_path, start, stop):
+    """Extract pages [start, stop) of a PDF; runs in a worker process with its own document"""
+    with _open_pdf(pdf_path) as pdf:
+        return _extract_pages(pdf, start, stop)
+
+def _extract_pages(pdf, start, stop):
+    """Text of pages [start, stop), each preceded by a page header"""
+    parts = []
+    for page_num in range(start, stop):
+        try:
+            page_text = _page_text(pdf, page_num)
+            parts.append(f"\n--- Page {page_num + 1} ---\n")
+            parts.append(page_text)
+        except Exception as e:
+            logger.warning(f"Failed to extract text from page {page_num + 1}: {str(e)}")
+    return ''.join(parts)
+
 def extract_text_from_docx(docx_path):
     """
     Extract text content from a DOCX file
@@ -52,33 +164,94 @@ def extract_text_from_docx(docx_path):
     Returns:
         str: Extracted text content
     """
+    return _read_docx(docx_path)[0]
+
+def _read_docx(docx_path):
+    """Extract a DOCX's text and paragraph count (the approximate page count) in one parse"""
     try:
-        logger.debug(f"Extracting text from DOCX: {docx_path}")
-        
-        doc = Document(docx_path)
-        text_content = ""
-        
-        # Extract text from paragraphs
-        for para in doc.paragraphs:
-            text_content += para.text + "\n"
+        logger.debug("Extracting text from DOCX: %s", docx_path)
         
-        # Extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text_content += cell.text + "\t"
-                text_content += "\n"
+        try:
+            text_content, paragraph_count = _stream_docx_text(docx_path)
+        except KeyError:
+            # Main part isn't at the usual name; python-docx finds it through the package relationships
+            logger.debug("No word/document.xml in %s, reading it with python-docx", docx_path)
+            text_content, paragraph_count = _docx_text_from_model(docx_path)
         
         # Clean up the text
         text_content = clean_extracted_text(text_content)
         
-        logger.debug(f"Successfully extracted {len(text_content)} characters from DOCX")
-        return text_content
+        logger.debug("Successfully extracted %s characters from DOCX", len(text_content))
+        return text_content, paragraph_count
         
     except Exception as e:
         logger.error(f"Error extracting text from DOCX: {str(e)}")
         raise Exception(f"Failed to extract text from DOCX: {str(e)}")
 
+def _stream_docx_text(docx_path):
+    """
+    Stream the text out of word/document.xml without building python-docx's object model
+    
+    Body paragraphs end with a newline. Table cells are tab-separated and rows
+    end with a newline. Everything comes out in document order.
+    
+    Returns:
+        tuple: (raw text, number of body paragraphs outside tables)
+    
+    Raises:
+        KeyError: If the package has no word/document.xml
+    """
+    parts = []
+    paragraph = []
+    cell = []
+    table_depth = 0
+    paragraph_count = 0
+    
+    with zipfile.ZipFile(docx_path) as package, package.open('word/document.xml') as xml:
+        for event, element in etree.iterparse(xml, events=('start', 'end'), tag=_DOCX_TAGS):
+            tag = element.tag
+            if event == 'start':
+                if tag == _W + 'tbl':
+                    table_depth += 1
+                continue
+            
+            if tag == _W + 't':
+                paragraph.append(element.text or '')
+            elif tag == _W + 'tab':
+                paragraph.append('\t')
+            elif tag in (_W + 'br', _W + 'cr'):
+                paragraph.append('\n')
+            elif tag == _W + 'p':
+                if table_depth:
+                    cell.append(''.join(paragraph))
+                else:
+                    parts.append(''.join(paragraph))
+                    parts.append('\n')
+                    paragraph_count += 1
+                paragraph = []
+            elif tag == _W + 'tc':
+                parts.append('\n'.join(cell))
+                parts.append('\t')
+                cell = []
+            elif tag == _W + 'tr':
+                parts.append('\n')
+            elif tag == _W + 'tbl':
+                table_depth -= 1
+            
+            element.clear()
+    
+    return ''.join(parts), paragraph_count
+
+def _docx_text_from_model(docx_path):
+    """Fallback extraction through python-docx; paragraphs first, then tables"""
+    doc = Document(docx_path)
+    parts = [para.text + "\n" for para in doc.paragraphs]
+    for table in doc.tables:
+        for row in table.rows:
+            parts.extend(cell.text + "\t" for cell in row.cells)
+            parts.append("\n")
+    return ''.join(parts), len(doc.paragraphs)
+
 def extract_text_from_txt(txt_path):
     """
     Extract text content from a TXT file
@@ -90,30 +263,59 @@ def extract_text_from_txt(txt_path):
         str: Extracted text content
     """
     try:
-        logger.debug(f"Reading text from TXT: {txt_path}")
-        
-        # Try different encodings
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+        logger.debug("Reading text from TXT: %s", txt_path)
         
-        for encoding in encodings:
-            try:
-                with open(txt_path, 'r', encoding=encoding) as file:
-                    text_content = file.read()
-                    logger.debug(f"Successfully read TXT file with {encoding} encoding")
-                    return clean_extracted_text(text_content)
-            except UnicodeDecodeError:
-                continue
-        
-        # If all encodings fail, try reading as binary and decoding with errors='ignore'
+        # Read once and pick the encoding from the start of the file
         with open(txt_path, 'rb') as file:
-            text_content = file.read().decode('utf-8', errors='ignore')
-            logger.warning("Used fallback encoding with error handling")
-            return clean_extracted_text(text_content)
+            data = file.read()
+        encoding = detect_encoding(data[:ENCODING_SNIFF_BYTES])
+        logger.debug("Reading TXT file with %s encoding", encoding)
+        
+        # Undecodable bytes become U+FFFD instead of silently disappearing
+        return clean_extracted_text(data.decode(encoding, errors='replace'))
         
     except Exception as e:
         logger.error(f"Error reading text file: {str(e)}")
         raise Exception(f"Failed to read text file: {str(e)}")
 
+def detect_encoding(head):
+    """
+    Guess the encoding of a text file from its first bytes
+    
+    A BOM wins, then valid UTF-8, then charset-normalizer's best match, then the
+    first of TXT_ENCODINGS that decodes the sample.
+    
+    Args:
+        head (bytes): Start of the file
+    
+    Returns:
+        str: Codec name
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    
+    if _decodes(head, 'utf-8'):
+        return 'utf-8'
+    
+    if from_bytes is not None:
+        match = from_bytes(head).best()
+        if match is not None and match.encoding:
+            return match.encoding
+    
+    for encoding in TXT_ENCODINGS:
+        if _decodes(head, encoding):
+            return encoding
+    return 'latin-1'
+
+def _decodes(head, encoding):
+    # Incremental decoding tolerates a multi-byte character cut off at the end of the sample
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
 def clean_extracted_text(text):
     """
     Clean and normalize extracted text
@@ -125,11 +327,9 @@ def clean_extracted_text(text):
         str: Cleaned text
     """
     # Remove excessive whitespace
-    text = re.sub(r'\n\s*\n\s*\n', '\n\n', text)  # Replace multiple newlines with double newlines
-    text = re.sub(r'[ \t]+', ' ', text)  # Replace multiple spaces/tabs with single space
-    text = text.strip()
-    
-    return text
+    text = _EXCESS_NEWLINES.sub('\n\n', text)  # Replace multiple newlines with double newlines
+    text = _SPACE_RUNS.sub(' ', text)  # Replace multiple spaces/tabs with single space
+    return text.strip()
 
 def process_document(file_path, file_type):
     """
@@ -142,14 +342,27 @@ def process_document(file_path, file_type):
     Returns:
         str: Extracted text content
     """
+    return parse_document(file_path, file_type)[0]
+
+def parse_document(file_path, file_type):
+    """
+    Extract a document's text and page count, opening and parsing the file once
+    
+    Args:
+        file_path (str): Path to the document file
+        file_type (str): Type of the document (pdf, docx, txt)
+    
+    Returns:
+        tuple: (text content, page count or None when the type has no pages)
+    """
     file_type = file_type.lower()
     
     if file_type == 'pdf':
-        return extract_text_from_pdf(file_path)
+        return _read_pdf(file_path)
     elif file_type == 'docx':
-        return extract_text_from_docx(file_path)
+        return _read_docx(file_path)
     elif file_type == 'txt':
-        return extract_text_from_txt(file_path)
+        return extract_text_from_txt(file_path), None
     else:
         raise ValueError(f"Unsupported document type: {file_type}")
 
@@ -177,29 +390,13 @@ def get_document_info(file_path, file_type):
             'character_count': None,
         }
         
-        # Get additional info based on file type
-        if file_type.lower() == 'pdf':
-            try:
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PdfReader(file)
-                    info['page_count'] = len(pdf_reader.pages)
-            except:
-                pass
-                
-        elif file_type.lower() == 'docx':
-            try:
-                doc = Document(file_path)
-                info['page_count'] = len(doc.paragraphs)  # Approximate
-            except:
-                pass
-        
-        # Get text stats
+        # Page count and text stats come from the same parse
         try:
-            text_content = process_document(file_path, file_type)
+            text_content, info['page_count'] = parse_document(file_path, file_type)
             info['character_count'] = len(text_content)
             info['word_count'] = len(text_content.split())
-        except:
-            pass
+        except Exception as e:
+            logger.warning(f"Could not read {file_name} for document info: {str(e)}")
             
         return info
         
@@ -0,0 +1,57 @@
+import logging
+import os
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Files handed to remove_later are unlinked by one background thread so request
+# and worker threads never wait on the filesystem to free large media files
+_cleanup_queue = queue.Queue()
+_janitor_thread = None
+_janitor_lock = threading.Lock()
+
+def remove_later(path):
+    """
+    Queue a file for deletion by the janitor thread
+    
+    Safe to call for files that may already be gone.
+    
+    Args:
+        path (str): Path of the file to delete
+    """
+    if not path:
+        return
+    _start_janitor()
+    _cleanup_queue.put(path)
+
+def _start_janitor():
+    """Start the janitor thread on first use"""
+    global _janitor_thread
+    if _janitor_thread is not None and _janitor_thread.is_alive():
+        return
+    with _janitor_lock:
+        if _janitor_thread is None or not _janitor_thread.is_alive():
+            _janitor_thread = threading.Thread(target=_janitor_loop, name='file-janitor', daemon=True)
+            _janitor_thread.start()
+
+def _janitor_loop():
+    while True:
+        path = _cleanup_queue.get()
+        try:
+            _drop_and_unlink(path)
+        except Exception as e:
+            logger.warning(f"Could not remove {path}: {str(e)}")
+
+def _drop_and_unlink(path):
+    """Tell the kernel the file's cached pages are no longer needed, then delete it"""
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -9,6 +9,10 @@ OLLAMA_SERVER = "10.1.10.20"
 OLLAMA_PORT = 11434
 OLLAMA_URL = f"http://{OLLAMA_SERVER}:{OLLAMA_PORT}"
 
+# One keep-alive connection pool for every Ollama call instead of a new TCP connection per request
+http_session = requests.Session()
+http_session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16))
+
 # Default model to use
 DEFAULT_MODEL = "llama2"
 
@@ -20,7 +24,7 @@ def get_available_models():
         list: List of available model names
     """
     try:
-        response = requests.get(f"{OLLAMA_URL}/api/tags", timeout=5)
+        response = http_session.get(f"{OLLAMA_URL}/api/tags", timeout=5)
         if response.status_code == 200:
             data = response.json()
             models = [model['name'] for model in data.get('models', [])]
@@ -53,34 +57,7 @@ def process_text_with_llm(text, processing_type='summarize', custom_prompt=None,
     if not model:
         model = DEFAULT_MODEL
     
-    # Build the system prompt based on processing type
-    prompts = {
-        'summarize': {
-            'system': 'You are a helpful assistant that creates clear, concise summaries.',
-            'user': f'Please provide a comprehensive summary of the following text:\n\n{text}'
-        },
-        'critique': {
-            'system': 'You are a thoughtful critic who provides constructive analysis and feedback.',
-            'user': f'Please provide a detailed critique of the following text, including strengths, weaknesses, and suggestions for improvement:\n\n{text}'
-        },
-        'expand': {
-            'system': 'You are a creative writer who expands ideas with depth and detail.',
-            'user': f'Please expand on the following text with additional details, examples, and context:\n\n{text}'
-        },
-        'explain': {
-            'system': 'You are a clear educator who explains complex topics in simple terms.',
-            'user': f'Please explain the following text in clear, easy-to-understand language:\n\n{text}'
-        },
-        'custom': {
-            'system': 'You are a helpful AI assistant.',
-            'user': f'{custom_prompt}\n\n{text}' if custom_prompt else text
-        }
-    }
-    
-    if processing_type not in prompts:
-        processing_type = 'summarize'
-    
-    prompt_config = prompts[processing_type]
+    processing_type, prompt = _build_prompt(text, processing_type, custom_prompt)
     
     try:
         logger.info(f"Processing text with Ollama ({model}) - type: {processing_type}")
@@ -88,11 +65,11 @@ def process_text_with_llm(text, processing_type='summarize', custom_prompt=None,
         # Call Ollama API
         payload = {
             'model': model,
-            'prompt': f"{prompt_config['system']}\n\n{prompt_config['user']}",
+            'prompt': prompt,
             'stream': False
         }
         
-        response = requests.post(
+        response = http_session.post(
             f"{OLLAMA_URL}/api/generate",
             json=payload,
             timeout=300  # 5 minutes timeout for large texts
@@ -133,6 +110,81 @@ def process_text_with_llm(text, processing_type='summarize', custom_prompt=None,
         logger.error(error_msg)
         return {'success': False, 'error': error_msg}
 
+def stream_text_with_llm(text, processing_type='summarize', custom_prompt=None, model=None):
+    """
+    Process text using Ollama LLM, yielding the response as it is generated
+    
+    Args:
+        text (str): The text to process
+        processing_type (str): Same choices as process_text_with_llm
+        custom_prompt (str): Custom prompt for 'custom' processing type
+        model (str): Ollama model to use (defaults to DEFAULT_MODEL)
+    
+    Yields:
+        str: Pieces of the response text, in order
+    
+    Raises:
+        Exception: If the request fails or Ollama reports an error
+    """
+    if not text or not text.strip():
+        raise ValueError('No text provided')
+    
+    processing_type, prompt = _build_prompt(text, processing_type, custom_prompt)
+    model = model or DEFAULT_MODEL
+    logger.info(f"Streaming text processing from Ollama ({model}) - type: {processing_type}")
+    
+    # Ollama streams one JSON object per line until one arrives with done set
+    with http_session.post(
+        f"{OLLAMA_URL}/api/generate",
+        json={'model': model, 'prompt': prompt, 'stream': True},
+        stream=True,
+        timeout=300
+    ) as response:
+        if response.status_code != 200:
+            raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if chunk.get('error'):
+                raise Exception(f"Ollama error: {chunk['error']}")
+            if chunk.get('response'):
+                yield chunk['response']
+            if chunk.get('done'):
+                return
+
+def _build_prompt(text, processing_type, custom_prompt):
+    """Return (effective processing type, full prompt) for an Ollama request"""
+    # Build the system prompt based on processing type
+    prompts = {
+        'summarize': {
+            'system': 'You are a helpful assistant that creates clear, concise summaries.',
+            'user': f'Please provide a comprehensive summary of the following text:\n\n{text}'
+        },
+        'critique': {
+            'system': 'You are a thoughtful critic who provides constructive analysis and feedback.',
+            'user': f'Please provide a detailed critique of the following text, including strengths, weaknesses, and suggestions for improvement:\n\n{text}'
+        },
+        'expand': {
+            'system': 'You are a creative writer who expands ideas with depth and detail.',
+            'user': f'Please expand on the following text with additional details, examples, and context:\n\n{text}'
+        },
+        'explain': {
+            'system': 'You are a clear educator who explains complex topics in simple terms.',
+            'user': f'Please explain the following text in clear, easy-to-understand language:\n\n{text}'
+        },
+        'custom': {
+            'system': 'You are a helpful AI assistant.',
+            'user': f'{custom_prompt}\n\n{text}' if custom_prompt else text
+        }
+    }
+    
+    if processing_type not in prompts:
+        processing_type = 'summarize'
+    
+    prompt_config = prompts[processing_type]
+    return processing_type, f"{prompt_config['system']}\n\n{prompt_config['user']}"
+
 def test_ollama_connection():
     """
     Test connection to Ollama server
@@ -141,7 +193,7 @@ def test_ollama_connection():
         dict: Connection status and available models
     """
     try:
-        response = requests.get(f"{OLLAMA_URL}/api/tags", timeout=5)
+        response = http_session.get(f"{OLLAMA_URL}/api/tags", timeout=5)
         if response.status_code == 200:
             models = get_available_models()
             return {
@@ -0,0 +1,206 @@
+import hashlib
+import logging
+import os
+import tempfile
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from utils.buffer_pool import copy_chunks
+
+logger = logging.getLogger(__name__)
+
+# streaming-form-data parses multipart bodies in C and hands file parts to us
+# chunk by chunk; without it we fall back to werkzeug's request.files
+try:
+    from streaming_form_data import StreamingFormDataParser
+    from streaming_form_data.targets import BaseTarget, ValueTarget
+    STREAMING_FORM_DATA_AVAILABLE = True
+except ImportError:
+    BaseTarget = object
+    STREAMING_FORM_DATA_AVAILABLE = False
+    logger.info("streaming-form-data not found, multipart uploads will use werkzeug's form parser")
+
+CHUNK_SIZE = 1024 * 1024  # 1MB reads from the request body
+PARTIAL_SUFFIX = '.part'  # Files still being received; the upload sweeper cleans up abandoned ones
+
+class UploadFileTarget(BaseTarget):
+    """streaming-form-data target that writes every file part straight to disk"""
+    
+    def __init__(self, upload_folder, allowed_extensions, expected_sha256=None):
+        super().__init__()
+        self.upload_folder = upload_folder
+        self.allowed_extensions = allowed_extensions
+        self.expected_sha256 = expected_sha256
+        self.saved_files = []
+        self._file = None
+    
+    def on_start(self):
+        # The filename isn't checked until the part is complete, so write
+        # under a .part name and rename in on_finish
+        self._file = tempfile.NamedTemporaryFile(dir=self.upload_folder, suffix=PARTIAL_SUFFIX, delete=False)
+        self._digest = hashlib.blake2b(digest_size=32)
+        self._sha256 = hashlib.sha256() if self.expected_sha256 else None
+        self._size = 0
+    
+    def on_data_received(self, chunk):
+        self._file.write(chunk)
+        self._digest.update(chunk)
+        if self._sha256:
+            self._sha256.update(chunk)
+        self._size += len(chunk)
+    
+    def on_finish(self):
+        self._file.close()
+        self.saved_files.append(_finish_saved_file(
+            self._file.name, self.multipart_filename, self.allowed_extensions,
+            self._size, self._digest, self._sha256
+        ))
+        self._file = None
+    
+    def discard(self):
+        """Remove a part left half-written by an aborted upload"""
+        if self._file:
+            self._file.close()
+            _unlink_quietly(self._file.name)
+
+class UploadRequest(Request):
+    """Request whose form parser spools file parts straight into UPLOAD_FOLDER
+    
+    Werkzeug otherwise buffers small parts in memory and large ones in the system temp
+    directory, after which they have to be copied into the upload folder.
+    """
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.NamedTemporaryFile(
+            dir=current_app.config['UPLOAD_FOLDER'], suffix=PARTIAL_SUFFIX, delete=False
+        )
+
+def receive_multipart(request, file_field, value_fields, upload_folder, allowed_extensions,
+                      max_bytes=None, expected_sha256=None):
+    """
+    Save the files in a multipart/form-data request to disk as the body arrives
+    
+    Args:
+        request: Flask request whose body has not been read yet
+        file_field (str): Form field holding the file(s)
+        value_fields (iterable): Names of the plain form fields to return
+        upload_folder (str): Directory to write the files into
+        allowed_extensions (set): Lower-cased extensions to keep; other files are discarded
+        max_bytes (int): Abort once the body exceeds this many bytes
+        expected_sha256 (str): Optional hex SHA-256 each kept file must match
+    
+    Returns:
+        tuple: (saved files, form values). Each saved file is a dict with path, filename,
+        extension, size and content_hash; extension and path are None for rejected files.
+    
+    Raises:
+        ValueError: If expected_sha256 does not match the received data
+        RequestEntityTooLarge: If the body is larger than max_bytes
+    """
+    if STREAMING_FORM_DATA_AVAILABLE:
+        saved_files, values = _receive_streaming(
+            request, file_field, value_fields, upload_folder, allowed_extensions, max_bytes, expected_sha256
+        )
+    else:
+        saved_files, values = _receive_werkzeug(
+            request, file_field, value_fields, upload_folder, allowed_extensions, expected_sha256
+        )
+    
+    if expected_sha256 and any(f['sha256'] not in (None, expected_sha256.strip().lower()) for f in saved_files):
+        discard_saved_files(saved_files)
+        raise ValueError('Upload checksum mismatch: X-Content-SHA256 does not match the received data')
+    
+    return saved_files, values
+
+def get_extension(filename):
+    """Return the lower-cased extension of filename, or None if it has none"""
+    dot = filename.rfind('.') if filename else -1
+    return filename[dot + 1:].lower() if dot >= 0 else None
+
+def discard_saved_files(saved_files):
+    """Delete files written by receive_multipart"""
+    for saved in saved_files:
+        if saved['path']:
+            _unlink_quietly(saved['path'])
+
+def _receive_streaming(request, file_field, value_fields, upload_folder, allowed_extensions,
+                       max_bytes, expected_sha256):
+    """Feed the raw request body through StreamingFormDataParser"""
+    parser = StreamingFormDataParser(headers=request.headers)
+    file_target = UploadFileTarget(upload_folder, allowed_extensions, expected_sha256)
+    parser.register(file_field, file_target)
+    value_targets = {name: ValueTarget() for name in value_fields}
+    for name, target in value_targets.items():
+        parser.register(name, target)
+    
+    received = 0
+    try:
+        while True:
+            chunk = request.stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            received += len(chunk)
+            if max_bytes and received > max_bytes:
+                raise RequestEntityTooLarge()
+            parser.data_received(chunk)
+    except Exception:
+        file_target.discard()
+        discard_saved_files(file_target.saved_files)
+        raise
+    
+    values = {name: target.value.decode('utf-8', 'replace') for name, target in value_targets.items() if target.value}
+    return file_target.saved_files, values
+
+def _receive_werkzeug(request, file_field, value_fields, upload_folder, allowed_extensions, expected_sha256):
+    """Fallback when streaming-form-data isn't installed: take the files from request.files"""
+    saved_files = []
+    try:
+        for file in request.files.getlist(file_field):
+            digest = hashlib.blake2b(digest_size=32)
+            sha256 = hashlib.sha256() if expected_sha256 else None
+            spooled_path = getattr(file.stream, 'name', None)
+            
+            if isinstance(spooled_path, str) and os.path.dirname(os.path.abspath(spooled_path)) == os.path.abspath(upload_folder):
+                # UploadRequest already spooled the part into the upload folder: hash it in place
+                file.stream.seek(0)
+                size = copy_chunks(file.stream, None, digest, sha256)
+                file.stream.close()
+                tmp_path = spooled_path
+            else:
+                with tempfile.NamedTemporaryFile(dir=upload_folder, suffix=PARTIAL_SUFFIX, delete=False) as tmp:
+                    size = copy_chunks(file.stream, tmp, digest, sha256)
+                tmp_path = tmp.name
+            
+            saved_files.append(_finish_saved_file(tmp_path, file.filename, allowed_extensions, size, digest, sha256))
+    except Exception:
+        discard_saved_files(saved_files)
+        raise
+    
+    values = {name: request.form[name] for name in value_fields if name in request.form}
+    return saved_files, values
+
+def _finish_saved_file(tmp_path, filename, allowed_extensions, size, digest, sha256):
+    """Give a completed upload its extension, or delete it if the type isn't allowed"""
+    extension = get_extension(filename)
+    if extension not in allowed_extensions:
+        _unlink_quietly(tmp_path)
+        return {'path': None, 'filename': filename, 'extension': None, 'size': size,
+                'content_hash': None, 'sha256': None}
+    
+    filepath = f"{tmp_path[:-len(PARTIAL_SUFFIX)]}.{extension}"
+    os.rename(tmp_path, filepath)
+    return {
+        'path': filepath,
+        'filename': filename,
+        'extension': extension,
+        'size': size,
+        'content_hash': digest.hexdigest(),
+        'sha256': sha256.hexdigest() if sha256 else None
+    }
+
+def _unlink_quietly(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -10,6 +10,10 @@ OPENQM_SERVICE_URL = "http://10.1.34.103:5001"
 OPENQM_ACCOUNT = "LCS"
 OPENQM_FILE = "TRANSCRIPT"
 
+# Reuse connections to the OpenQM service across saves
+http_session = requests.Session()
+http_session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16))
+
 def save_transcript_to_openqm(transcript_data, summary_data=None):
     """
     Save transcript and optional summary to OpenQM database via mv1 service
@@ -46,7 +50,7 @@ def save_transcript_to_openqm(transcript_data, summary_data=None):
         logger.info(f"Sending transcript to OpenQM service at {OPENQM_SERVICE_URL}")
         
         # Call the OpenQM save service on mv1
-        response = requests.post(
+        response = http_session.post(
             f"{OPENQM_SERVICE_URL}/save-transcript",
             json=payload,
             timeout=30
@@ -115,7 +119,7 @@ def test_openqm_connection():
     """
     try:
         # Try to connect to OpenQM service on mv1
-        response = requests.get(
+        response = http_session.get(
             f"{OPENQM_SERVICE_URL}/health",
             timeout=5
         )
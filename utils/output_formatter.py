@@ -1,6 +1,7 @@
 import os
 import tempfile
 import logging
+from secrets import token_hex
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -12,6 +13,30 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Supported output formats configuration
+SUPPORTED_FORMATS = {
+    'text': {
+        'name': 'Plain Text',
+        'extension': '.txt',
+        'description': 'Simple text format with basic formatting'
+    },
+    'markdown': {
+        'name': 'Markdown',
+        'extension': '.md',
+        'description': 'Markdown format for easy web publishing'
+    },
+    'word': {
+        'name': 'Microsoft Word',
+        'extension': '.docx',
+        'description': 'Microsoft Word document format'
+    },
+    'pdf': {
+        'name': 'PDF Document',
+        'extension': '.pdf',
+        'description': 'Portable Document Format for universal viewing'
+    }
+}
+
 def format_as_text(content, metadata=None):
     """
     Format content as plain text
@@ -98,12 +123,11 @@ def create_word_document(content, metadata=None, output_path=None):
         str: Path to the created document
     """
     if output_path is None:
-        import uuid
-        filename = f"transcription_{uuid.uuid4().hex[:8]}.docx"
+        filename = f"transcription_{token_hex(4)}.docx"
         output_path = os.path.join(tempfile.gettempdir(), filename)
     
     try:
-        logger.debug(f"Creating Word document: {output_path}")
+        logger.debug("Creating Word document: %s", output_path)
         
         doc = Document()
         
@@ -146,7 +170,7 @@ def create_word_document(content, metadata=None, output_path=None):
         # Save the document
         doc.save(output_path)
         
-        logger.debug(f"Successfully created Word document: {output_path}")
+        logger.debug("Successfully created Word document: %s", output_path)
         return output_path
         
     except Exception as e:
@@ -166,12 +190,11 @@ def create_pdf_document(content, metadata=None, output_path=None):
         str: Path to the created document
     """
     if output_path is None:
-        import uuid
-        filename = f"transcription_{uuid.uuid4().hex[:8]}.pdf"
+        filename = f"transcription_{token_hex(4)}.pdf"
         output_path = os.path.join(tempfile.gettempdir(), filename)
     
     try:
-        logger.debug(f"Creating PDF document: {output_path}")
+        logger.debug("Creating PDF document: %s", output_path)
         
         doc = SimpleDocTemplate(output_path, pagesize=letter)
         styles = getSampleStyleSheet()
@@ -230,7 +253,7 @@ def create_pdf_document(content, metadata=None, output_path=None):
         # Build the PDF
         doc.build(story)
         
-        logger.debug(f"Successfully created PDF document: {output_path}")
+        logger.debug("Successfully created PDF document: %s", output_path)
         return output_path
         
     except Exception as e:
@@ -253,8 +276,7 @@ def generate_output_file(content, format_type, metadata=None, output_dir=None):
     if output_dir is None:
         output_dir = tempfile.gettempdir()
     
-    import uuid
-    base_filename = f"transcription_{uuid.uuid4().hex[:8]}"
+    base_filename = f"transcription_{token_hex(4)}"
     
     format_type = format_type.lower()
     
@@ -298,25 +320,4 @@ def get_supported_formats():
     Returns:
         dict: Dictionary of supported formats with descriptions
     """
-    return {
-        'text': {
-            'name': 'Plain Text',
-            'extension': '.txt',
-            'description': 'Simple text format with basic formatting'
-        },
-        'markdown': {
-            'name': 'Markdown',
-            'extension': '.md',
-            'description': 'Markdown format for easy web publishing'
-        },
-        'word': {
-            'name': 'Microsoft Word',
-            'extension': '.docx',
-            'description': 'Microsoft Word document format'
-        },
-        'pdf': {
-            'name': 'PDF Document',
-            'extension': '.pdf',
-            'description': 'Portable Document Format for universal viewing'
-        }
-    }
\ No newline at end of file
+    return SUPPORTED_FORMATS
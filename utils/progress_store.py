@@ -0,0 +1,89 @@
+import threading
+import time
+
+FINISHED_STATUSES = frozenset({'completed', 'failed'})
+
+class ProgressStore:
+    """Progress of direct (non-database) jobs, keyed by job ID
+    
+    Writers merge several fields in one call and readers get a copy, so a status
+    poll never sees a half-updated entry. Every write bumps the entry's version and
+    wakes wait_for_update callers. Finished entries expire after ttl seconds and
+    entries that never finish are dropped after stale_after seconds.
+    """
+    
+    def __init__(self, ttl=3600, stale_after=24 * 3600):
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self._jobs = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+    
+    def create(self, job_id, **fields):
+        """Start tracking a job; start_time and result default to now and None"""
+        progress = {'status': 'processing', 'progress': 0, 'result': None, 'start_time': time.time()}
+        progress.update(fields)
+        with self._lock:
+            self._jobs[job_id] = progress
+            self._bump(job_id)
+    
+    def update(self, job_id, **fields):
+        """Merge fields into a job's progress; unknown (already expired) jobs are ignored"""
+        with self._lock:
+            progress = self._jobs.get(job_id)
+            if progress is None:
+                return
+            progress.update(fields)
+            if fields.get('status') in FINISHED_STATUSES:
+                progress['finished_at'] = time.time()
+            self._bump(job_id)
+    
+    def get(self, job_id):
+        """Return a snapshot of a job's progress, or None if it isn't tracked"""
+        with self._lock:
+            progress = self._jobs.get(job_id)
+            return dict(progress) if progress is not None else None
+    
+    def wait_for_update(self, job_id, version, timeout):
+        """
+        Block until a job's progress is written after version, or timeout elapses
+        
+        Args:
+            job_id (str): Job to watch
+            version (int): Version the caller last saw (0 for none)
+            timeout (float): Longest time to wait, in seconds
+        
+        Returns:
+            tuple: (snapshot or None if the job isn't tracked, current version)
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._versions.get(job_id, 0) != version, timeout)
+            progress = self._jobs.get(job_id)
+            return (dict(progress) if progress is not None else None), self._versions.get(job_id, 0)
+    
+    def _bump(self, job_id):
+        # Caller holds the lock
+        self._versions[job_id] = self._versions.get(job_id, 0) + 1
+        self._changed.notify_all()
+    
+    def prune(self):
+        """
+        Drop entries whose results have had time to be collected
+        
+        Returns:
+            int: Number of entries removed
+        """
+        now = time.time()
+        with self._lock:
+            expired = [
+                job_id for job_id, progress in self._jobs.items()
+                if (now - progress['finished_at'] > self.ttl if 'finished_at' in progress
+                    else now - progress['start_time'] > self.stale_after)
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+                del self._versions[job_id]
+            if expired:
+                self._changed.notify_all()
+        return len(expired)
@@ -1,6 +1,7 @@
 import os
 import tempfile
 import logging
+from secrets import token_hex
 from gtts import gTTS
 import pyttsx3
 import io
@@ -174,7 +175,7 @@ def text_to_speech_gtts(text, voice_config, output_path):
         str: Path to the generated audio file
     """
     try:
-        logger.debug(f"Converting text to speech using gTTS: {voice_config['name']}")
+        logger.debug("Converting text to speech using gTTS: %s", voice_config['name'])
         
         tts = gTTS(
             text=text,
@@ -190,7 +191,7 @@ def text_to_speech_gtts(text, voice_config, output_path):
         # Move to final destination
         os.rename(temp_path, output_path)
         
-        logger.debug(f"Successfully generated audio file: {output_path}")
+        logger.debug("Successfully generated audio file: %s", output_path)
         return output_path
         
     except Exception as e:
@@ -210,7 +211,7 @@ def text_to_speech_pyttsx3(text, voice_config, output_path):
         str: Path to the generated audio file
     """
     try:
-        logger.debug(f"Converting text to speech using pyttsx3: {voice_config['name']}")
+        logger.debug("Converting text to speech using pyttsx3: %s", voice_config['name'])
         
         engine = pyttsx3.init()
         
@@ -246,7 +247,7 @@ def text_to_speech_pyttsx3(text, voice_config, output_path):
         engine.save_to_file(text, output_path)
         engine.runAndWait()
         
-        logger.debug(f"Successfully generated audio file: {output_path}")
+        logger.debug("Successfully generated audio file: %s", output_path)
         return output_path
         
     except Exception as e:
@@ -276,8 +277,7 @@ def convert_text_to_speech(text, voice_id='google_en', output_dir=None):
     voice_config = AVAILABLE_VOICES[voice_id]
     
     # Generate output filename
-    import uuid
-    filename = f"tts_{uuid.uuid4().hex[:8]}.mp3"
+    filename = f"tts_{token_hex(4)}.mp3"
     output_path = os.path.join(output_dir, filename)
     
     try:
@@ -0,0 +1,92 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Parse and write cache entries with orjson when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CACHE_MAX_AGE_SECONDS = 30 * 24 * 3600  # Published transcripts rarely change; refetch monthly
+
+def load_cached(cache_dir, key, max_age=CACHE_MAX_AGE_SECONDS):
+    """
+    Read a cached JSON entry if it exists and is fresh enough
+    
+    Args:
+        cache_dir (str): Directory holding the cache entries
+        key (str): Entry name (a filename-safe ID such as a YouTube video ID)
+        max_age (int): Entries older than this many seconds are ignored
+    
+    Returns:
+        The cached value, or None on a miss
+    """
+    path = os.path.join(cache_dir, f"{key}.json")
+    try:
+        if time.time() - os.stat(path).st_mtime > max_age:
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+        return orjson.loads(data) if orjson else json.loads(data)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache entry {path}: {str(e)}")
+        return None
+
+def store_cached(cache_dir, key, value):
+    """
+    Write a JSON cache entry atomically so readers never see a partial file
+    
+    Args:
+        cache_dir (str): Directory holding the cache entries
+        key (str): Entry name (a filename-safe ID such as a YouTube video ID)
+        value: JSON-serializable value to store
+    """
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        data = orjson.dumps(value) if orjson else json.dumps(value).encode('utf-8')
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.tmp', delete=False) as tmp:
+            tmp_path = tmp.name
+            tmp.write(data)
+        os.replace(tmp_path, os.path.join(cache_dir, f"{key}.json"))
+    except (OSError, TypeError) as e:
+        logger.warning(f"Could not write cache entry {key}: {str(e)}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+class MemoryCache:
+    """
+    Small thread-safe LRU map kept in front of the disk cache for the hottest entries
+    
+    Values are shared between callers and must be treated as read-only.
+    """
+    
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value for key (marking it recently used), or None on a miss"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
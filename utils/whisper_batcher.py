@@ -0,0 +1,130 @@
+import logging
+import os
+import tempfile
+import wave
+from concurrent.futures import Future
+
+from utils.whisper_client import send_to_whisper
+
+logger = logging.getLogger(__name__)
+
+# Small files from the same request share a Whisper call. Files from different
+# requests are never combined: a segment crossing a boundary, or text conditioning
+# carried across it, would put one user's speech in another user's transcript.
+BATCH_MAX = int(os.environ.get('WHISPER_BATCH_MAX', '8'))
+SMALL_UPLOAD_BYTES = 10 * 1024 * 1024  # Larger files are transcribed on their own
+
+SAMPLE_RATE = 16000
+SILENCE_SECONDS = 1.0  # Gap between clips so segments don't straddle a boundary
+
+def transcribe_many(audio_file_paths, language='en'):
+    """
+    Transcribe several files with as few Whisper calls as possible
+    
+    Files are combined BATCH_MAX at a time; a batch that can't be split back
+    into its files falls back to one call per file.
+    
+    Args:
+        audio_file_paths (list): Paths to the audio files
+        language (str): Target language for transcription
+    
+    Returns:
+        list: One result dict (same shape as send_to_whisper) or Exception per path, in order
+    """
+    items = [(audio_file_path, language, Future()) for audio_file_path in audio_file_paths]
+    for start in range(0, len(items), BATCH_MAX):
+        _transcribe_batch(items[start:start + BATCH_MAX], language)
+    return [future.exception() or future.result() for _, _, future in items]
+
+def _transcribe_batch(items, language):
+    """Transcribe several clips in one call and hand each file its own part"""
+    if len(items) == 1:
+        audio_file_path, _, future = items[0]
+        _transcribe_single(audio_file_path, language, future)
+        return
+    
+    combined_path = None
+    try:
+        import numpy as np
+        from faster_whisper import decode_audio
+        
+        # Decode every clip to 16kHz mono and lay them end to end with silence
+        silence = np.zeros(int(SAMPLE_RATE * SILENCE_SECONDS), dtype=np.float32)
+        pieces = []
+        boundaries = []  # (start, end) of each clip in the combined audio, in seconds
+        offset = 0.0
+        for audio_file_path, _, _ in items:
+            samples = decode_audio(audio_file_path, sampling_rate=SAMPLE_RATE)
+            duration = len(samples) / SAMPLE_RATE
+            boundaries.append((offset, offset + duration))
+            pieces.extend([samples, silence])
+            offset += duration + SILENCE_SECONDS
+        
+        pcm = (np.clip(np.concatenate(pieces), -1.0, 1.0) * 32767).astype(np.int16)
+        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
+            combined_path = tmp.name
+        with wave.open(combined_path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(SAMPLE_RATE)
+            wav_file.writeframes(pcm.tobytes())
+        
+        logger.info(f"Transcribing {len(items)} files in one Whisper call")
+        result = send_to_whisper(combined_path, language)
+        segments = result.get('segments') if isinstance(result, dict) else None
+        if not segments:
+            raise ValueError("Whisper result has no segment timestamps to split on")
+        
+        per_clip = split_segments(segments, boundaries)
+        for (_, _, future), clip_segments, (start, end) in zip(items, per_clip, boundaries):
+            future.set_result({
+                'text': ' '.join(s['text'].strip() for s in clip_segments),
+                'segments': clip_segments,
+                'language': result.get('language', language),
+                'duration': end - start
+            })
+    
+    except Exception as e:
+        logger.warning(f"Combined transcription failed: {str(e)}, transcribing files individually")
+        for audio_file_path, _, future in items:
+            if not future.done():
+                _transcribe_single(audio_file_path, language, future)
+    
+    finally:
+        if combined_path:
+            try:
+                os.unlink(combined_path)
+            except FileNotFoundError:
+                pass
+
+def split_segments(segments, boundaries):
+    """
+    Hand each segment of a combined transcription back to the clip containing its midpoint
+    
+    Args:
+        segments (list): Segment dicts with 'start', 'end' and 'text', timed in the combined audio
+        boundaries (list): (start, end) of each clip in the combined audio, in seconds
+    
+    Returns:
+        list: One list of segments per clip, re-timed from the start of that clip
+    """
+    per_clip = [[] for _ in boundaries]
+    for segment in segments:
+        midpoint = (segment['start'] + segment['end']) / 2
+        for index, (start, end) in enumerate(boundaries):
+            # The silence after a clip belongs to it; past the last clip nothing matches
+            if midpoint < end + SILENCE_SECONDS:
+                per_clip[index].append({
+                    'start': max(segment['start'] - start, 0.0),
+                    'end': max(segment['end'] - start, 0.0),
+                    'text': segment['text']
+                })
+                break
+    return per_clip
+
+def _transcribe_single(audio_file_path, language, future):
+    """Run a normal Whisper call and resolve the caller's future with it"""
+    try:
+        future.set_result(send_to_whisper(audio_file_path, language))
+    except Exception as e:
+        future.set_exception(e)
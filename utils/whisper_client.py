@@ -3,18 +3,64 @@ import logging
 import os
 import json
 import tempfile
+import threading
 import time
 from pathlib import Path
+from secrets import token_hex
+from typing import NotRequired, TypedDict
 
 logger = logging.getLogger(__name__)
 
+# Transcription results carry every segment; parse them with orjson when it is installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 # Faster-whisper script configuration
 WHISPER_SCRIPT_PATH = "/mnt/bigdisk/projects/faster-whisper-gpu/smart_transcribe.py"
 WHISPER_SERVER = "10.1.10.20"
 WHISPER_USERNAME = "lawr"
 WHISPER_PASSWORD = "apgar-66"
 
-def send_to_whisper(audio_file_path, language='en', progress_callback=None):
+# Keep one authenticated ssh connection to the GPU server open and multiplex each
+# ssh/scp call over it, so uploads skip the TCP and key exchange handshake
+WHISPER_SSH_OPTIONS = [
+    "-o", "StrictHostKeyChecking=no",
+    "-o", "ControlMaster=auto",
+    "-o", f"ControlPath={os.path.join(tempfile.gettempdir(), 'whisper-ssh-%C')}",
+    "-o", "ControlPersist=10m",
+]
+
+# Python environment with CUDA-enabled faster-whisper, used in place of this process when present
+GPU_PYTHON_PATH = "/mnt/bigdisk/smart_transcribe_webapp/app/venv/bin/python3"
+
+# In-process transcription decodes this many 30-second windows of a file per forward pass
+WHISPER_BATCH_SIZE = int(os.environ.get('WHISPER_BATCH_SIZE', '16'))
+# Files transcribed at the same time on the shared model; matches the app's whisper pool
+# so concurrent calls (e.g. the parts of a YouTube playlist) run in parallel, not in turn
+WHISPER_CONCURRENCY = int(os.environ.get('WHISPER_CONCURRENCY', '2'))
+
+# Model size name or path to a CTranslate2 model directory (e.g. one converted with --quantization int8)
+WHISPER_MODEL_SIZE = os.environ.get('WHISPER_MODEL_SIZE', 'base')
+# INT8 weights by default (int8_float16 on GPU); set e.g. float16 where full-precision accuracy is needed
+WHISPER_COMPUTE_TYPE = os.environ.get('WHISPER_COMPUTE_TYPE')
+
+# The in-process model is loaded on first use and shared by every worker thread;
+# CTranslate2 models are safe to call concurrently. Loading lazily rather than at
+# import keeps CUDA from being initialised in the gunicorn master before it forks.
+_local_pipeline = None
+_local_pipeline_lock = threading.Lock()
+
+class TranscriptionResult(TypedDict):
+    """What every transcription backend returns; failures raise instead"""
+    text: str
+    segments: NotRequired[list]
+    language: NotRequired[str]
+    duration: NotRequired[float]
+    processing_time: NotRequired[float]
+
+def send_to_whisper(audio_file_path, language='en', progress_callback=None) -> TranscriptionResult:
     """
     Send an audio file to the faster-whisper script for transcription
     
@@ -24,7 +70,7 @@ def send_to_whisper(audio_file_path, language='en', progress_callback=None):
         progress_callback: Optional callback function(processed_seconds, total_seconds) for progress updates
     
     Returns:
-        dict: The transcription result from the whisper script
+        dict: The transcription result from the whisper script; 'text' is always present
         
     Raises:
         Exception: If the transcription request fails
@@ -32,6 +78,32 @@ def send_to_whisper(audio_file_path, language='en', progress_callback=None):
     if not os.path.exists(audio_file_path):
         raise FileNotFoundError(f"Audio file not found at {audio_file_path}")
     
+    return _transcribe(audio_file_path, language, progress_callback)
+
+def transcribes_in_process():
+    """
+    Whether send_to_whisper would run the model in this process
+    
+    Only then can audio be handed over as a sample array instead of a file.
+    """
+    return not (os.path.exists(WHISPER_SCRIPT_PATH) or _ssh_available() or os.path.exists(GPU_PYTHON_PATH))
+
+def transcribe_samples(audio, language='en', progress_callback=None) -> TranscriptionResult:
+    """
+    Transcribe decoded audio with the in-process model
+    
+    Args:
+        audio (numpy.ndarray): 16kHz mono float32 samples in [-1, 1]
+        language (str): Target language for transcription
+        progress_callback: Optional callback function(processed_seconds, total_seconds) for progress updates
+    
+    Returns:
+        dict: The transcription result; 'text' is always present
+    """
+    return _transcribe_in_process(audio, language, progress_callback)
+
+def _transcribe(audio_file_path, language, progress_callback):
+    """Pick the fastest available backend: local GPU script, remote GPU server, or in-process"""
     # Check if we're running on the GPU server (local script available)
     if os.path.exists(WHISPER_SCRIPT_PATH):
         logger.info("Running on GPU server, using local faster-whisper script")
@@ -42,13 +114,10 @@ def send_to_whisper(audio_file_path, language='en', progress_callback=None):
             return _process_locally(audio_file_path, language, progress_callback)
     
     # Check if SSH is available for remote GPU server connection
-    ssh_available = False
-    try:
-        subprocess.run(["which", "ssh"], check=True, capture_output=True)
-        subprocess.run(["which", "sshpass"], check=True, capture_output=True)
-        ssh_available = True
+    ssh_available = _ssh_available()
+    if ssh_available:
         logger.info("SSH tools available, attempting remote GPU server connection")
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    else:
         logger.info("SSH tools not available, using local processing")
     
     if ssh_available:
@@ -60,6 +129,15 @@ def send_to_whisper(audio_file_path, language='en', progress_callback=None):
     else:
         return _process_locally(audio_file_path, language, progress_callback)
 
+def _ssh_available():
+    """Check whether ssh and sshpass are installed for reaching the remote GPU server"""
+    try:
+        subprocess.run(["which", "ssh"], check=True, capture_output=True)
+        subprocess.run(["which", "sshpass"], check=True, capture_output=True)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
 def _process_with_local_script(audio_file_path, language='en'):
     """Process audio file using local faster-whisper script"""
     logger.info(f"Processing file {audio_file_path} with local faster-whisper script")
@@ -83,7 +161,7 @@ def _process_with_local_script(audio_file_path, language='en'):
         ], check=True, capture_output=True, text=True, timeout=600)
         
         # Parse the result
-        transcription_data = json.loads(result.stdout)
+        transcription_data = json_loads(result.stdout)
         processing_time = time.time() - start_time
         
         logger.info(f"Local script transcription completed in {processing_time:.2f} seconds")
@@ -104,110 +182,116 @@ def _process_with_gpu_server(audio_file_path, language='en'):
     logger.info(f"Processing file {audio_file_path} with faster-whisper on GPU server")
     
     # Create a temporary directory for processing on the GPU server
-    timestamp = int(time.time())
-    remote_temp_dir = f"/tmp/speech_processing_{timestamp}"
+    remote_temp_dir = f"/tmp/speech_processing_{token_hex(16)}"
     audio_filename = os.path.basename(audio_file_path)
     remote_audio_path = f"{remote_temp_dir}/{audio_filename}"
+    script_dir, script_name = WHISPER_SCRIPT_PATH.rsplit('/', 1)
     
-    # Copy file to GPU server
-    logger.debug(f"Copying audio file to GPU server: {remote_audio_path}")
-    subprocess.run([
-        "sshpass", "-p", WHISPER_PASSWORD,
-        "ssh", "-o", "StrictHostKeyChecking=no",
-        f"{WHISPER_USERNAME}@{WHISPER_SERVER}",
-        f"mkdir -p {remote_temp_dir}"
-    ], check=True, capture_output=True)
-    
-    subprocess.run([
-        "sshpass", "-p", WHISPER_PASSWORD,
-        "scp", "-o", "StrictHostKeyChecking=no",
-        audio_file_path, f"{WHISPER_USERNAME}@{WHISPER_SERVER}:{remote_audio_path}"
-    ], check=True, capture_output=True)
+    # Stream the audio over the ssh session's stdin and run the transcription in
+    # the same connection, instead of separate mkdir/scp/run/cleanup logins.
+    # The remote directory is removed whether or not transcription succeeds.
+    remote_command = (
+        f"mkdir -p {remote_temp_dir} && cat > '{remote_audio_path}' && "
+        f"cd {script_dir} && python3 {script_name} '{remote_audio_path}' --language {language}; "
+        f"status=$?; rm -rf {remote_temp_dir}; exit $status"
+    )
     
-    # Run transcription on GPU server
-    logger.debug("Running transcription on GPU server")
-    result = subprocess.run([
-        "sshpass", "-p", WHISPER_PASSWORD,
-        "ssh", "-o", "StrictHostKeyChecking=no",
-        f"{WHISPER_USERNAME}@{WHISPER_SERVER}",
-        f"cd {WHISPER_SCRIPT_PATH.rsplit('/', 1)[0]} && python3 {WHISPER_SCRIPT_PATH.rsplit('/', 1)[1]} '{remote_audio_path}' --language {language}"
-    ], check=True, capture_output=True, text=True)
+    logger.debug("Streaming audio file to GPU server: %s", remote_audio_path)
+    with open(audio_file_path, 'rb') as audio_file:
+        result = subprocess.run([
+            "sshpass", "-p", WHISPER_PASSWORD,
+            "ssh", *WHISPER_SSH_OPTIONS,
+            f"{WHISPER_USERNAME}@{WHISPER_SERVER}",
+            remote_command
+        ], stdin=audio_file, check=True, capture_output=True, text=True)
     
     # Parse the result
     try:
-        transcription_data = json.loads(result.stdout)
+        transcription_data = json_loads(result.stdout)
         logger.info("Successfully received transcription from GPU server")
-        
-        # Clean up remote files
-        subprocess.run([
-            "sshpass", "-p", WHISPER_PASSWORD,
-            "ssh", "-o", "StrictHostKeyChecking=no",
-            f"{WHISPER_USERNAME}@{WHISPER_SERVER}",
-            f"rm -rf {remote_temp_dir}"
-        ], capture_output=True)
-        
         return transcription_data
         
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse GPU server response: {result.stdout}")
         raise Exception(f"Invalid response from GPU server: {str(e)}")
 
-def _process_locally(audio_file_path, language='en', progress_callback=None):
-    """Process audio file using local faster-whisper"""
-    logger.info(f"Processing file {audio_file_path} with local faster-whisper")
+def _get_local_pipeline():
+    """Return the shared batched faster-whisper pipeline, loading the model on first call"""
+    global _local_pipeline
+    if _local_pipeline is not None:
+        return _local_pipeline
     
-    # Try using GPU-enabled Python environment first
-    gpu_python = "/mnt/bigdisk/smart_transcribe_webapp/app/venv/bin/python3"
-    if os.path.exists(gpu_python):
-        logger.info(f"Using GPU-enabled Python at {gpu_python}")
-        return _process_with_gpu_python(audio_file_path, language, progress_callback, gpu_python)
-    
-    try:
-        from faster_whisper import WhisperModel
+    with _local_pipeline_lock:
+        if _local_pipeline is not None:
+            return _local_pipeline
+        
+        from faster_whisper import BatchedInferencePipeline, WhisperModel
         
         # Detect CUDA availability and use GPU if available
         try:
             import torch
             device = "cuda" if torch.cuda.is_available() else "cpu"
-            compute_type = "float16" if device == "cuda" else "int8"
+            compute_type = WHISPER_COMPUTE_TYPE or ("int8_float16" if device == "cuda" else "int8")
         except ImportError:
             # torch not available, use CPU for safety
             device = "cpu"
-            compute_type = "int8"
+            compute_type = WHISPER_COMPUTE_TYPE or "int8"
             logger.info("torch module not found, using CPU")
         
-        logger.info(f"Using device: {device} with compute_type: {compute_type}")
+        logger.info(f"Loading whisper model on device: {device} with compute_type: {compute_type}")
         
-        # Initialize the model (using 'base' for better performance/accuracy balance)
+        # Initialize the model ('base' by default for better performance/accuracy balance)
         try:
-            model = WhisperModel("base", device=device, compute_type=compute_type)
+            model = WhisperModel(WHISPER_MODEL_SIZE, device=device, compute_type=compute_type, num_workers=WHISPER_CONCURRENCY)
         except Exception as e:
             # If GPU initialization fails, fall back to CPU
             if device == "cuda":
                 logger.warning(f"GPU initialization failed: {str(e)}, falling back to CPU")
                 device = "cpu"
                 compute_type = "int8"
-                model = WhisperModel("base", device=device, compute_type=compute_type)
+                model = WhisperModel(WHISPER_MODEL_SIZE, device=device, compute_type=compute_type, num_workers=WHISPER_CONCURRENCY)
             else:
                 raise
         
+        _local_pipeline = BatchedInferencePipeline(model=model)
+        return _local_pipeline
+
+def _process_locally(audio_file_path, language='en', progress_callback=None):
+    """Process audio file using local faster-whisper"""
+    logger.info(f"Processing file {audio_file_path} with local faster-whisper")
+    
+    # Try using GPU-enabled Python environment first
+    if os.path.exists(GPU_PYTHON_PATH):
+        logger.info(f"Using GPU-enabled Python at {GPU_PYTHON_PATH}")
+        return _process_with_gpu_python(audio_file_path, language, progress_callback, GPU_PYTHON_PATH)
+    
+    return _transcribe_in_process(audio_file_path, language, progress_callback)
+
+def _transcribe_in_process(audio, language='en', progress_callback=None):
+    """Run the shared faster-whisper pipeline on a file path or an array of 16kHz samples"""
+    try:
+        pipeline = _get_local_pipeline()
+        
         # Convert language code if needed
         whisper_language = language if language != 'auto' else None
         
         start_time = time.time()
-        segments, info = model.transcribe(
-            audio_file_path, 
+        # The batched pipeline splits the audio on VAD boundaries and decodes the
+        # chunks in batches rather than one window after another
+        segments, info = pipeline.transcribe(
+            audio,
             language=whisper_language,
-            task="transcribe"
+            task="transcribe",
+            batch_size=WHISPER_BATCH_SIZE
         )
         
         # Extract text and segments, updating progress as we go
-        transcription_text = ""
+        text_parts = []
         segment_list = []
         total_duration = info.duration if hasattr(info, 'duration') else None
         
         for segment in segments:
-            transcription_text += segment.text + " "
+            text_parts.append(segment.text)
             segment_list.append({
                 "start": segment.start,
                 "end": segment.end,
@@ -221,7 +305,8 @@ def _process_locally(audio_file_path, language='en', progress_callback=None):
         processing_time = time.time() - start_time
         
         result = {
-            "text": transcription_text.strip(),
+            # Joined once here; growing a string per segment is quadratic on long audio
+            "text": " ".join(text_parts).strip(),
             "segments": segment_list,
             "language": info.language,
             "duration": info.duration,
@@ -233,18 +318,13 @@ def _process_locally(audio_file_path, language='en', progress_callback=None):
         
     except ImportError as e:
         logger.error(f"faster-whisper not available: {str(e)}")
-        return {
-            "text": "Local transcription requires faster-whisper installation. Please install faster-whisper or configure GPU server access.",
-            "segments": [],
-            "language": language,
-            "duration": 0,
-            "processing_time": 0.0
-        }
+        # Raised rather than returned as text, so the message never ends up stored as a transcript
+        raise Exception("Local transcription requires faster-whisper installation. Please install faster-whisper or configure GPU server access.")
     except Exception as e:
         logger.error(f"Error in local transcription: {str(e)}")
         raise Exception(f"Local transcription failed: {str(e)}")
 
-def _process_with_gpu_python(audio_file_path, language='en', progress_callback=None, python_path="/mnt/bigdisk/smart_transcribe_webapp/app/venv/bin/python3"):
+def _process_with_gpu_python(audio_file_path, language='en', progress_callback=None, python_path=GPU_PYTHON_PATH):
     """Process audio file using GPU-enabled Python environment"""
     import subprocess
     import json
@@ -261,16 +341,16 @@ audio_file = sys.argv[1]
 language = sys.argv[2]
 
 # Load model with GPU
-model = WhisperModel("base", device="cuda", compute_type="float16")
+model = WhisperModel("base", device="cuda", compute_type="int8_float16")
 
 # Transcribe
 segments, info = model.transcribe(audio_file, language=language if language != "auto" else None)
 
-# Collect results
-transcription_text = ""
+# Collect results; joined once at the end, since growing a string per segment is quadratic
+text_parts = []
 segment_list = []
 for segment in segments:
-    transcription_text += segment.text + " "
+    text_parts.append(segment.text)
     segment_list.append({{
         "start": segment.start,
         "end": segment.end,
@@ -278,7 +358,7 @@ for segment in segments:
     }})
 
 result = {{
-    "text": transcription_text.strip(),
+    "text": " ".join(text_parts).strip(),
     "segments": segment_list,
     "language": info.language,
     "duration": info.duration
@@ -306,7 +386,7 @@ print(json.dumps(result))
             raise Exception(f"GPU transcription failed: {result.stderr}")
         
         # Parse result
-        result_data = json.loads(result.stdout.strip())
+        result_data = json_loads(result.stdout.strip())
         
         # Call progress callback with final duration if provided
         if progress_callback and result_data.get('duration'):
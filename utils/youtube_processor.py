@@ -1,45 +1,47 @@
 import os
+import subprocess
+import sys
 import tempfile
 import logging
+from secrets import token_hex
 from yt_dlp import YoutubeDL
 import re
 from youtube_transcript_api import YouTubeTranscriptApi
 from urllib.parse import urlparse, parse_qs
+from utils.audio_converter import FFMPEG_PATH, TARGET_SAMPLE_RATE
 
 logger = logging.getLogger(__name__)
 
+# URL patterns, compiled once at import
+VIDEO_URL_PATTERNS = (
+    re.compile(r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)'),
+    re.compile(r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]+)'),
+)
+PLAYLIST_URL_PATTERN = re.compile(r'(?:https?://)?(?:www\.)?youtube\.com/playlist\?list=([a-zA-Z0-9_-]+)')
+YOUTUBE_URL_PATTERNS = VIDEO_URL_PATTERNS + (PLAYLIST_URL_PATTERN,)
+
 def is_youtube_url(url):
     """Check if the URL is a valid YouTube URL"""
-    youtube_patterns = [
-        r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-        r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]+)',
-        r'(?:https?://)?(?:www\.)?youtube\.com/playlist\?list=([a-zA-Z0-9_-]+)',
-    ]
-    
-    for pattern in youtube_patterns:
-        if re.match(pattern, url.strip()):
-            return True
-    return False
+    url = url.strip()
+    return any(pattern.match(url) for pattern in YOUTUBE_URL_PATTERNS)
 
 def is_youtube_playlist(url):
     """Check if the URL is a YouTube playlist"""
-    playlist_pattern = r'(?:https?://)?(?:www\.)?youtube\.com/playlist\?list=([a-zA-Z0-9_-]+)'
-    return bool(re.match(playlist_pattern, url.strip()))
+    return bool(PLAYLIST_URL_PATTERN.match(url.strip()))
 
 def extract_video_id(url):
     """Extract video ID from YouTube URL"""
-    patterns = [
-        r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-        r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url.strip())
+    url = url.strip()
+    for pattern in VIDEO_URL_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
     return None
 
-def get_youtube_transcript(url, language_codes=['en', 'en-US', 'en-GB']):
+# Transcript languages tried when the caller doesn't name any, in order of preference
+DEFAULT_TRANSCRIPT_LANGUAGES = ('en', 'en-US', 'en-GB')
+
+def get_youtube_transcript(url, language_codes=DEFAULT_TRANSCRIPT_LANGUAGES):
     """
     Extract transcript from YouTube video
     
@@ -124,8 +126,7 @@ def download_youtube_video(url, output_dir=None):
         output_dir = tempfile.gettempdir()
     
     try:
-        import uuid
-        video_id_safe = uuid.uuid4().hex[:8]
+        video_id_safe = token_hex(4)
         
         logger.info(f"Downloading low-res YouTube video: {url}")
         
@@ -168,6 +169,74 @@ def download_youtube_video(url, output_dir=None):
         logger.error(f"Error downloading YouTube video: {str(e)}")
         raise Exception(f"Failed to download YouTube video: {str(e)}")
 
+# Bytes read from ffmpeg per pipe read while streaming YouTube audio
+PCM_READ_CHUNK = 1 << 20
+
+def stream_youtube_pcm(url, max_seconds):
+    """
+    Decode a YouTube video's audio track to 16kHz mono samples without touching disk
+    
+    yt-dlp writes the best audio stream to a pipe, ffmpeg resamples it to raw float32
+    PCM on another, and the samples are read straight into one growing buffer that
+    becomes the array without another copy.
+    
+    Args:
+        url (str): YouTube URL
+        max_seconds (float): Most audio to hold in memory; longer streams are abandoned
+    
+    Returns:
+        numpy.ndarray: float32 samples in [-1, 1], as faster-whisper expects
+    
+    Raises:
+        Exception: If yt-dlp or ffmpeg fails, or the audio runs past max_seconds
+    """
+    import numpy as np
+    
+    logger.info(f"Streaming audio from YouTube: {url}")
+    max_bytes = int(max_seconds * TARGET_SAMPLE_RATE) * 4
+    
+    # Both stderrs go to files: nothing drains a pipe for them while ffmpeg's output is read
+    with tempfile.TemporaryFile() as downloader_log, tempfile.TemporaryFile() as decoder_log:
+        downloader = subprocess.Popen(
+            [sys.executable, '-m', 'yt_dlp', '-q', '--no-warnings', '--no-playlist',
+             '-f', 'bestaudio/worst', '-o', '-', url],
+            stdout=subprocess.PIPE,
+            stderr=downloader_log
+        )
+        decoder = subprocess.Popen(
+            [FFMPEG_PATH, '-hide_banner', '-loglevel', 'error', '-i', 'pipe:0',
+             '-vn', '-ac', '1', '-ar', str(TARGET_SAMPLE_RATE), '-f', 'f32le', 'pipe:1'],
+            stdin=downloader.stdout,
+            stdout=subprocess.PIPE,
+            stderr=decoder_log
+        )
+        # Only ffmpeg should hold the read end, so yt-dlp sees a broken pipe if ffmpeg exits
+        downloader.stdout.close()
+        
+        pcm = bytearray()
+        with decoder.stdout:
+            while chunk := decoder.stdout.read(PCM_READ_CHUNK):
+                pcm += chunk
+                if len(pcm) > max_bytes:
+                    decoder.kill()
+                    downloader.kill()
+                    decoder.wait()
+                    downloader.wait()
+                    raise Exception(f"YouTube audio is longer than {max_seconds:.0f}s")
+        decoder.wait()
+        downloader.wait()
+        
+        if downloader.returncode != 0:
+            downloader_log.seek(0)
+            raise Exception(f"Failed to stream YouTube audio: {downloader_log.read().decode(errors='replace').strip()}")
+        if decoder.returncode != 0:
+            decoder_log.seek(0)
+            raise Exception(f"Failed to decode YouTube audio: {decoder_log.read().decode(errors='replace').strip()}")
+    
+    samples = np.frombuffer(pcm, dtype=np.float32)
+    logger.info(f"Streamed {len(samples) / TARGET_SAMPLE_RATE:.1f}s of YouTube audio")
+    return samples
+
 def download_youtube_audio(url, output_dir=None):
     """
     Download audio from YouTube video or playlist
@@ -186,8 +255,7 @@ def download_youtube_audio(url, output_dir=None):
         logger.info(f"Downloading audio from YouTube: {url}")
         
         # Configure yt-dlp options with safe filename
-        import uuid
-        safe_filename = f"youtube_{uuid.uuid4().hex[:8]}"
+        safe_filename = f"youtube_{token_hex(4)}"
         
         ydl_opts = {
             'format': 'bestaudio/best',